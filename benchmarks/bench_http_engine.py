@@ -0,0 +1,77 @@
+"""Throughput of Call Requests In Parallel with the requests (threads) and httpx (asyncio) engines.
+
+The requests are sent to a local asyncio server, running in its own process, that answers every request after a fixed
+delay, which stands in for a high latency API. Run from the repository root:
+    python benchmarks/bench_http_engine.py --requests 1000 --concurrency 100 --delay 0.05
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.APILibrary import APILibrary
+
+RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 12\r\n\r\n{"ok": true}'
+
+
+def serve(delay, ports):
+    """Run a keep-alive HTTP server and put its port on the ports queue."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                for line in head.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        await reader.readexactly(int(line.split(b':')[1]))
+                await asyncio.sleep(delay)
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0, backlog=4096)
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def measure(library, specs, concurrency):
+    with patch('robot.libraries.BuiltIn.BuiltIn.log'):
+        start = time.perf_counter()
+        library.call_requests_in_parallel(specs, max_workers=concurrency)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='number of requests per run')
+    parser.add_argument('--concurrency', type=int, default=100, help='max_workers passed to the keyword')
+    parser.add_argument('--delay', type=float, default=0.05, help='server response delay in seconds')
+    args = parser.parse_args()
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.delay, ports), daemon=True)
+    server.start()
+    endpoint = f"http://127.0.0.1:{ports.get()}"
+    specs = [{"endpoint": endpoint, "fullstring": f"/item/{index}"} for index in range(args.requests)]
+    engines = [('requests', APILibrary(pool_maxsize=args.concurrency, reuse_sessions=True))]
+    try:
+        engines.append(('httpx', APILibrary(pool_maxsize=args.concurrency, http_engine='httpx')))
+    except ImportError:
+        print("httpx: not installed")
+    print(f"{'engine':>10} {'seconds':>10} {'requests/s':>12}")
+    for name, library in engines:
+        measure(library, specs[:args.concurrency], args.concurrency)
+        elapsed = measure(library, specs, args.concurrency)
+        print(f"{name:>10} {elapsed:>10.3f} {args.requests / elapsed:>12.1f}")
+        library.close_pooled_sessions()
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Decode throughput of the JSON backends available to the Zoomba API and SOAP Libraries.
+
+Run from the repository root:
+    python benchmarks/bench_json_backend.py --sizes 1 10 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.Helpers.JsonBackend import BACKENDS, get_json_backend
+
+
+def build_payload(size_mb):
+    """Build a list response of roughly size_mb megabytes shaped like a typical API list endpoint."""
+    item = ('{"id": %d, "name": "item name %d", "active": true, "price": 10.25, "created": "2018-05-05T05:05:05Z", '
+            '"tags": ["alpha", "beta", "gamma"], "owner": {"id": 42, "email": "owner@example.com"}}')
+    items = []
+    total = 0
+    index = 0
+    while total < size_mb * 1024 * 1024:
+        encoded = item % (index, index)
+        items.append(encoded)
+        total += len(encoded) + 2
+        index += 1
+    return '[' + ', '.join(items) + ']'
+
+
+def measure(backend, payload, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.loads(payload)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 10, 100], help='payload sizes in MB')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the best one is reported')
+    args = parser.parse_args()
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_json_backend(name))
+        except ImportError:
+            print(f"{name}: not installed")
+    print(f"{'backend':<8} {'size MB':>8} {'seconds':>9} {'MB/s':>9}")
+    for size in args.sizes:
+        payload = build_payload(size)
+        megabytes = len(payload) / (1024 * 1024)
+        for backend in backends:
+            seconds = measure(backend, payload, args.repeat)
+            print(f"{backend.name:<8} {megabytes:>8.1f} {seconds:>9.4f} {megabytes / seconds:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
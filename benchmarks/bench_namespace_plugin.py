@@ -0,0 +1,110 @@
+"""Time of the type rewriting of _ObjectNamespacePlugin on generated multi-megabyte schemas.
+
+Each schema is a flat XSD whose elements mix unqualified, qualified and empty type attributes, with xsi:type and
+other attribute names ending in type. The plugin is timed against the loop it used before its rewrite to a single
+regular expression substitution, and both documents are checked to be identical. The old loop copies the document
+for every type it rewrites, so it only runs on schemas up to --legacy-max megabytes. Run from the repository root:
+    python benchmarks/bench_namespace_plugin.py
+    python benchmarks/bench_namespace_plugin.py --sizes 1 8 32 --legacy-max 2
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.SOAPLibrary import _ObjectNamespacePlugin
+
+HEADER = b'<?xml version="1.0"?>\n<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" ' \
+         b'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" elementFormDefault="qualified">\n'
+ELEMENTS = [
+    b'  <xs:element name="item%d" type="Item%d"/>\n',
+    b'  <xs:element name="text%d" type="xs:string"/><!-- %d -->\n',
+    b'  <xs:element name="any%d" type=""/><!-- %d -->\n',
+    b'  <xs:element name="fixed%d" xsi:type="Fixed%d" basetype="Base"/>\n',
+    b'  <xs:complexType name="Type%d"><xs:attribute name="code" type="Code%d"/></xs:complexType>\n',
+]
+
+
+class Context:
+    def __init__(self, document):
+        self.document = document
+
+
+def build_schema(megabytes, seed=0):
+    """Build a schema of about the given size."""
+    generator = random.Random(seed)
+    parts = [HEADER]
+    size = len(HEADER)
+    index = 0
+    while size < megabytes * 1024 * 1024:
+        part = generator.choice(ELEMENTS) % (index, index)
+        parts.append(part)
+        size += len(part)
+        index += 1
+    parts.append(b'</xs:schema>\n')
+    return b''.join(parts)
+
+
+def legacy_rewrite(document):
+    """The type rewriting of _ObjectNamespacePlugin.loaded before it was a regular expression substitution."""
+    number_of_types = document.count(b'type="')
+    start_location = document.find(b'type="')
+    for _ in range(number_of_types):
+        end_type = document.find(b'"', start_location+len(b'type="'))
+        if b':' not in document[start_location:end_type]:
+            change_type = document[start_location:end_type]
+            change_type = change_type.replace(b'"', b'"tns:')
+            document = document[:start_location] + change_type + document[end_type:]
+        start_location = document.find(b'type="', start_location+1)
+    return document
+
+
+def fix_namespace(document):
+    """Run the plugin on an imported document missing its target namespace."""
+    plugin = _ObjectNamespacePlugin()
+    plugin.defaultNamespace = b"urn:benchmark"
+    context = Context(document)
+    plugin.loaded(context)
+    return context.document
+
+
+def add_namespace(document):
+    """The namespace declarations the plugin adds before rewriting the types."""
+    document_split = document.split(b'xmlns', 1)
+    return document_split[0] + b'xmlns:tns="urn:benchmark" targetNamespace="urn:benchmark" xmlns' + document_split[1]
+
+
+def best_time(function, argument, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.25, 1, 4, 16], help='schema sizes in megabytes')
+    parser.add_argument('--legacy-max', type=float, default=1, help='largest schema the old loop is timed on')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the best one is reported')
+    args = parser.parse_args()
+    print(f"{'megabytes':>9} {'types':>8} {'plugin':>9} {'old loop':>9} {'speedup':>8}")
+    for megabytes in args.sizes:
+        document = build_schema(megabytes)
+        seconds, fixed = best_time(fix_namespace, document, args.repeat)
+        types = document.count(b'type="')
+        line = f"{len(document) / 1024 / 1024:>9.2f} {types:>8} {seconds:>9.4f}"
+        if megabytes <= args.legacy_max:
+            legacy_seconds, legacy_fixed = best_time(legacy_rewrite, add_namespace(document), 1)
+            if legacy_fixed != fixed:
+                raise AssertionError(f"the plugin and the old loop differ on the {megabytes}MB schema")
+            line += f" {legacy_seconds:>9.4f} {legacy_seconds / seconds:>7.0f}x"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
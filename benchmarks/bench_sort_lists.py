@@ -0,0 +1,73 @@
+"""Time of key_by_key_validator with sort_lists=True on lists of objects.
+
+Each list is sorted once with a cached sort key, so the time per item should grow with log(n). The old approach, which
+sorted the actual list again for every expected item, is timed on the smaller sizes for comparison. Run from the
+repository root:
+    python benchmarks/bench_sort_lists.py --sizes 1000 10000 100000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.APILibrary import APILibrary
+
+OLD_APPROACH_MAX_SIZE = 2000
+
+
+def build_items(size):
+    """Build a list of objects shaped like an API list response, with nested values, None and mixed types."""
+    items = [{"id": index, "name": f"item {index}", "price": index * 1.25, "owner": None if index % 3 else {"id": 7},
+              "tags": ["b", "a"] if index % 2 else [1, "a", None]} for index in range(size)]
+    shuffled = list(items)
+    random.Random(size).shuffle(shuffled)
+    return items, shuffled
+
+
+def old_sort_and_compare(actual, expected):
+    expected = list(map(dict, sorted(list(item.items()) for item in expected)))
+    for index, item in enumerate(expected):
+        sorted_actual = list(map(dict, sorted(list(entry.items()) for entry in actual)))
+        assert sorted_actual[index] == item
+
+
+def measure(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='list lengths')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the best one is reported')
+    args = parser.parse_args()
+    library = APILibrary()
+    print(f"{'items':>8} {'seconds':>10} {'us/(n log2 n)':>14} {'old seconds':>12}")
+    for size in args.sizes:
+        expected, actual = build_items(size)
+        unmatched = []
+        elapsed = measure(lambda: library.key_by_key_validator({"items": actual}, {"items": expected},
+                                                               unmatched_keys_list=unmatched, sort_lists=True),
+                          args.repeat)
+        assert not unmatched, unmatched[:3]
+        old = "-"
+        if size <= OLD_APPROACH_MAX_SIZE:
+            # The old sort key could not order None against dicts, so it is timed without the owner values.
+            simple = [{key: value for key, value in item.items() if key not in ("owner", "tags")} for item in expected]
+            simple_actual = [{key: value for key, value in item.items() if key not in ("owner", "tags")}
+                             for item in actual]
+            old = f"{measure(lambda: old_sort_and_compare(simple_actual, simple), 1):.3f}"
+        per_item = elapsed / (size * math.log2(size)) * 1e6
+        print(f"{size:>8} {elapsed:>10.3f} {per_item:>14.3f} {old:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""Time of the APILibrary validation hot paths on synthetic responses, compared to a saved baseline.
+
+Responses are lists of items with nested objects, lists and dates, generated for each list length and nesting depth.
+The cases cover Validate Response Contains Expected Response with its default options, full_list_validation,
+sort_lists, date margins and a compiled expected response, plus _convert_resp_to_dict and _date_format. --processes
+adds full_list_validation in worker processes, which is left out of the baseline as it depends on the cores of the
+machine. Every time is divided by the time of a fixed pure Python workload measured in the same run, so a baseline
+saved on one machine can be compared on another. Run from the repository root:
+    python benchmarks/bench_validation.py
+    python benchmarks/bench_validation.py --save benchmarks/baseline_validation.json
+    python benchmarks/bench_validation.py --compare benchmarks/baseline_validation.json --tolerance 1.5
+--compare exits with status 1 when a case is slower than its baseline by more than the tolerance.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.APILibrary import APILibrary, _convert_resp_to_dict, _date_format
+from Zoomba.Helpers.DateParser import _parse_date_string, is_date_string
+
+BASE_DATE = datetime.datetime(2024, 1, 1)
+MIN_RUN_SECONDS = 0.05
+
+
+def date_string(index, shift=0):
+    return (BASE_DATE + datetime.timedelta(minutes=index, seconds=shift)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_item(index, depth, shift=0):
+    """Build an item of a list response, with an object nested depth levels deep."""
+    nested = {"level": depth, "values": [index, index + 1, index + 2]}
+    for level in range(depth - 1, 0, -1):
+        nested = {"level": level, "child": nested, "labels": [f"label {level}", "shared"]}
+    return {"id": index, "name": f"item {index}", "price": index * 1.25, "active": index % 2 == 0,
+            "updated": date_string(index, shift), "created": date_string(index, shift), "owner": None,
+            "tags": ["b", "a", str(index % 5)], "nested": nested}
+
+
+def build_responses(size, depth):
+    """Build an expected list response and an actual one whose dates are shifted within the default margin and
+    whose tags are in another order."""
+    expected = [build_item(index, depth) for index in range(size)]
+    actual = [build_item(index, depth, shift=30) for index in range(size)]
+    for item in actual:
+        item["tags"].reverse()
+    shuffled = list(actual)
+    random.Random(size).shuffle(shuffled)
+    return expected, actual, shuffled
+
+
+def build_http_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = payload.encode()
+    response.encoding = "utf-8"
+    response.url = "http://localhost/items"
+    return response
+
+
+def cases(size, depth, processes=None):
+    """Return (name, function) pairs timing one run of each hot path on a response of the given size."""
+    library = APILibrary()
+    expected, actual, shuffled = build_responses(size, depth)
+    ordered_body = json.dumps(actual)
+    shuffled_body = json.dumps(shuffled)
+    compiled = library.compile_expected_response(expected, ignored_keys=["updated", "tags"])
+    dates = [date_string(index, 7) for index in range(size)]
+    http_response = build_http_response(ordered_body)
+
+    def date_format():
+        _parse_date_string.cache_clear()
+        is_date_string.cache_clear()
+        for value in dates:
+            _date_format(value, "key", [], "Actual")
+
+    def convert_resp_to_dict():
+        converted = _convert_resp_to_dict(http_response)
+        return converted.status_code, converted.json()
+
+    timed = [
+        ("validate-default", lambda: library.validate_response_contains_expected_response(
+            shuffled_body, expected, ignored_keys=["updated", "created", "tags"])),
+        ("validate-full-list", lambda: library.validate_response_contains_expected_response(
+            ordered_body, expected, ignored_keys=["updated", "created", "tags"], full_list_validation=True)),
+        ("validate-sort-lists", lambda: library.validate_response_contains_expected_response(
+            shuffled_body, expected, ignored_keys=["updated", "created"], sort_lists=True)),
+        ("validate-dates", lambda: library.validate_response_contains_expected_response(
+            shuffled_body, expected, ignored_keys=["tags"], margin_type="minutes", margin_amt=1)),
+        ("validate-dates-batch", lambda: library.validate_response_contains_expected_response(
+            shuffled_body, expected, ignored_keys=["tags"], batch_dates=True, margin_type="minutes",
+            margin_amt=1)),
+        ("validate-compiled", lambda: library.validate_response_contains_expected_response(shuffled_body, compiled)),
+        ("convert-resp-to-dict", convert_resp_to_dict),
+        ("date-format", date_format),
+    ]
+    if processes:
+        timed.append(("validate-full-list-processes", lambda: library.validate_response_contains_expected_response(
+            ordered_body, expected, ignored_keys=["updated", "created", "tags"], full_list_validation=True,
+            processes=processes)))
+    return timed
+
+
+def calibrate(repeat):
+    """Time a fixed pure Python workload, the unit every result is expressed in."""
+    def workload():
+        values = {}
+        for index in range(200000):
+            values[str(index)] = [index, index * 2]
+        return sorted(values, reverse=True)
+    return measure(workload, repeat)
+
+
+def measure(function, repeat):
+    """Best time of one call over repeat runs. Like timeit, each run calls the function enough times to last at least
+    MIN_RUN_SECONDS and the garbage collector is off while timing."""
+    function()
+    loops = 1
+    while True:
+        elapsed = timed_run(function, loops)
+        if elapsed >= MIN_RUN_SECONDS:
+            break
+        loops *= 2 if elapsed * 2 >= MIN_RUN_SECONDS else 10
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, timed_run(function, loops))
+    return best / loops
+
+
+def timed_run(function, loops):
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        return time.perf_counter() - start
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='list lengths')
+    parser.add_argument('--depth', type=int, default=3, help='nesting depth of the object in each item')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement, the best one is reported')
+    parser.add_argument('--cases', nargs='+', help='only run the cases with these names')
+    parser.add_argument('--processes', type=int,
+                        help='also time full_list_validation with this many worker processes')
+    parser.add_argument('--save', help='write the results to this baseline file')
+    parser.add_argument('--compare', help='compare the results to this baseline file')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='slowdown ratio over the baseline reported as a regression')
+    args = parser.parse_args()
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    unit = calibrate(args.repeat)
+    results = {}
+    regressions = []
+    print(f"calibration {unit:.4f}s, results are given in seconds and in calibration units")
+    print(f"{'case':<28} {'items':>7} {'seconds':>9} {'units':>8} {'baseline':>9} {'ratio':>6}")
+    with patch('robot.libraries.BuiltIn.BuiltIn.fail') as fail:
+        for size in args.sizes:
+            for name, function in cases(size, args.depth, args.processes):
+                if args.cases and name not in args.cases:
+                    continue
+                seconds = measure(function, args.repeat)
+                if fail.called:
+                    raise AssertionError(f"{name} failed its validation: {fail.call_args[0][0][:500]}")
+                key = f"{name}[{size}x{args.depth}]"
+                results[key] = seconds / unit
+                line = f"{name:<28} {size:>7} {seconds:>9.4f} {results[key]:>8.3f}"
+                if key in baseline:
+                    ratio = results[key] / baseline[key]
+                    line += f" {baseline[key]:>9.3f} {ratio:>6.2f}"
+                    if ratio > args.tolerance:
+                        regressions.append(key)
+                        line += "  REGRESSION"
+                print(line)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump({"depth": args.depth, "repeat": args.repeat, "results": results}, baseline_file, indent=2,
+                      sort_keys=True)
+            baseline_file.write("\n")
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.tolerance}x: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
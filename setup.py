@@ -31,6 +31,9 @@ setup(name='robotframework-zoomba',
       extras_require={
         'testing': [
           'mock'
+        ],
+        'async': [
+          'httpx'
         ]
       },
       classifiers="""
@@ -1,18 +1,35 @@
 import datetime
-import json
-import warnings
+import itertools
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from time import perf_counter
 
-from RequestsLibrary import RequestsLibrary, utils
+from RequestsLibrary import RequestsLibrary, log, utils
 from Zoomba import ZoombaError
-from dateutil.parser import parse
+from Zoomba.ZoombaError import MismatchBudgetReached, ZoombaErrorList
+from Zoomba.Helpers.AsyncEngine import AsyncEngine
+from Zoomba.Helpers.CompiledExpectedResponse import CompiledExpectedResponse
+from Zoomba.Helpers.DateParser import parse_date
+from Zoomba.Helpers.IgnoredKeys import IgnoredKeys
+from Zoomba.Helpers.JsonBackend import get_json_backend
+from Zoomba.Helpers.JsonStream import stream_json
+from Zoomba.Helpers.LazyResponse import LazyResponse
+from Zoomba.Helpers.ParallelValidation import MIN_CHUNK_SIZE, validate_in_processes
+from Zoomba.Helpers.SessionPool import SessionPool, merge_url
+from Zoomba.Helpers.ValidationProfile import ValidationProfile
 from urllib3.exceptions import InsecureRequestWarning
 from requests.packages import urllib3
 from robot.libraries.BuiltIn import BuiltIn
-from robot.utils.dotdict import DotDict
-from pandas import to_datetime
 
 zoomba = BuiltIn()
 requests_lib = RequestsLibrary()
+_NO_ITEM = object()
+# Session pools of the ``reuse_sessions`` import argument by pool settings. Robot creates a library instance for every
+# test, the pools are kept here so sessions are reused for the whole run.
+_session_pools = {}
+# Engines of the ``httpx`` http_engine by number of connections, kept for the whole run like the session pools.
+_async_engines = {}
 
 
 class APILibrary:
@@ -22,8 +39,54 @@ class APILibrary:
         It has been generated to accommodate the RESTful API design pattern.
     """
 
-    def __init__(self):
+    def __init__(self, reuse_sessions=False, pool_connections=10, pool_maxsize=10, session_idle_timeout=300,
+                 json_backend=None, http_engine="requests", validation_profile=None, max_listed_mismatches=None):
+        """APILibrary can be imported with several optional arguments.
+
+        - ``reuse_sessions``:
+          Keep sessions alive between ``Call ... Request`` keywords, so repeated calls with the same endpoint,
+          headers, cookies, verify and timeout reuse their keep-alive connections. The sessions are kept for the whole
+          run and shared by the imports with the same pool settings. Defaults to False, which creates a new session
+          for every call.
+        - ``pool_connections``:
+          Number of host connection pools kept per reused session.
+        - ``pool_maxsize``:
+          Maximum number of connections kept alive per host in a reused session.
+        - ``session_idle_timeout``:
+          Seconds a reused session may stay unused before it is closed. Set to 0 to never close idle sessions.
+        - ``json_backend``:
+          JSON implementation used to decode responses in the ``Validate ...`` keywords: ``json``, ``orjson``,
+          ``ujson`` or ``auto`` for the fastest one installed. Defaults to the standard library ``json`` module.
+          With ``streaming`` the items of a list response are decoded one at a time with the standard library, which
+          is the only one decoding a value at an offset of a partly read body, other streamed bodies use this backend.
+        - ``http_engine``:
+          ``requests`` (default) sends requests through RequestsLibrary sessions. ``httpx`` sends them with asyncio
+          httpx clients, so `Call Requests In Parallel` can keep thousands of requests in flight without a thread per
+          request. ``pool_maxsize`` is then the number of connections per client. The clients and their event loop are
+          kept for the whole run and shared by the imports with the same ``pool_maxsize``. Requires the optional httpx
+          package, ``pip install robotframework-zoomba[async]``.
+        - ``validation_profile``:
+          Profile `Validate Response Contains Expected Response`: ``log`` writes the time spent on each top level key
+          of the expected response to the Robot log, any other value is the path of a JSON Lines file each profile is
+          appended to. Defaults to None, which does not profile. See `Set Validation Profile`.
+        - ``max_listed_mismatches``:
+          Number of mismatches the ``Validate ...`` keywords list in full in their error message, the ones after it
+          are only counted, so a response with a very large number of mismatches does not keep them all in memory.
+          Unlike ``max_mismatches`` the whole response is still checked. Defaults to None, which lists every mismatch.
+        """
         self.suppress_warnings = False
+        self.json_backend = get_json_backend(json_backend)
+        self.async_engine = None
+        if str(http_engine).lower() == "httpx":
+            self.async_engine = _shared_async_engine(pool_maxsize)
+        elif str(http_engine).lower() != "requests":
+            raise ValueError(f"Unknown http_engine '{http_engine}', expected 'requests' or 'httpx'")
+        self.validation_profile = validation_profile
+        self.max_listed_mismatches = None if max_listed_mismatches is None else int(max_listed_mismatches)
+        self._profile = None
+        self.session_pool = None
+        if reuse_sessions:
+            self.session_pool = _shared_session_pool(pool_connections, pool_maxsize, session_idle_timeout)
 
     def suppress_insecure_request_warnings(self, suppress="True"):
         """Suppress Insecure Request Warnings. This keyword suppresses or un-suppresses insecure request warnings\n
@@ -35,6 +98,31 @@ class APILibrary:
         """
         self.suppress_warnings = "FALSE" not in suppress.upper()
 
+    def set_validation_profile(self, target=None):
+        """Set Validation Profile. Profiles the following `Validate Response Contains Expected Response` keywords.
+        For each top level key of the expected response, added up over the items of a list response, the profile
+        records the seconds spent, the number of expected values below it and the number of dates compared. Slow
+        expectations can then be told apart from the time spent decoding the response.\n
+        target: (string) ``log`` to write the profile to the Robot log, otherwise the path of a JSON Lines file each
+        profile is appended to as one line. None stops profiling.\n
+        Examples:
+        | Set Validation Profile | log |                        #Profiles are written to the log
+        | Set Validation Profile | ${OUTPUT DIR}/profile.jsonl |  #Profiles are appended to a file
+        | Set Validation Profile |                            #Stops profiling
+        """
+        self.validation_profile = target or None
+
+    def close_pooled_sessions(self):
+        """Close Pooled Sessions. Closes every session kept alive by the ``reuse_sessions`` import argument, and the
+        clients of the ``httpx`` engine. The next ``Call ... Request`` keyword will open a new session.\n
+        Examples:
+        | Close Pooled Sessions
+        """
+        if self.session_pool is not None:
+            self.session_pool.close_all()
+        if self.async_engine is not None:
+            self.async_engine.close()
+
     def call_get_request(self, headers=None, endpoint=None, fullstring=None, cookies=None, timeout=None, **kwargs):
         """ Generate a GET Request. This Keyword is basically a wrapper for get_request from the RequestsLibrary.\n
             headers: (dictionary) The headers to be sent as part of the request.\n
@@ -47,6 +135,8 @@ class APILibrary:
         """
         if self.suppress_warnings:
             urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None or self.session_pool is not None:
+            return self._call_pooled("get", headers, endpoint, fullstring, cookies=cookies, timeout=timeout, **kwargs)
         requests_lib.create_session("getapi", endpoint, headers, cookies=cookies, timeout=timeout)
         resp = requests_lib.get_on_session("getapi", fullstring, timeout=timeout, expected_status='any', **kwargs)
         return _convert_resp_to_dict(resp)
@@ -66,6 +156,9 @@ class APILibrary:
         """
         if self.suppress_warnings:
             urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None or self.session_pool is not None:
+            return self._call_pooled("post", headers, endpoint, fullstring, data=data, files=files, cookies=cookies,
+                                     timeout=timeout, **kwargs)
         session = requests_lib.create_session("postapi", endpoint, headers, cookies=cookies, timeout=timeout)
         data = utils.format_data_according_to_header(session, data, headers)
         resp = requests_lib.post_on_session("postapi", fullstring, data, files=files, timeout=timeout,
@@ -84,6 +177,9 @@ class APILibrary:
         """
         if self.suppress_warnings:
             urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None or self.session_pool is not None:
+            return self._call_pooled("delete", headers, endpoint, fullstring, cookies=cookies, timeout=timeout,
+                                     **kwargs)
         requests_lib.create_session("deleteapi", endpoint, headers, cookies=cookies, timeout=timeout)
         resp = requests_lib.delete_on_session("deleteapi", fullstring, timeout=timeout, expected_status='any', **kwargs)
         return _convert_resp_to_dict(resp)
@@ -102,6 +198,9 @@ class APILibrary:
         """
         if self.suppress_warnings:
             urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None or self.session_pool is not None:
+            return self._call_pooled("patch", headers, endpoint, fullstring, data=data, cookies=cookies,
+                                     timeout=timeout, **kwargs)
         session = requests_lib.create_session("patchapi", endpoint, headers, cookies=cookies, timeout=timeout)
         data = utils.format_data_according_to_header(session, data, headers)
         resp = requests_lib.patch_on_session("patchapi", fullstring, data, timeout=timeout, expected_status='any',
@@ -122,77 +221,212 @@ class APILibrary:
         """
         if self.suppress_warnings:
             urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None or self.session_pool is not None:
+            return self._call_pooled("put", headers, endpoint, fullstring, data=data, cookies=cookies,
+                                     timeout=timeout, **kwargs)
         session = requests_lib.create_session("putapi", endpoint, headers, cookies=cookies, timeout=timeout)
         data = utils.format_data_according_to_header(session, data, headers)
         resp = requests_lib.put_on_session("putapi", fullstring, data, timeout=timeout, expected_status='any', **kwargs)
         return _convert_resp_to_dict(resp)
 
+    def call_requests_in_parallel(self, request_specs, max_workers=10):
+        """ Call Requests In Parallel. Sends a list of independent requests concurrently on a bounded pool of threads
+            and returns their responses in the same order as the specs. Requests with the same endpoint, headers,
+            cookies and timeout share one session, and the pooled sessions when ``reuse_sessions`` is enabled.\n
+            request_specs: (list of dictionaries) One dictionary per request with the keys method (defaults to GET),
+            endpoint, fullstring, headers, data, files, cookies and timeout as used by the ``Call ... Request``
+            keywords. Any other key is passed on to the request, e.g. params or allow_redirects.\n
+            max_workers: (int) Maximum number of requests in flight at the same time, defaults to 10. With the ``httpx``
+            engine this is the number of concurrent requests on the event loop rather than threads.\n
+            return: (list) The response objects in input order. Each response has a ``duration`` attribute with the
+            time in seconds the request took, including reading the body.\n
+            Examples:
+            | ${specs}= | Create List | ${get_spec} | ${post_spec} |
+            | ${responses}= | Call Requests In Parallel | ${specs} | max_workers=20 |
+            | Should Be Equal As Integers | ${responses}[0].status_code | 200 |
+        """
+        if self.suppress_warnings:
+            urllib3.disable_warnings(InsecureRequestWarning)
+        if self.async_engine is not None:
+            results = self.async_engine.request_all(request_specs, max_workers)
+        else:
+            results = self._send_in_threads(request_specs, max_workers)
+        responses = []
+        failed_requests = []
+        for index, (method, url, resp, duration, error) in enumerate(results):
+            if error is not None:
+                failed_requests.append(f"[{index}] {method.upper()} {url}: {error!r}")
+                continue
+            zoomba.log(f"[{index}] {method.upper()} {url} returned {resp.status_code} in {duration:.3f}s")
+            resp = _convert_resp_to_dict(resp)
+            resp.duration = duration
+            responses.append(resp)
+        if failed_requests:
+            ZoombaError(error="Parallel Request(s) Failed",
+                        failed_requests="\n" + "\n".join(failed_requests)).fail()
+        return responses
+
+    def _send_in_threads(self, request_specs, max_workers):
+        pool = self.session_pool
+        if pool is None:
+            pool = SessionPool(pool_maxsize=max_workers, idle_timeout=None)
+        try:
+            # The sessions stay checked out until the whole batch is sent, so the pool does not close them meanwhile.
+            with ExitStack() as checkouts:
+                prepared = [_prepare_pooled_request(pool, spec, checkouts) for spec in request_specs]
+                with ThreadPoolExecutor(max_workers=int(max_workers)) as executor:
+                    return list(executor.map(_send_prepared_request, prepared))
+        finally:
+            if pool is not self.session_pool:
+                pool.close_all()
+
+    def _call_pooled(self, method, headers, endpoint, fullstring, **kwargs):
+        """Send a request with the httpx engine, or on a session of the ``reuse_sessions`` pool."""
+        spec = dict(kwargs, method=method, headers=headers, endpoint=endpoint, fullstring=fullstring)
+        if self.async_engine is not None:
+            resp = self.async_engine.request(spec)
+        else:
+            with ExitStack() as checkouts:
+                method, url, session, request_kwargs = _prepare_pooled_request(self.session_pool, spec, checkouts)
+                resp = session.request(method, url, **request_kwargs)
+        log.log_request(resp)
+        log.log_response(resp)
+        return _convert_resp_to_dict(resp)
+
     def validate_response_contains_expected_response(self, json_actual_response, expected_response_dict,
                                                      ignored_keys=None, full_list_validation=False, identity_key="id",
-                                                     sort_lists=False, **kwargs):
+                                                     sort_lists=False, streaming=False, max_mismatches=None,
+                                                     fail_fast=False, batch_dates=False, processes=None, **kwargs):
         """ This is the most used method for validating Request responses from an API against a supplied
             expected response. It performs an object to object comparison between two json objects, and if that fails,
             a more in depth method is called to find the exact discrepancies between the values of the provided objects.
             Additionally, a list of keys to ignore on the comparison may be supplied, for keys' values to be ignored./n
 
             json_actual_response: (request response object) The response from an API.\n
-            expected_response_dict: (json) The expected response, in json format.\n
-            ignored_keys: (strings list) A list of strings of the keys to be ignored on the validation.\n
+            expected_response_dict: (json) The expected response, in json format, or a compiled expected response from
+            `Compile Expected Response`, which then also holds the validation options. Options given here that differ
+            from the compiled ones are not applied and logged as a warning.\n
+            ignored_keys: (strings list) A list of strings of the keys to be ignored on the validation. A plain key is
+            ignored at every level, a path such as items[*].audit.* or $.id only where it matches.\n
             full_list_validation: (bool) Check that the entire list matches the expected response, defaults to False.\n
-            identity_key: (string) Key to match items to, defaults to 'id'.\n
-            sort_lists: (bool) Sort lists before doing key by key validation, defaults to False.\n
+            identity_key: (string/list) Key to match items to, defaults to 'id'. A list of keys matches items on the
+            combination of their values.\n
+            sort_lists: (bool) Sort lists before doing key by key validation, defaults to False. Lists of scalar values
+            are compared ignoring order, reporting the values missing from and extra in the actual list.\n
+            streaming: (bool) Decode a list response one item at a time and discard items once validated, defaults to
+            False. json_actual_response may then also be a file-like object such as a streamed response's raw body,
+            or an iterator of decoded items such as Call Soap Method Streaming of the Zoomba SOAP Library returns.\n
+            max_mismatches: (int) Stop validating once this many mismatches were found, defaults to None which checks
+            the whole response.\n
+            fail_fast: (bool) Stop validating at the first mismatch, the same as max_mismatches=1, defaults to False.\n
+            batch_dates: (bool) Compare the dates that are not equal together once the whole response was walked,
+            which is much faster for responses holding many dates. Date mismatches are then listed after the other
+            mismatches, defaults to False.\n
+            processes: (int) With full_list_validation, validate the items of a list response in this many worker
+            processes. The keys of the mismatches then start with the index of their item, e.g. [1200].a. Lists shorter
+            than two chunks of 500 items are validated in the calling process, defaults to None which does not start
+            workers.\n
             **kwargs: (dict) Currently supported kwargs are margin_type and margin_amt\n
             margin_type: (string) The type of unit of time to be used to generate a delta for the date comparisons.\n
             margin_amt: (string/#) The amount of units specified in margin_type to allot for difference between dates.\n
             return: There is no actual returned output, other than error messages when comparisons fail.\n
         """
+        arguments = (json_actual_response, expected_response_dict, ignored_keys, full_list_validation, identity_key,
+                     sort_lists, streaming, max_mismatches, fail_fast, batch_dates, processes, kwargs)
+        if not self.validation_profile:
+            return self._validate_response(*arguments)
+        self._profile = ValidationProfile("Validate Response Contains Expected Response")
+        try:
+            return self._validate_response(*arguments)
+        finally:
+            profile, self._profile = self._profile, None
+            profile.finish()
+            profile.write(self.validation_profile)
+
+    def _validate_response(self, json_actual_response, expected_response_dict, ignored_keys, full_list_validation,
+                           identity_key, sort_lists, streaming, max_mismatches, fail_fast, batch_dates, processes,
+                           kwargs):
         if not json_actual_response:
             zoomba.fail("The Actual Response is Empty.")
             return
-        actual_response_dict = json.loads(json_actual_response)
-        unmatched_keys_list = []
+        compiled = _compile(expected_response_dict, ignored_keys, full_list_validation, identity_key, sort_lists,
+                            kwargs, batch_dates)
+        budget = _mismatch_budget(max_mismatches, fail_fast)
+        if streaming:
+            is_list, actual_response_dict = _stream_response(json_actual_response, self.json_backend)
+            if is_list:
+                return self._validate_streamed_list(actual_response_dict, compiled, budget)
+        else:
+            actual_response_dict = self.json_backend.loads(json_actual_response)
+        unmatched_keys_list = ZoombaErrorList(limit=self.max_listed_mismatches, budget=budget)
         if not isinstance(actual_response_dict, list) and actual_response_dict:
-            if actual_response_dict == expected_response_dict:
+            if actual_response_dict == compiled.expected:
                 return
-            self.key_by_key_validator(actual_response_dict, expected_response_dict, ignored_keys,
-                                      unmatched_keys_list, full_list_validation=full_list_validation,
-                                      sort_lists=sort_lists, **kwargs)
+            walk = compiled.walk(self, unmatched_keys_list, self._profile)
+            self._validate_item(actual_response_dict, compiled.root, walk)
             self.generate_unmatched_keys_error_message(unmatched_keys_list)
             return
         if isinstance(actual_response_dict, list) and actual_response_dict:
-            if full_list_validation:
-                return self.full_list_validation(actual_response_dict, expected_response_dict, unmatched_keys_list,
-                                                 ignored_keys, sort_lists=sort_lists, **kwargs)
-            for exp_item in expected_response_dict:
-                for actual_item in actual_response_dict:
-                    try:
-                        if exp_item[identity_key] == actual_item[identity_key]:
-                            self.key_by_key_validator(actual_item, exp_item, ignored_keys, unmatched_keys_list,
-                                                      full_list_validation=full_list_validation, sort_lists=sort_lists,
-                                                      **kwargs)
-                            self.generate_unmatched_keys_error_message(unmatched_keys_list)
-                            break
-                        elif actual_response_dict[-1] == actual_item:
-                            ZoombaError(error='Item was not within the response:\n' + str(exp_item)).fail()
-                            return
-                        else:
-                            continue
-                    except KeyError:
-                        ZoombaError(KeyError=f"\"{identity_key}\" Key was not in the response").fail()
-                        break
+            if compiled.full_list_validation:
+                return self.full_list_validation(actual_response_dict, compiled, unmatched_keys_list,
+                                                 processes=processes)
+            identity_key = compiled.identity_key
+            actual_index, missing_identity = _index_by_identity(actual_response_dict, identity_key)
+            walk = compiled.walk(self, unmatched_keys_list, self._profile)
+            for exp_item, exp_node in zip(compiled.expected, compiled.items):
+                try:
+                    actual_item = actual_index.get(_hashable(_identity_value(exp_item, identity_key)))
+                except KeyError:
+                    ZoombaError(KeyError=f"\"{identity_key}\" Key was not in the response").fail()
+                    continue
+                if actual_item is not None:
+                    self._validate_item(actual_item, exp_node, walk, flush=False)
+                    self.generate_unmatched_keys_error_message(unmatched_keys_list)
+                elif missing_identity:
+                    ZoombaError(KeyError=f"\"{identity_key}\" Key was not in the response").fail()
+                else:
+                    ZoombaError(error='Item was not within the response:\n' + str(exp_item)).fail()
+                    return
+            self._report_batched_dates(walk, unmatched_keys_list)
         else:
             zoomba.fail("The Actual Response is Empty.")
 
+    def compile_expected_response(self, expected_response_dict, ignored_keys=None, full_list_validation=False,
+                                  identity_key="id", sort_lists=False, batch_dates=False, **kwargs):
+        """ Compiles an expected response for validating many responses against it. The structure of the expected
+            response is analysed once, instead of on every `Validate Response Contains Expected Response` call.
+            The returned object is given to that keyword in place of the expected response, the validation options
+            are the ones given here and the same options given to the keyword are not used.\n
+            expected_response_dict: (json) The expected response, in json format.\n
+            ignored_keys: (strings list) A list of strings of the keys to be ignored on the validation. A plain key is
+            ignored at every level, a path such as items[*].audit.* or $.id only where it matches.\n
+            full_list_validation: (bool) Check that the entire list matches the expected response, defaults to False.\n
+            identity_key: (string/list) Key to match items to, defaults to 'id'. A list of keys matches items on the
+            combination of their values.\n
+            sort_lists: (bool) Sort lists before doing key by key validation, defaults to False.\n
+            batch_dates: (bool) Compare the dates that are not equal together, defaults to False.\n
+            **kwargs: (dict) Currently supported kwargs are margin_type and margin_amt\n
+            return: (CompiledExpectedResponse) The compiled expected response.\n
+        """
+        return CompiledExpectedResponse(expected_response_dict, ignored_keys, full_list_validation, identity_key,
+                                        sort_lists, batch_dates, **kwargs)
+
     def validate_response_contains_expected_response_only_keys_listed(self, json_actual_response, expected_response,
-                                                                      key_list):
+                                                                      key_list, streaming=False):
         """ This keyword is used for validating that a specific set of key-value pairs are contained on Request
             responses from an API.\n
             json_actual_response: (request response object) The response from an API.\n
             jsonExpectedResponse: (json) The expected response, in json format.\n
             key_list: (strings list) A list of strings of the keys to be included on the validation.\n
+            streaming: (bool) Only decode the first item of a list response, defaults to False.\n
             return: There is no actual returned output, other than error messages when comparisons fail.\n
         """
-        actual_response_dict = json.loads(json_actual_response)
+        if streaming:
+            is_list, actual_response_dict = _stream_response(json_actual_response, self.json_backend)
+            if is_list:
+                actual_response_dict = list(itertools.islice(actual_response_dict, 1))
+        else:
+            actual_response_dict = self.json_backend.loads(json_actual_response)
         if not isinstance(actual_response_dict, list):
             for expected_key in key_list:
                 if expected_key not in actual_response_dict:
@@ -217,13 +451,23 @@ class APILibrary:
                 ).fail()
         return
 
-    def validate_response_contains_correct_number_of_items(self, json_actual_response, number_of_items):
+    def validate_response_contains_correct_number_of_items(self, json_actual_response, number_of_items,
+                                                           streaming=False):
         """ This keyword is used to validate the number of returned items on Request responses from an API.\n
             json_actual_response: (request response object) The response from an API.\n
             number_of_items: (integer) The expected number of items.\n
+            streaming: (bool) Count the items of a list response without keeping them in memory, defaults to False.\n
             return: There is no actual returned output, other than error messages when comparisons fail.\n
         """
-        actual_response_dict = json.loads(json_actual_response)
+        actual_length = None
+        if streaming:
+            is_list, actual_response_dict = _stream_response(json_actual_response, self.json_backend)
+            if is_list:
+                actual_length = sum(1 for _ in actual_response_dict)
+        else:
+            actual_response_dict = self.json_backend.loads(json_actual_response)
+            if isinstance(actual_response_dict, list):
+                actual_length = len(actual_response_dict)
         if isinstance(number_of_items, str):
             number_of_items = number_of_items.upper()
             if number_of_items == "IGNORE":
@@ -233,10 +477,10 @@ class APILibrary:
                 error="Did not pass number or string value, function expects a number or string 'IGNORE'.").fail()
             return
 
-        if isinstance(actual_response_dict, list):
-            if len(actual_response_dict) != int(number_of_items):
+        if actual_length is not None:
+            if actual_length != int(number_of_items):
                 ZoombaError(
-                    error=f"API is returning {str(len(actual_response_dict))} instead of the expected "
+                    error=f"API is returning {str(actual_length)} instead of the expected "
                           f"{str(number_of_items)} result(s).").fail()
         else:
             ZoombaError(error="The response is not a list:", actual_response=f"\n{actual_response_dict}").fail()
@@ -247,61 +491,47 @@ class APILibrary:
             against a single dictionary actual_item, unless any keys are included on the ignored_keys array./n
 
             actual_item: (array of dictionaries) The list of dictionary items extracted from a json Response.\n
-            ExpectedItem: (dictionary) The expected item with the key to be validated.\n
-            ignored_keys: (strings list) A list of strings of the keys to be ignored on the validation.\n
+            ExpectedItem: (dictionary) The expected item with the key to be validated, or a compiled expected response
+            from `Compile Expected Response`, which is then only analysed once over repeated calls.\n
+            ignored_keys: (strings list) A list of strings of the keys to be ignored on the validation. A plain key is
+            ignored at every level, a path such as items[*].audit.* or $.id only where it matches.\n
             full_list_validation: (bool) Check that the entire list matches the expected response, defaults to False.\n
-            sort_lists: (bool) Sort lists before doing key by key validation, defaults to False.\n
+            sort_lists: (bool) Sort lists before doing key by key validation, defaults to False. Lists of scalar values
+            are compared ignoring order, reporting the values missing from and extra in the actual list.\n
             **kwargs: (dict) Currently supported kwargs are margin_type and margin_amt\n
             margin_type: (string) The type of unit of time to be used to generate a delta for the date comparisons.\n
             margin_amt: (string/#) The amount of units specified in margin_type to allot for difference between dates.\n
             return: (boolean) If the method completes successfully, it returns True. Appropriate error messages are
             returned otherwise.\n
         """
-        if len(actual_dictionary) != len(expected_dictionary):
-            ZoombaError(
+        if unmatched_keys_list is None:
+            unmatched_keys_list = []
+        compiled = _compile(expected_dictionary, ignored_keys, full_list_validation, "id", sort_lists, kwargs)
+        walk = compiled.walk(self, unmatched_keys_list, self._profile)
+        return self._validate_item(actual_dictionary, compiled.root, walk)
+
+    @staticmethod
+    def _validate_item(actual_dictionary, expected_node, walk, flush=True, path=None):
+        if len(actual_dictionary) != len(expected_node.expected):
+            walk.fail(ZoombaError(
                 error="Collections not the same length:",
                 actual_length=str(len(actual_dictionary)),
-                expected_length=str(len(expected_dictionary))).fail()
+                expected_length=str(len(expected_node.expected))))
             return
-        for key, value in expected_dictionary.items():
-            if ignored_keys and key in ignored_keys:
-                continue
-            if key not in actual_dictionary:
-                ZoombaError(
-                    error="Key not found in Actual",
-                    actual=actual_dictionary,
-                    key=key
-                ).fail()
-                continue
-            if isinstance(value, list):
-                if full_list_validation and len(value) != len(actual_dictionary[key]):
-                    ZoombaError(
-                        error="Arrays not the same length",
-                        expected=value,
-                        actual=actual_dictionary[key]
-                    ).fail()
-                    continue
-                self._key_by_key_list(key, value, actual_dictionary, unmatched_keys_list, ignored_keys, parent_key,
-                                      full_list_validation=full_list_validation, sort_lists=sort_lists, **kwargs)
-            elif isinstance(value, dict):
-                self._key_by_key_dict(key, value, actual_dictionary, expected_dictionary, unmatched_keys_list,
-                                      ignored_keys, full_list_validation=full_list_validation, sort_lists=sort_lists,
-                                      **kwargs)
-            elif (isinstance(expected_dictionary[key], str) and not expected_dictionary[key].isdigit()) or isinstance(
-                    expected_dictionary[key], datetime.datetime):
-                try:
-                    if not isinstance(expected_dictionary[key], datetime.datetime):
-                        parse(expected_dictionary[key])
-                    self.date_string_comparator(value, actual_dictionary[key], key, unmatched_keys_list, **kwargs)
-                except (ValueError, TypeError):
-                    if value == actual_dictionary[key]:
-                        continue
-                    else:
-                        unmatched_keys_list.append(ZoombaError(key=key, expected=value, actual=actual_dictionary[key]))
-            elif value == actual_dictionary[key]:
-                continue
+        if actual_dictionary == expected_node.expected:
+            return True
+        try:
+            if isinstance(expected_node.expected, list):
+                # An expected list is compared as a list, it has no keys to walk.
+                expected_node.diff(actual_dictionary, path or [], walk)
+            elif walk.profile is None:
+                expected_node.diff_keys(actual_dictionary, path or [], walk)
             else:
-                unmatched_keys_list.append(ZoombaError(key=key, expected=value, actual=actual_dictionary[key]))
+                walk.profile.diff_keys(expected_node, actual_dictionary, walk)
+        except MismatchBudgetReached:
+            return True
+        if flush:
+            walk.flush()
         return True
 
     def date_string_comparator(self, expected_date, actual_date, key, unmatched_keys_list, **kwargs):
@@ -352,146 +582,218 @@ class APILibrary:
     def generate_unmatched_keys_error_message(self, unmatched_keys):
         """ This method is only used as an internal call from other validating methods to generate an error string
             containing every unmatched key when a validation fails.\n
-            unmatchedKeys: (array of key/value pairs) An array containing the unmatched keys during a validation.\n
+            unmatchedKeys: (array of key/value pairs) An array containing the unmatched keys during a validation.
+            When it is a ZoombaErrorList that reached its limit or budget, the mismatches not kept or not checked are
+            reported too.\n
         """
         if unmatched_keys:
+            dropped = getattr(unmatched_keys, 'dropped', 0)
             ZoombaError(
                 error="Key(s) Did Not Match",
                 unmatched_keys_list="\n" + "\n".join([str(key) for key in unmatched_keys]),
+                not_shown=f"{dropped} more mismatch(es), only the first {unmatched_keys.limit} are listed"
+                if dropped else None,
+                stopped=f"Validation stopped after {unmatched_keys.budget} mismatch(es), the rest of the response "
+                        f"was not checked" if getattr(unmatched_keys, 'stopped', False) else None,
                 note="Please see differing value(s)"
             ).fail()
 
-    def _key_by_key_list(self, key, value, actual_dictionary, unmatched_keys_list=None, ignored_keys=None,
-                         parent_key=None, full_list_validation=False, sort_lists=False, **kwargs):
-        if sort_lists and isinstance(value, list):
+    def _validate_streamed_list(self, actual_items, compiled, budget=None):
+        first_item = next(actual_items, _NO_ITEM)
+        if first_item is _NO_ITEM:
+            zoomba.fail("The Actual Response is Empty.")
+            return
+        actual_items = itertools.chain([first_item], actual_items)
+        unmatched_keys_list = ZoombaErrorList(limit=self.max_listed_mismatches, budget=budget)
+        walk = compiled.walk(self, unmatched_keys_list, self._profile)
+        if compiled.full_list_validation:
+            for actual_item, expected_item, expected_node in zip(actual_items, compiled.expected, compiled.items):
+                if unmatched_keys_list.stopped:
+                    break
+                if actual_item != expected_item:
+                    self._validate_item(actual_item, expected_node, walk, flush=False)
+            walk.flush()
+            if unmatched_keys_list:
+                breakdown = ZoombaError(expected=compiled.expected, actual="Not kept when streaming")
+                unmatched_keys_list.append_summary(ZoombaError(
+                    full_list_breakdown=breakdown,
+                    important="full_list_breakdown"
+                ))
+                self.generate_unmatched_keys_error_message(unmatched_keys_list)
+            return
+        identity_key = compiled.identity_key
+        pending = {}
+        for exp_item, exp_node in zip(compiled.expected, compiled.items):
             try:
-                value = list(map(dict, sorted(list(i.items()) for i in value)))
-            except AttributeError:
-                pass
-        for index, item in enumerate(value):
-            if isinstance(item, str):
-                if value != actual_dictionary[key]:
-                    if sort_lists:
-                        sorted_value = sorted(value)
-                        sorted_actual = sorted(actual_dictionary[key])
-                        if sorted_value != sorted_actual:
-                            ZoombaError(
-                                error="Arrays do not match",
-                                expected=sorted_value,
-                                actual=sorted_actual
-                            ).fail()
-                            continue
-                    else:
-                        ZoombaError(
-                            error="Arrays do not match",
-                            expected=value,
-                            actual=actual_dictionary[key],
-                            tip="If this is simply out of order try 'sort_list=True'"
-                        ).fail()
-                        continue
+                identity = _hashable(_identity_value(exp_item, identity_key))
+            except KeyError:
+                ZoombaError(KeyError=f"\"{identity_key}\" Key was not in the response").fail()
+                continue
+            pending.setdefault(identity, []).append((exp_item, exp_node))
+        missing_identity = 0
+        for actual_item in actual_items:
+            if not pending:
+                break
+            try:
+                identity = _hashable(_identity_value(actual_item, identity_key))
+            except KeyError:
+                missing_identity += 1
+                continue
+            for _, exp_node in pending.pop(identity, ()):
+                self._validate_item(actual_item, exp_node, walk, flush=False)
+                self.generate_unmatched_keys_error_message(unmatched_keys_list)
+        self._report_batched_dates(walk, unmatched_keys_list)
+        for exp_items in pending.values():
+            if missing_identity:
+                ZoombaError(KeyError=f"\"{identity_key}\" Key was not in the response").fail()
             else:
-                if len(actual_dictionary[key]) == 0:
-                    actual_item = ''
-                else:
-                    if sort_lists:
-                        actual_dictionary[key] = list(
-                            map(dict, sorted(list(i.items()) for i in actual_dictionary[key])))
-                    actual_item = actual_dictionary[key][index]
-                temp_actual_dict = {key: actual_item}
-                temp_expected_dict = {key: item}
-                if unmatched_keys_list:
-                    current_unmatched_length = len(unmatched_keys_list)
-                else:
-                    current_unmatched_length = 0
-                self.key_by_key_validator(temp_actual_dict, temp_expected_dict,
-                                          ignored_keys, unmatched_keys_list, parent_key=key,
-                                          full_list_validation=full_list_validation, sort_lists=sort_lists, **kwargs)
-                if unmatched_keys_list is None:
-                    continue
-                else:
-                    _unmatched_list_check(unmatched_keys_list, current_unmatched_length,
-                                          key, index, parent_key, is_list=True)
-
-    def _key_by_key_dict(self, key, value, actual_dictionary, expected_dictionary, unmatched_keys_list=None,
-                         ignored_keys=None, full_list_validation=False, sort_lists=False, **kwargs):
-        try:
-            if len(value) != len(actual_dictionary[key]):
-                ZoombaError(
-                    error="Dicts do not match",
-                    expected=value,
-                    actual=actual_dictionary[key]
-                ).fail()
+                ZoombaError(error='Item was not within the response:\n' + str(exp_items[0][0])).fail()
                 return
-        except TypeError:
-            ZoombaError(
-                error="Dicts do not match",
-                expected=value,
-                actual="Actual is not a valid dictionary."
-            ).fail()
-            return
-        if unmatched_keys_list is not None:
-            current_unmatched_length = len(unmatched_keys_list)
-        self.key_by_key_validator(actual_dictionary[key], expected_dictionary[key],
-                                  ignored_keys, unmatched_keys_list, parent_key=key,
-                                  full_list_validation=full_list_validation, sort_lists=sort_lists, **kwargs)
-        if unmatched_keys_list is None:
-            return
-        _unmatched_list_check(unmatched_keys_list, current_unmatched_length, key)
+
+    def _report_batched_dates(self, walk, unmatched_keys_list):
+        """Compare the dates collected over the items of a list response by batch_dates, which are only reported
+        once every item was walked."""
+        recorded = len(unmatched_keys_list) + getattr(unmatched_keys_list, 'dropped', 0)
+        walk.flush()
+        if len(unmatched_keys_list) + getattr(unmatched_keys_list, 'dropped', 0) > recorded:
+            self.generate_unmatched_keys_error_message(unmatched_keys_list)
 
     def full_list_validation(self, actual_response_dict, expected_response_dict, unmatched_keys_list, ignored_keys=None,
-                             sort_lists=False, **kwargs):
-        if actual_response_dict == expected_response_dict:
+                             sort_lists=False, processes=None, **kwargs):
+        compiled = _compile(expected_response_dict, ignored_keys, True, "id", sort_lists, kwargs)
+        if actual_response_dict == compiled.expected:
             return
-        for actual_item, expected_item in zip(actual_response_dict, expected_response_dict):
-            self.key_by_key_validator(actual_item, expected_item, ignored_keys, unmatched_keys_list,
-                                      full_list_validation=True, sort_lists=sort_lists, **kwargs)
+        if processes and int(processes) > 1 and \
+                min(len(actual_response_dict), len(compiled.expected)) >= 2 * MIN_CHUNK_SIZE:
+            events = validate_in_processes(actual_response_dict, compiled, int(processes),
+                                           getattr(unmatched_keys_list, 'budget', None))
+            try:
+                for kind, event in events:
+                    if kind == "fail":
+                        event.fail()
+                        continue
+                    try:
+                        unmatched_keys_list.append(event)
+                    except MismatchBudgetReached:
+                        break
+            finally:
+                events.close()
+        else:
+            walk = compiled.walk(self, unmatched_keys_list, self._profile)
+            for actual_item, expected_node in zip(actual_response_dict, compiled.items):
+                if getattr(unmatched_keys_list, 'stopped', False):
+                    break
+                self._validate_item(actual_item, expected_node, walk, flush=False)
+            walk.flush()
         if unmatched_keys_list:
-            unmatched_keys_list.append(ZoombaError(
-                full_list_breakdown=f"\n{ZoombaError(expected=expected_response_dict, actual=actual_response_dict)}",
-                important="full_list_breakdown"
-            ))
+            # The breakdown is always kept, even when the list has reached its limit of records.
+            breakdown = ZoombaError(full_list_breakdown=ZoombaError(expected=compiled.expected,
+                                                                    actual=actual_response_dict),
+                                    important="full_list_breakdown")
+            getattr(unmatched_keys_list, 'append_summary', unmatched_keys_list.append)(breakdown)
             self.generate_unmatched_keys_error_message(unmatched_keys_list)
         return
 
 
-def _unmatched_list_check(unmatched_keys_list, current_unmatched_length, key, index=None, parent_key=None,
-                          is_list=False):
-    if len(unmatched_keys_list) <= current_unmatched_length:
-        return
-    adjusted_list_items = []
-
-    for new_index in range(len(unmatched_keys_list) - current_unmatched_length):
-        unmatched_zoomba_error = unmatched_keys_list.pop()
-        if parent_key == key:
-            remnant = unmatched_zoomba_error.key.replace(parent_key, "", 1)
-            unmatched_zoomba_error.key = f"{parent_key}[{index}]{remnant}"
-
-        elif parent_key is not None:
-            if not unmatched_zoomba_error.key.startswith(key):
-                remnant = unmatched_zoomba_error.key
-                if is_list:
-                    unmatched_zoomba_error.key = f"{key}[{index}].{remnant}"
-                else:
-                    unmatched_zoomba_error.key = f"{key}.{remnant}"
-
-        elif is_list:
-            remnant = unmatched_zoomba_error.key.replace(f"{key}[{index}]", "", 1)
-            if f"{key}[{index}]" not in unmatched_zoomba_error.key:
-                if key == remnant:
-                    unmatched_zoomba_error.key = f"{key}[{index}]"
-                else:
-                    unmatched_zoomba_error.key = f"{key}[{index}].{remnant}"
-        adjusted_list_items.append(unmatched_zoomba_error)
-
-    unmatched_keys_list.extend(adjusted_list_items)
+def _compile(expected_response, ignored_keys, full_list_validation, identity_key, sort_lists, kwargs,
+             batch_dates=False):
+    """Use a compiled expected response as it is, otherwise compile the expected response with the given options.
+    Options given with a compiled expected response that differ from its own are not applied, a warning names them."""
+    if isinstance(expected_response, CompiledExpectedResponse):
+        not_applied = _options_not_applied(expected_response, ignored_keys, full_list_validation, identity_key,
+                                           sort_lists, kwargs, batch_dates)
+        if not_applied:
+            zoomba.log(f"The expected response is compiled, so its own validation options are used and "
+                       f"{', '.join(not_applied)} given here are ignored. Give them to Compile Expected Response "
+                       f"instead.", level='WARN')
+        return expected_response
+    return CompiledExpectedResponse(expected_response, ignored_keys, full_list_validation, identity_key, sort_lists,
+                                    batch_dates, **kwargs)
+
+
+def _options_not_applied(compiled, ignored_keys, full_list_validation, identity_key, sort_lists, kwargs,
+                         batch_dates):
+    """Names of the options given with a compiled expected response that are neither defaults nor its own."""
+    options = [("ignored_keys", IgnoredKeys(ignored_keys).keys, frozenset(), compiled.ignored_keys.keys),
+               ("full_list_validation", full_list_validation, False, compiled.full_list_validation),
+               ("identity_key", identity_key, "id", compiled.identity_key),
+               ("sort_lists", sort_lists, False, compiled.sort_lists),
+               ("batch_dates", batch_dates, False, compiled.batch_dates)]
+    options += [(name, value, None, compiled.kwargs.get(name)) for name, value in kwargs.items()]
+    return [name for name, value, default, own in options if value != default and value != own]
+
+
+def _shared_session_pool(pool_connections, pool_maxsize, idle_timeout):
+    key = (int(pool_connections), int(pool_maxsize), float(idle_timeout or 0))
+    if key not in _session_pools:
+        _session_pools[key] = SessionPool(pool_connections, pool_maxsize, idle_timeout)
+    return _session_pools[key]
+
+
+def _shared_async_engine(max_connections):
+    key = int(max_connections)
+    if key not in _async_engines:
+        _async_engines[key] = AsyncEngine(max_connections=key)
+    return _async_engines[key]
+
+
+def _mismatch_budget(max_mismatches, fail_fast):
+    if fail_fast:
+        return 1
+    return None if max_mismatches is None else int(max_mismatches)
+
+
+def _stream_response(response, json_backend):
+    """Open a response for streaming like stream_json, an iterator of decoded items, such as Call Soap Method
+    Streaming returns, is taken as a list response. A body that is not a list is decoded with the json_backend."""
+    if isinstance(response, Iterator) and not hasattr(response, 'read'):
+        return True, response
+    return stream_json(response, loads=json_backend.loads)
+
+
+def _identity_value(item, identity_key):
+    if isinstance(identity_key, (list, tuple)):
+        return tuple(item[key] for key in identity_key)
+    return item[identity_key]
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _index_by_identity(items, identity_key):
+    """Index the items of a list response by their identity_key value(s). When several items share an identity the
+    first one is kept, matching the order items are searched in, and the duplicates are logged.\n
+    return: (tuple) The index and the number of items that did not contain the identity_key.\n
+    """
+    index = {}
+    duplicates = []
+    missing_identity = 0
+    for item in items:
+        try:
+            identity = _hashable(_identity_value(item, identity_key))
+        except KeyError:
+            missing_identity += 1
+            continue
+        if identity in index:
+            duplicates.append(identity)
+            continue
+        index[identity] = item
+    if duplicates:
+        zoomba.log(f"Duplicate \"{identity_key}\" values in the response, only the first item of each is "
+                   f"validated: {duplicates}", level='WARN')
+    return index, missing_identity
 
 
 def _date_format(date_string, key, unmatched_keys_list, date_type, date_format=None):
     formatted_date = None
-    warnings.filterwarnings("ignore", message=".*Discarding nonzero nanoseconds in conversion.*")
     if (date_format is None) and (date_string is not None):
         try:
-            formatted_date = to_datetime(date_string).tz_localize(None).to_pydatetime()
+            formatted_date = parse_date(date_string)
         except ValueError:
             unmatched_keys_list.append(
                 ZoombaError(
@@ -515,11 +817,33 @@ def _date_format(date_string, key, unmatched_keys_list, date_type, date_format=N
     return formatted_date
 
 
-def _convert_resp_to_dict(response):
-    new_response = {
-        item: getattr(response, item)
-        for item in dir(response)
-        if item[0] != '_'
-    }
+def _prepare_pooled_request(pool, spec, checkouts):
+    """Check out the pool session of a request spec until checkouts is closed, and return what sending it needs."""
+    request_kwargs = dict(spec)
+    method = request_kwargs.pop('method', 'get').lower()
+    endpoint = request_kwargs.pop('endpoint', None)
+    fullstring = request_kwargs.pop('fullstring', None)
+    headers = request_kwargs.pop('headers', None) or {}
+    cookies = request_kwargs.pop('cookies', None)
+    timeout = request_kwargs.pop('timeout', None)
+    session = checkouts.enter_context(pool.session(endpoint, headers, cookies, timeout, request_kwargs.get('verify')))
+    if 'data' in request_kwargs:
+        request_kwargs['data'] = utils.format_data_according_to_header(session, request_kwargs['data'], headers)
+    request_kwargs.update(timeout=None if timeout is None else float(timeout), cookies=cookies)
+    return method, merge_url(endpoint, fullstring), session, request_kwargs
+
+
+def _send_prepared_request(prepared_request):
+    method, url, session, request_kwargs = prepared_request
+    start = perf_counter()
+    try:
+        resp = session.request(method, url, **request_kwargs)
+        # Read the body inside the worker so the duration covers the whole transfer.
+        resp.content
+    except Exception as ex:  # lgtm [py/catch-base-exception]
+        return method, url, None, perf_counter() - start, ex
+    return method, url, resp, perf_counter() - start, None
 
-    return DotDict(new_response)
+
+def _convert_resp_to_dict(response):
+    return LazyResponse(response)
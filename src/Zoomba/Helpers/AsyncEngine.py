@@ -0,0 +1,194 @@
+"""
+This module is for the AsyncEngine class, an asyncio HTTP engine for the Zoomba API Library built on httpx.
+
+httpx is an optional dependency, install it with ``pip install robotframework-zoomba[async]``.
+"""
+
+import asyncio
+import itertools
+import math
+from time import perf_counter
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from RequestsLibrary import utils
+from Zoomba.Helpers.SessionPool import _freeze, merge_url
+
+REQUEST_KEYS = ('method', 'endpoint', 'fullstring', 'headers', 'data', 'files', 'cookies', 'timeout')
+# httpcore scans every pooled connection for every queued request, so large pools are split over several clients.
+CONNECTIONS_PER_CLIENT = 10
+
+
+class AsyncEngine:
+    """Async Engine
+
+    This class is a helper for the Zoomba API Library. It sends requests with httpx AsyncClients running on a single
+    event loop, so a batch of thousands of requests is in flight at the same time without a thread per request.
+    Clients are kept per (headers, cookies, verify) and reuse their connections to each host between calls. The
+    connections are spread over clients of at most CONNECTIONS_PER_CLIENT connections which take requests in turn,
+    the cost of assigning a request to a connection in httpcore grows with the size of the pool. Responses
+    are converted to requests Response objects so keywords return the same response interface as the default engine.
+    Zoomba.APILibrary method Example:
+            engine = AsyncEngine(max_connections=200)
+            response = engine.request({"method": "get", "endpoint": endpoint, "fullstring": fullstring})
+            results = engine.request_all(request_specs, max_concurrency=500)
+    """
+
+    def __init__(self, max_connections=100):
+        """
+        Constructor.
+
+        :Args:
+         - max_connections - Maximum number of open connections for each set of headers, cookies and verify.
+
+        :Raises:
+         - ImportError - httpx is not installed.
+        """
+        try:
+            import httpx
+        except ImportError as ex:
+            raise ImportError("The httpx engine requires httpx, install it with "
+                              "'pip install robotframework-zoomba[async]'.") from ex
+        self._httpx = httpx
+        self.max_connections = int(max_connections)
+        self._loop = None
+        self._clients = {}
+        self._ssl_contexts = {}
+        self._turn = itertools.count()
+
+    def request(self, spec):
+        """
+        Sends a single request and waits for its response.
+
+        :Args:
+         - spec - Dictionary with the keys method, endpoint, fullstring, headers, data, files, cookies and timeout.
+           Any other key is passed on to the request.
+
+        :Returns:
+         - requests.Response
+        """
+        return self._run(self._request(spec))
+
+    def request_all(self, specs, max_concurrency=100):
+        """
+        Sends a list of requests concurrently.
+
+        :Args:
+         - specs - List of request spec dictionaries, see request.
+         - max_concurrency - Maximum number of requests in flight at the same time.
+
+        :Returns:
+         - (list) One (method, url, response, duration, error) tuple per spec, in input order.
+        """
+        return self._run(self._request_all(specs, int(max_concurrency)))
+
+    def close(self):
+        """
+        Closes every client and the event loop.
+        """
+        if self._loop is None:
+            return
+        self._loop.run_until_complete(self._close_clients())
+        self._loop.close()
+        self._loop = None
+
+    async def _close_clients(self):
+        clients = [client for shards in self._clients.values() for client in shards]
+        self._clients.clear()
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+    def _run(self, coroutine):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+
+    async def _request_all(self, specs, max_concurrency):
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send(spec):
+            method = spec.get('method', 'get').lower()
+            url = merge_url(spec.get('endpoint'), spec.get('fullstring'))
+            async with semaphore:
+                start = perf_counter()
+                try:
+                    resp = await self._request(spec)
+                except Exception as ex:  # lgtm [py/catch-base-exception]
+                    return method, url, None, perf_counter() - start, ex
+                return method, url, resp, perf_counter() - start, None
+
+        return await asyncio.gather(*(send(spec) for spec in specs))
+
+    async def _request(self, spec):
+        request_kwargs = {key: value for key, value in spec.items() if key not in REQUEST_KEYS}
+        method = spec.get('method', 'get').upper()
+        headers = spec.get('headers') or {}
+        cookies = spec.get('cookies')
+        verify = request_kwargs.pop('verify', False)
+        client = self._client(headers, cookies, verify)
+        if 'allow_redirects' in request_kwargs:
+            request_kwargs['follow_redirects'] = request_kwargs.pop('allow_redirects')
+        data = spec.get('data')
+        if data is not None:
+            data = utils.format_data_according_to_header(client, data, headers)
+            if isinstance(data, (str, bytes)):
+                request_kwargs['content'] = data
+            else:
+                request_kwargs['data'] = data
+        if spec.get('files') is not None:
+            request_kwargs['files'] = spec['files']
+        timeout = spec.get('timeout')
+        timeout = None if timeout is None else float(timeout)
+        url = merge_url(spec.get('endpoint'), spec.get('fullstring'))
+        resp = await client.request(method, url, timeout=timeout, **request_kwargs)
+        return _to_requests_response(resp)
+
+    def _client(self, headers, cookies, verify):
+        key = (_freeze(headers), _freeze(cookies), _freeze(verify))
+        shards = self._clients.get(key)
+        if shards is None:
+            shards = self._clients[key] = []
+        index = next(self._turn) % math.ceil(self.max_connections / CONNECTIONS_PER_CLIENT)
+        if index < len(shards):
+            return shards[index]
+        connections = min(self.max_connections, CONNECTIONS_PER_CLIENT)
+        limits = self._httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        client = self._httpx.AsyncClient(headers=headers, cookies=cookies, verify=self._ssl_context(verify),
+                                         limits=limits, follow_redirects=True)
+        shards.append(client)
+        return client
+
+    def _ssl_context(self, verify):
+        """Loading the certificate store is slow, so the shards of a client share one SSL context."""
+        key = _freeze(verify)
+        if key not in self._ssl_contexts:
+            self._ssl_contexts[key] = self._httpx.create_ssl_context(verify=verify)
+        return self._ssl_contexts[key]
+
+
+def _to_requests_response(resp):
+    request = requests.PreparedRequest()
+    request.method = resp.request.method
+    request.url = str(resp.request.url)
+    request.headers = _to_header_dict(resp.request.headers)
+    request.body = resp.request.content or None
+    converted = requests.Response()
+    converted.status_code = resp.status_code
+    converted.headers = _to_header_dict(resp.headers)
+    converted._content = resp.content
+    converted.url = str(resp.url)
+    converted.reason = resp.reason_phrase
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.elapsed = resp.elapsed
+    converted.cookies = requests.cookies.cookiejar_from_dict(dict(resp.cookies))
+    converted.request = request
+    return converted
+
+
+def _to_header_dict(headers):
+    """Keep the header names as sent, httpx lower cases them, and join repeated headers like urllib3 does."""
+    converted = CaseInsensitiveDict()
+    for name, value in headers.raw:
+        name, value = name.decode(headers.encoding), value.decode(headers.encoding)
+        converted[name] = f"{converted[name]}, {value}" if name in converted else value
+    return converted
@@ -0,0 +1,431 @@
+"""
+This module is for the CompiledExpectedResponse class, an expected response analysed once so the Zoomba API Library can
+validate it against many responses without walking its structure again.
+"""
+
+import datetime
+import itertools
+from collections import Counter
+from time import perf_counter
+
+from Zoomba.Helpers.DateParser import dates_outside_margin, is_date_string, naive_iso_string, parse_date
+from Zoomba.Helpers.IgnoredKeys import IgnoredKeys
+from Zoomba.Helpers.ValidationProfile import BATCH_DATES_PATH
+from Zoomba.ZoombaError import MismatchBudgetReached, ZoombaError
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+class CompiledExpectedResponse:
+    """Compiled Expected Response
+
+    This class is a helper for the Zoomba API Library. The dictionaries and lists of the expected response are turned
+    into a tree of nodes once: ignored keys and paths are dropped from it, scalar values are set apart to be compared
+    in place, and with sort_lists the expected lists are sorted and lists of scalars counted ahead of time. Validating a
+    response then only walks the nodes. The nodes are compiled the first time they are needed, so a response equal to
+    the expected one is never compiled. The validation options are part of the compiled response.
+    Zoomba.APILibrary method Example:
+            compiled = CompiledExpectedResponse(expected_response_dict, ignored_keys=["updated"], sort_lists=True)
+            library.validate_response_contains_expected_response(json_actual_response, compiled)
+    """
+
+    def __init__(self, expected_response, ignored_keys=None, full_list_validation=False, identity_key="id",
+                 sort_lists=False, batch_dates=False, **kwargs):
+        """
+        Constructor.
+
+        :Args:
+         - expected_response - The expected response, a dictionary or a list of dictionaries.
+         - ignored_keys - List of keys and paths whose values are not validated, see IgnoredKeys.
+         - full_list_validation - Check that the entire list matches the expected response.
+         - identity_key - Key, or list of keys, to match the items of a list response to.
+         - sort_lists - Sort lists before validating them.
+         - batch_dates - Compare the dates of a validation together once it is walked, see Walk.
+         - kwargs - margin_type and margin_amt for date comparisons.
+        """
+        self.expected = expected_response
+        self.ignored_keys = IgnoredKeys(ignored_keys)
+        self.full_list_validation = full_list_validation
+        self.identity_key = identity_key
+        self.sort_lists = sort_lists
+        self.batch_dates = batch_dates
+        self.kwargs = kwargs
+        self._root = None
+        self._items = None
+
+    @property
+    def root(self):
+        """The node of an expected dictionary, compiled the first time it is needed."""
+        if self._root is None:
+            self._root = compile_node(self.expected, self.ignored_keys, self.sort_lists,
+                                      self.ignored_keys.root_states())
+        return self._root
+
+    @property
+    def items(self):
+        """The nodes of the items of an expected list, compiled the first time they are needed."""
+        if self._items is None:
+            states = self.ignored_keys.root_states()
+            self._items = [compile_node(item, self.ignored_keys, self.sort_lists, states) for item in self.expected]
+        return self._items
+
+    def walk(self, library, unmatched_keys_list, profile=None, on_fail=None):
+        """
+        Start a validation with this response's options.
+
+        :Args:
+         - library - The APILibrary instance doing the date comparisons.
+         - unmatched_keys_list - List the mismatches are recorded in.
+         - profile - ValidationProfile timing the validation, defaults to None.
+         - on_fail - Called with the ZoombaError of each failure instead of failing the test, defaults to None.
+        """
+        return Walk(library, unmatched_keys_list, self.full_list_validation, self.kwargs, self.batch_dates, profile,
+                    on_fail)
+
+    def __repr__(self):
+        return f"CompiledExpectedResponse({self.expected!r})"
+
+
+def compile_node(value, ignored_keys=None, sort_lists=False, states=()):
+    """
+    Compile Node. Compiles an expected dictionary or list into the node that validates it, scalar values have no node
+    and None is returned for them.
+
+    :Args:
+     - value - The expected value.
+     - ignored_keys - IgnoredKeys, or list of keys, whose values are not validated.
+     - sort_lists - Sort lists before validating them.
+     - states - The ignored path trie nodes matched by the path of the value.
+    """
+    if not isinstance(ignored_keys, IgnoredKeys):
+        ignored_keys = IgnoredKeys(ignored_keys)
+    if isinstance(value, list):
+        return _ListNode(value, ignored_keys, sort_lists, states)
+    if isinstance(value, dict):
+        return _DictNode(value, ignored_keys, sort_lists, states)
+    return None
+
+
+class Walk:
+    """State of one validation: the library doing the date comparisons, the list mismatches are recorded in and the
+    options of the validation.
+
+    With batch_dates the date values that are not equal are only collected while the response is walked, flush then
+    parses every one of them and checks the margins of all the pairs in one numpy operation. Only the dates outside
+    the margin get their path rendered, and their mismatches are recorded after the other ones of the walk.
+    """
+    __slots__ = ('library', 'unmatched_keys_list', 'full_list_validation', 'kwargs', 'dates', 'profile',
+                 'dates_compared', 'on_fail')
+
+    def __init__(self, library, unmatched_keys_list, full_list_validation=False, kwargs=None, batch_dates=False,
+                 profile=None, on_fail=None):
+        self.library = library
+        self.unmatched_keys_list = unmatched_keys_list
+        self.full_list_validation = full_list_validation
+        self.kwargs = kwargs or {}
+        self.dates = [] if batch_dates else None
+        # The ValidationProfile of the validation, if it is profiled.
+        self.profile = profile
+        self.dates_compared = 0
+        # Takes the failures in place of the test, e.g. in a worker process of a parallel validation.
+        self.on_fail = on_fail
+
+    def fail(self, error):
+        """Fail the test with a ZoombaError, or give it to on_fail."""
+        if self.on_fail is None:
+            error.fail()
+        else:
+            self.on_fail(error)
+
+    def scalar_mismatch(self, expected, actual, path):
+        """Record a scalar value that is not equal to the expected one, dates are compared within the margin."""
+        if (isinstance(expected, str) and not expected.isdigit() and is_date_string(expected)) or isinstance(
+                expected, datetime.datetime):
+            self.dates_compared += 1
+            if self.dates is not None and isinstance(actual, (str, datetime.datetime)):
+                self.dates.append((expected, actual, tuple(path)))
+                return
+            self.compare_dates(expected, actual, path)
+            return
+        self.unmatched_keys_list.append(ZoombaError(key=render_path(path), expected=expected, actual=actual))
+
+    def compare_dates(self, expected, actual, path):
+        try:
+            self.library.date_string_comparator(expected, actual, render_path(path), self.unmatched_keys_list,
+                                                **self.kwargs)
+        except (ValueError, TypeError):
+            self.unmatched_keys_list.append(ZoombaError(key=render_path(path), expected=expected, actual=actual))
+
+    def flush(self):
+        """Compare the collected dates, a mismatch budget reached by them ends the flush. Nothing is compared once the
+        validation stopped at its mismatch budget."""
+        dates = self.dates
+        if not dates:
+            return
+        self.dates = []
+        if getattr(self.unmatched_keys_list, 'stopped', False):
+            return
+        start = perf_counter()
+        try:
+            self._compare_collected_dates(dates)
+        except MismatchBudgetReached:
+            pass
+        finally:
+            if self.profile is not None:
+                self.profile.record(BATCH_DATES_PATH, perf_counter() - start, dates=len(dates))
+
+    def _compare_collected_dates(self, dates):
+        try:
+            margin = datetime.timedelta(**{self.kwargs.get('margin_type', 'minutes'):
+                                           int(self.kwargs.get('margin_amt', 10))})
+        except (ValueError, TypeError):
+            # The date comparator reports the margin the same way for every pair.
+            for expected, actual, path in dates:
+                self.compare_dates(expected, actual, path)
+            return
+        strings = {}
+        expected_dates, actual_dates, positions, fallback = [], [], [], []
+        for position, (expected, actual, _) in enumerate(dates):
+            try:
+                expected_date = strings.get(expected)
+                if expected_date is None:
+                    expected_date = strings[expected] = naive_iso_string(expected)
+                actual_date = strings.get(actual)
+                if actual_date is None:
+                    actual_date = strings[actual] = naive_iso_string(actual)
+            except (ValueError, TypeError):
+                # Values that do not parse get the messages of the date comparator.
+                fallback.append(position)
+                continue
+            expected_dates.append(expected_date)
+            actual_dates.append(actual_date)
+            positions.append(position)
+        try:
+            outside = [positions[index] for index in dates_outside_margin(expected_dates, actual_dates, margin)] \
+                if positions else []
+        except ValueError:
+            outside, fallback = [], range(len(dates))
+        outside_set = set(outside)
+        for position in sorted(itertools.chain(outside, fallback)):
+            expected, actual, path = dates[position]
+            if position not in outside_set:
+                self.compare_dates(expected, actual, path)
+                continue
+            self.unmatched_keys_list.append(ZoombaError(
+                note="Dates Not Close Enough",
+                key=render_path(path),
+                expected=parse_date(expected),
+                actual=parse_date(actual)))
+
+
+class _DictNode:
+    __slots__ = ('expected', 'length', 'ignored_keys', 'sort_lists', 'states', '_children')
+
+    def __init__(self, expected, ignored_keys, sort_lists, states=()):
+        self.expected = expected
+        self.length = len(expected)
+        self.ignored_keys = ignored_keys
+        self.sort_lists = sort_lists
+        self.states = states
+        self._children = None
+
+    @property
+    def children(self):
+        """(key, expected value, node) of every key that is not ignored, the nodes of nested values are compiled when
+        first visited.
+        """
+        if self._children is None:
+            ignored_keys, sort_lists, states = self.ignored_keys, self.sort_lists, self.states
+            keys = ignored_keys.keys
+            if not states:
+                self._children = [(key, value, compile_node(value, ignored_keys, sort_lists))
+                                  for key, value in self.expected.items() if key not in keys]
+                return self._children
+            self._children = []
+            for key, value in self.expected.items():
+                child_states = None if key in keys else ignored_keys.step(states, key)
+                if child_states is not None:
+                    self._children.append((key, value, compile_node(value, ignored_keys, sort_lists, child_states)))
+        return self._children
+
+    def diff(self, actual, path, walk):
+        if self.expected == actual:
+            return
+        try:
+            if self.length != len(actual):
+                walk.fail(ZoombaError(
+                    error="Dicts do not match",
+                    expected=self.expected,
+                    actual=actual
+                ))
+                return
+        except TypeError:
+            walk.fail(ZoombaError(
+                error="Dicts do not match",
+                expected=self.expected,
+                actual="Actual is not a valid dictionary."
+            ))
+            return
+        self.diff_keys(actual, path, walk)
+
+    def diff_keys(self, actual, path, walk, children=None):
+        """Walk the expected keys, or only the given children. ``path`` is the stack of keys and list indexes leading
+        to the dictionary, every mismatch is recorded once with the path rendered at that point.
+        """
+        for key, expected, node in children or self.children:
+            if key not in actual:
+                walk.fail(ZoombaError(
+                    error="Key not found in Actual",
+                    actual=actual,
+                    key=render_path(path, key)
+                ))
+                continue
+            actual_value = actual[key]
+            if node is None and expected == actual_value:
+                continue
+            path.append(key)
+            if node is None:
+                walk.scalar_mismatch(expected, actual_value, path)
+            else:
+                node.diff(actual_value, path, walk)
+            path.pop()
+
+
+class _ListNode:
+    __slots__ = ('expected', 'ignored_keys', 'sort', 'states', 'compared', 'has_strings', 'counts', '_items')
+
+    def __init__(self, expected, ignored_keys, sort_lists, states=()):
+        self.expected = expected
+        self.ignored_keys = ignored_keys
+        self.sort = sort_lists
+        self.states = states
+        self.compared = None
+        self.has_strings = False
+        self.counts = None
+        self._items = None
+
+    @property
+    def items(self):
+        """(index, expected item, node) of every item that is not a string, compiled when the list is first visited."""
+        if self._items is None:
+            expected = self.expected
+            # A sorted copy, the expected response is left as it was.
+            self.compared = sorted(expected, key=sort_key) if self.sort else expected
+            ignored_keys, sort_lists, states = self.ignored_keys, self.sort, self.states
+            if states:
+                item_states = [ignored_keys.step(states, index) for index in range(len(expected))]
+                if None in item_states:
+                    # With ignored items every item is compared on its own.
+                    self._items = [(index, item, compile_node(item, ignored_keys, sort_lists, item_states[index]))
+                                   for index, item in enumerate(self.compared) if item_states[index] is not None]
+                    return self._items
+            else:
+                item_states = itertools.repeat(())
+            # Lists holding strings are compared as a whole.
+            self.has_strings = str in set(map(type, expected))
+            if self.sort and is_scalar_list(expected):
+                self.counts = Counter(expected)
+            self._items = [(index, item, compile_node(item, ignored_keys, sort_lists, item_state))
+                           for (index, item), item_state in zip(enumerate(self.compared), item_states)
+                           if not isinstance(item, str)]
+        return self._items
+
+    def diff(self, actual, path, walk):
+        if self.expected == actual:
+            return
+        if not isinstance(actual, (list, tuple)):
+            walk.fail(ZoombaError(
+                error="Arrays do not match",
+                key=render_path(path) or None,
+                expected=self.expected,
+                actual=actual
+            ))
+            return
+        if walk.full_list_validation and len(self.expected) != len(actual):
+            walk.fail(ZoombaError(
+                error="Arrays not the same length",
+                expected=self.expected,
+                actual=actual
+            ))
+            return
+        items = self.items
+        if self.counts is not None and isinstance(actual, list) and is_scalar_list(actual):
+            error = compare_multisets(actual, self.counts, self.compared)
+            if error is not None:
+                walk.fail(error)
+            return
+        if self.sort and isinstance(actual, list):
+            actual = sorted(actual, key=sort_key)
+        if self.has_strings and self.compared != actual:
+            walk.fail(ZoombaError(
+                error="Arrays do not match",
+                expected=self.compared,
+                actual=actual,
+                tip=None if self.sort else "If this is simply out of order try 'sort_list=True'"
+            ))
+        length = len(actual)
+        for index, expected, node in items:
+            actual_item = actual[index] if index < length else ''
+            if node is None and expected == actual_item:
+                continue
+            path.append(index)
+            if node is None:
+                walk.scalar_mismatch(expected, actual_item, path)
+            else:
+                node.diff(actual_item, path, walk)
+            path.pop()
+
+
+def render_path(path, key=None):
+    """Render a path stack of dictionary keys and list indexes, the reference tokens of a JSON Pointer, the way the
+    error messages show it, e.g. ['a', 0, 'b'] becomes 'a[0].b'.
+    """
+    rendered = ""
+    for token in path if key is None else itertools.chain(path, (key,)):
+        if isinstance(token, int) and not isinstance(token, bool):
+            rendered += f"[{token}]"
+        else:
+            rendered += f".{token}" if rendered else str(token)
+    return rendered
+
+
+def is_scalar_list(items):
+    return _SCALAR_TYPES.issuperset(map(type, items))
+
+
+def compare_multisets(actual_list, expected_counts, expected_list):
+    """Compare a list of scalars to the counted expected values ignoring their order, counting every value once.
+    Returns the error with the values missing from and extra in the actual list, None when the lists match.
+    """
+    actual_counts = Counter(actual_list)
+    # Neither counter holds zero counts, so the plain dict comparison is enough and much faster than Counter's.
+    if dict.__eq__(expected_counts, actual_counts):
+        return None
+    missing = sorted((expected_counts - actual_counts).elements(), key=sort_key)
+    extra = sorted((actual_counts - expected_counts).elements(), key=sort_key)
+    return ZoombaError(
+        error="Arrays do not match",
+        expected=sorted(expected_list, key=sort_key),
+        actual=sorted(actual_list, key=sort_key),
+        missing=missing or None,
+        extra=extra or None
+    )
+
+
+def sort_key(value):
+    """Sort key giving a total order over JSON values, so lists mixing None, numbers, strings and nested containers
+    can be sorted. Values are ordered by type first, dictionaries by their items in key order.
+    """
+    if value is None:
+        return 0,
+    if isinstance(value, bool):
+        return 1, value
+    if isinstance(value, (int, float)):
+        return 2, value
+    if isinstance(value, str):
+        return 3, value
+    if isinstance(value, (list, tuple)):
+        return 4, tuple(sort_key(item) for item in value)
+    if isinstance(value, dict):
+        return 5, tuple(sorted((str(key), sort_key(item)) for key, item in value.items()))
+    return 6, type(value).__name__, str(value)
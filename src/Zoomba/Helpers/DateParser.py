@@ -0,0 +1,151 @@
+"""
+This module holds the date parsing backend used by the Zoomba API Library.
+
+ISO-8601 strings are parsed with the standard library. pandas and dateutil are only imported the first time a value
+needs them, so libraries that never compare dates do not pay for importing them.
+"""
+
+import datetime
+import re
+import warnings
+from functools import lru_cache
+
+_to_datetime = None
+_dateutil_parse = None
+_numpy = None
+
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?')
+# An ISO-8601 string split into its local date and time and its time zone.
+_ISO_LOCAL = re.compile(r'(\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?)(?:Z|[+-]\d{2}:?\d{2})?')
+_LETTERS = re.compile(r'[a-z]+')
+# Without digits dateutil can only read a string as a date through a month or weekday name.
+_DATE_WORDS = frozenset((
+    'jan', 'january', 'feb', 'february', 'mar', 'march', 'apr', 'april', 'may', 'jun', 'june', 'jul', 'july',
+    'aug', 'august', 'sep', 'sept', 'september', 'oct', 'october', 'nov', 'november', 'dec', 'december',
+    'mon', 'monday', 'tue', 'tuesday', 'wed', 'wednesday', 'thu', 'thursday', 'fri', 'friday', 'sat', 'saturday',
+    'sun', 'sunday'))
+DATE_CACHE_SIZE = 65536
+
+
+def parse_date(value):
+    """
+    Parse Date. Converts a date string or datetime into a naive datetime. Timezone information is dropped without
+    converting the time, which matches pandas ``to_datetime(value).tz_localize(None)``.
+
+    :Args:
+     - value - Date string or datetime object.
+
+    :Raises:
+     - ValueError - The value is not a date pandas understands.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, str):
+        parsed = _parse_date_string(value)
+        if parsed is None:
+            raise ValueError(f"Unknown date format: {value}")
+        return parsed
+    return _pandas_parse(value)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def is_date_string(value):
+    """
+    Is Date String. Decides whether a string is read as a date by ``dateutil.parser.parse``. ISO-8601 shaped strings
+    are accepted and strings that cannot be dates are rejected without calling dateutil, every other string is parsed
+    once and the answer is cached.
+
+    :Args:
+     - value - String to be classified.
+    """
+    if _ISO_DATE.fullmatch(value) and _parse_date_string(value) is not None:
+        return True
+    if not any(character.isdigit() for character in value):
+        if not _DATE_WORDS.intersection(_LETTERS.findall(value.lower())):
+            return False
+    try:
+        dateutil_parse(value)
+    except (ValueError, TypeError, OverflowError):
+        return False
+    return True
+
+
+def dateutil_parse(value):
+    """
+    Dateutil Parse. Lazily loaded ``dateutil.parser.parse``.
+
+    :Args:
+     - value - String to be parsed.
+
+    :Raises:
+     - ValueError/TypeError - The value is not a date dateutil understands.
+    """
+    global _dateutil_parse
+    if _dateutil_parse is None:
+        from dateutil.parser import parse
+        _dateutil_parse = parse
+    return _dateutil_parse(value)
+
+
+def naive_iso_string(value):
+    """
+    Naive ISO String. The ISO-8601 string of the naive datetime parse_date reads from a value. The time zone is cut
+    from ISO-8601 strings without parsing them, every other value goes through parse_date.
+
+    :Args:
+     - value - Date string or datetime object.
+
+    :Raises:
+     - ValueError - The value is not a date pandas understands.
+    """
+    if isinstance(value, str):
+        match = _ISO_LOCAL.fullmatch(value)
+        if match:
+            return match.group(1)
+    return parse_date(value).isoformat()
+
+
+def dates_outside_margin(expected_dates, actual_dates, margin):
+    """
+    Dates Outside Margin. Parses two lists of naive ISO-8601 strings with numpy and compares them pair by pair in one
+    array operation, a pair matches when ``expected - margin <= actual <= expected + margin``.
+
+    :Args:
+     - expected_dates - List of strings from naive_iso_string.
+     - actual_dates - List of strings from naive_iso_string, as long as expected_dates.
+     - margin - datetime.timedelta allowed between the dates of a pair.
+
+    :Returns:
+     - (list) Indexes of the pairs further apart than the margin.
+
+    :Raises:
+     - ValueError - A string is not a valid date, such as a 30th of February.
+    """
+    global _numpy
+    if _numpy is None:
+        import numpy
+        _numpy = numpy
+    expected = _numpy.array(expected_dates, dtype='datetime64[us]')
+    actual = _numpy.array(actual_dates, dtype='datetime64[us]')
+    return _numpy.flatnonzero(_numpy.abs(actual - expected) > _numpy.timedelta64(margin)).tolist()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_string(value):
+    try:
+        return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        pass
+    try:
+        return _pandas_parse(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _pandas_parse(value):
+    global _to_datetime
+    if _to_datetime is None:
+        from pandas import to_datetime
+        _to_datetime = to_datetime
+    warnings.filterwarnings("ignore", message=".*Discarding nonzero nanoseconds in conversion.*")
+    return _to_datetime(value).tz_localize(None).to_pydatetime()
@@ -0,0 +1,113 @@
+"""
+This module is for the IgnoredKeys class, the keys and paths left out of a validation by the Zoomba API Library.
+"""
+
+import re
+
+# Wildcards of a path pattern, `*` matches any key and `[*]` any list index.
+ANY_KEY = object()
+ANY_INDEX = object()
+# Marks a trie node whose path is ignored.
+_IGNORED = object()
+
+_PATH_TOKEN = re.compile(r'\[(\d+|\*)\]|\.?([^.\[\]]+)')
+
+
+class IgnoredKeys:
+    """Ignored Keys
+
+    This class is a helper for the Zoomba API Library. A plain key, such as ``updated``, is ignored at every level of
+    the response, as it always was. A path, written the way the error messages show keys, is only ignored where it
+    matches: ``items[0].audit`` ignores one value, ``$.id`` only the top level id and ``items[*].audit.*`` every key of
+    the audit of every item. The paths are compiled into a trie, the compiled expected response follows it while it is
+    compiled and leaves matching values out of the tree, so an ignored subtree is never walked. Paths are relative to
+    the dictionaries being compared, for a list response that is each of its items.
+    Zoomba.Helpers.CompiledExpectedResponse method Example:
+            ignored = IgnoredKeys(["updated", "items[*].audit"])
+            states = ignored.step(ignored.root_states(), "items")
+    """
+
+    def __init__(self, ignored_keys=None):
+        """
+        Constructor.
+
+        :Args:
+         - ignored_keys - Key or list of keys and paths whose values are not validated.
+
+        :Raises:
+         - ValueError - A path is not valid.
+        """
+        if isinstance(ignored_keys, str):
+            ignored_keys = [ignored_keys]
+        ignored_keys = list(ignored_keys or ())
+        # Every entry is also kept as a plain key, so a key that happens to contain a dot is still ignored.
+        self.keys = frozenset(ignored_keys)
+        self.trie = None
+        for pattern in ignored_keys:
+            if isinstance(pattern, str) and (pattern.startswith('$') or any(char in pattern for char in '.[*')):
+                self._add(parse_path(pattern))
+
+    def _add(self, tokens):
+        if self.trie is None:
+            self.trie = {}
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_IGNORED] = True
+
+    def root_states(self):
+        """Trie nodes matched at the top of the compared dictionary, an empty tuple when there are no paths."""
+        return () if self.trie is None else (self.trie,)
+
+    @staticmethod
+    def step(states, token):
+        """
+        Follow a key or list index from the trie nodes matched so far.
+
+        :Args:
+         - states - Tuple of the trie nodes matched by the path leading to the value.
+         - token - Dictionary key or list index of the value.
+
+        :Returns:
+         - (tuple) The trie nodes matched by the value's path, or None when the value is ignored.
+        """
+        wildcard = ANY_INDEX if isinstance(token, int) and not isinstance(token, bool) else ANY_KEY
+        matched = []
+        for state in states:
+            for child in (state.get(token), state.get(wildcard)):
+                if child is None:
+                    continue
+                if _IGNORED in child:
+                    return None
+                matched.append(child)
+        return tuple(matched)
+
+
+def parse_path(pattern):
+    """
+    Parse Path. Splits a path such as ``items[*].audit.*`` into its keys, list indexes and wildcards.
+
+    :Args:
+     - pattern - The path, an optional leading ``$`` stands for the top of the compared dictionary.
+
+    :Raises:
+     - ValueError - The path is empty or not valid.
+    """
+    path = pattern
+    if path.startswith('$'):
+        path = path[2:] if path.startswith('$.') else path[1:]
+    tokens = []
+    position = 0
+    while position < len(path):
+        match = _PATH_TOKEN.match(path, position)
+        if match is None or (match.group(2) is not None and match.group(0).startswith('.') != bool(tokens)):
+            raise ValueError(f"Ignored key path '{pattern}' is not valid.")
+        index, key = match.groups()
+        if index is not None:
+            tokens.append(ANY_INDEX if index == '*' else int(index))
+        else:
+            tokens.append(ANY_KEY if key == '*' else key)
+        position = match.end()
+    if not tokens:
+        raise ValueError(f"Ignored key path '{pattern}' is not valid.")
+    return tokens
@@ -0,0 +1,68 @@
+"""
+This module selects the JSON implementation used by the Zoomba API and SOAP Libraries to decode responses and encode
+converted SOAP responses. orjson and ujson are used when installed and requested, the standard library json module is
+always available.
+"""
+
+import importlib
+import json
+
+BACKENDS = ('json', 'orjson', 'ujson')
+
+
+class JsonBackend:
+    """Json Backend
+
+    This class wraps a JSON module behind the standard library ``loads``/``dumps`` interface. Documents a fast backend
+    rejects, such as ones containing NaN, are decoded again with the standard library so results do not depend on the
+    installed backend. Note that orjson reads integers wider than 64 bits as floats.
+    Zoomba.APILibrary method Example:
+            backend = get_json_backend('auto')
+            actual_response_dict = backend.loads(json_actual_response)
+    """
+
+    def __init__(self, name, module):
+        self.name = name
+        self._module = module
+
+    def __repr__(self):
+        return f"JsonBackend({self.name})"
+
+    def loads(self, data):
+        """Decode a JSON document given as a string or bytes."""
+        if self.name == 'json':
+            return json.loads(data)
+        try:
+            return self._module.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def dumps(self, obj):
+        """Encode a Python object to a JSON string."""
+        if self.name == 'orjson':
+            return self._module.dumps(obj, option=self._module.OPT_NON_STR_KEYS).decode('utf-8')
+        return self._module.dumps(obj)
+
+
+def get_json_backend(name=None):
+    """
+    Get Json Backend. Returns the JsonBackend for a backend name.
+
+    :Args:
+     - name - 'json', 'orjson' or 'ujson', or 'auto' for the fastest installed one. None selects 'json'.
+
+    :Raises:
+     - ValueError - The name is not a known backend.
+     - ImportError - The requested backend is not installed.
+    """
+    name = 'json' if name is None else str(name).lower()
+    if name == 'auto':
+        for candidate in ('orjson', 'ujson'):
+            try:
+                return JsonBackend(candidate, importlib.import_module(candidate))
+            except ImportError:
+                continue
+        name = 'json'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}', expected one of: auto, {', '.join(BACKENDS)}")
+    return JsonBackend(name, importlib.import_module(name))
@@ -0,0 +1,139 @@
+"""
+This module reads the items of a top level JSON array one at a time, so the Zoomba API Library can validate very large
+list responses without holding the whole decoded body in memory.
+"""
+
+import codecs
+import json
+
+CHUNK_SIZE = 65536
+_WHITESPACE = ' \t\n\r'
+
+
+class JsonStreamError(ValueError):
+    """Raised when a streamed body is not a top level JSON array or is not valid JSON."""
+
+
+def stream_json(source, chunk_size=CHUNK_SIZE, loads=json.loads):
+    """
+    Stream Json. Opens a JSON body for streaming. When the top level value is an array an iterator over its items is
+    returned, only the item being decoded is kept in memory when reading from a file-like object. Any other top level
+    value is decoded whole with loads. The array items are always decoded with the standard library json module, the
+    only implementation decoding a value at an offset of a partly read body.
+
+    :Args:
+     - source - JSON text as a string or bytes, or a file-like object with a read method returning either.
+     - chunk_size - Number of characters or bytes read from a file-like object at a time.
+     - loads - Function decoding a JSON string, such as the loads of a JsonBackend.
+
+    :Returns:
+     - (tuple) True and an iterator over the array items, or False and the decoded value.
+
+    :Raises:
+     - JsonStreamError - The body is not valid JSON.
+    """
+    reader = _StreamReader(source, chunk_size)
+    if reader.next_character() == '[':
+        reader.position += 1
+        return True, _iter_array_items(reader)
+    return False, reader.decode_remaining(loads)
+
+
+def iter_json_array(source, chunk_size=CHUNK_SIZE):
+    """
+    Iter Json Array. Yields the items of a top level JSON array one at a time.
+
+    :Args:
+     - source - JSON text as a string or bytes, or a file-like object with a read method returning either.
+     - chunk_size - Number of characters or bytes read from a file-like object at a time.
+
+    :Raises:
+     - JsonStreamError - The body is not a top level JSON array or is not valid JSON.
+    """
+    is_array, items = stream_json(source, chunk_size)
+    if not is_array:
+        raise JsonStreamError("The response is not a JSON array.")
+    return items
+
+
+def _iter_array_items(reader):
+    if reader.next_character() == ']':
+        return
+    while True:
+        yield reader.decode_value()
+        character = reader.next_character()
+        reader.position += 1
+        if character == ']':
+            return
+        if character != ',':
+            raise JsonStreamError(f"Expected ',' or ']' in JSON array, found {character!r}.")
+
+
+class _StreamReader:
+    def __init__(self, source, chunk_size):
+        self.decoder = json.JSONDecoder()
+        self.chunk_size = int(chunk_size)
+        self.position = 0
+        self.exhausted = False
+        self.stream = None
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        if isinstance(source, str):
+            self.buffer = source
+            self.exhausted = True
+        elif isinstance(source, (bytes, bytearray)):
+            self.buffer = bytes(source).decode('utf-8')
+            self.exhausted = True
+        else:
+            self.buffer = ''
+            self.stream = source
+
+    def next_character(self):
+        """Skip whitespace and return the next character, or an empty string at the end of the body."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer) or not self._read_more(self.chunk_size):
+                return self.buffer[self.position:self.position + 1]
+
+    def decode_value(self):
+        self.next_character()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as ex:
+                if not self._read_more(read_size):
+                    raise JsonStreamError(str(ex)) from ex
+                read_size *= 2
+                continue
+            # A number running into the end of the buffer may continue in the next chunk.
+            if end >= len(self.buffer) and not self.exhausted and isinstance(value, (int, float)):
+                self._read_more(read_size)
+                continue
+            self.position = end
+            return value
+
+    def decode_remaining(self, loads=json.loads):
+        while self._read_more(self.chunk_size):
+            pass
+        try:
+            return loads(self.buffer[self.position:])
+        except ValueError as ex:
+            raise JsonStreamError(str(ex)) from ex
+
+    def _read_more(self, read_size):
+        if self.exhausted:
+            return False
+        chunk = self.stream.read(read_size)
+        if not chunk:
+            self.exhausted = True
+            tail = self.text_decoder.decode(b'', final=True)
+            if tail:
+                self.buffer = self.buffer[self.position:] + tail
+                self.position = 0
+            return bool(tail)
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = self.text_decoder.decode(chunk)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
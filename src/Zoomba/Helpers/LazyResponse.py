@@ -0,0 +1,95 @@
+"""
+This module is for the LazyResponse class, the object returned by the Zoomba API Library request keywords.
+"""
+
+from collections.abc import MutableMapping
+
+from robot.utils import is_dict_like
+from robot.utils.dotdict import DotDict
+
+
+class LazyResponse(MutableMapping):
+    """Lazy Response
+
+    This class is a helper for the Zoomba API Library. It exposes the public attributes of a requests Response with
+    the same attribute and item access as a DotDict, but each attribute is only read from the response the first time
+    it is used and then cached. Expensive properties such as ``apparent_encoding``, which runs character detection
+    over the whole body, are no longer evaluated for every request.
+    Zoomba.APILibrary method Example:
+            resp = requests_lib.get_on_session(alias, fullstring)
+            return LazyResponse(resp)
+    """
+
+    def __init__(self, response):
+        """
+        Constructor.
+
+        :Args:
+         - response - The requests Response object to be wrapped.
+        """
+        object.__setattr__(self, '_response', response)
+        object.__setattr__(self, '_values', {})
+        object.__setattr__(self, '_names', None)
+
+    def _keys(self):
+        if self._names is None:
+            object.__setattr__(self, '_names', dict.fromkeys(name for name in dir(self._response) if name[0] != '_'))
+        return self._names
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            if key not in self._keys():
+                raise
+        value = _convert_nested_dicts(getattr(self._response, key))
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._keys()[key] = None
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        del self._keys()[key]
+        self._values.pop(key, None)
+
+    def __iter__(self):
+        return iter(list(self._keys()))
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __contains__(self, key):
+        return key in self._keys()
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __repr__(self):
+        return f"LazyResponse({self._response!r})"
+
+
+def _convert_nested_dicts(value):
+    """Convert dictionaries the same way DotDict does, so e.g. ``headers`` and ``cookies`` keep dot access."""
+    if isinstance(value, DotDict):
+        return value
+    if is_dict_like(value):
+        return DotDict(value)
+    if isinstance(value, list):
+        return [_convert_nested_dicts(item) for item in value]
+    return value
@@ -0,0 +1,103 @@
+"""
+This module validates the items of a full list validation of the Zoomba API Library in worker processes.
+"""
+
+import math
+import multiprocessing
+
+from Zoomba.Helpers.CompiledExpectedResponse import CompiledExpectedResponse, compile_node
+from Zoomba.ZoombaError import MismatchBudgetReached
+
+# Smallest number of items sent to a worker, smaller lists are validated in the calling process.
+MIN_CHUNK_SIZE = 500
+# Chunks per worker, so a worker that gets a slow chunk does not hold up the others.
+CHUNKS_PER_PROCESS = 4
+# Workers are started from a clean process rather than forked from the Robot process, which may be running threads.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_worker = None
+
+
+def validate_in_processes(actual_items, compiled, processes, budget=None):
+    """
+    Validate In Processes. Validates the items of a list response against the items of the expected response in a
+    pool of worker processes. The lists are split into chunks of consecutive items, each chunk is sent to a worker
+    that returns the mismatches and failures of its items, and the chunks are given back in order. The events are the
+    ones a validation in the calling process would produce, in the same order, with the keys of the mismatches
+    starting at the index of their item, e.g. [1200].a.b.
+
+    :Args:
+     - actual_items - The items of the actual response.
+     - compiled - CompiledExpectedResponse of the expected list.
+     - processes - Number of worker processes.
+     - budget - Number of mismatches after which a chunk stops, see ZoombaErrorList.
+
+    :Returns:
+     - (generator) ("record", ZoombaError) and ("fail", ZoombaError) events.
+    """
+    count = min(len(actual_items), len(compiled.expected))
+    chunk_size = max(MIN_CHUNK_SIZE, math.ceil(count / (processes * CHUNKS_PER_PROCESS)))
+    chunks = [(start, actual_items[start:start + chunk_size], compiled.expected[start:start + chunk_size])
+              for start in range(0, count, chunk_size)]
+    options = (list(compiled.ignored_keys.keys), compiled.sort_lists, compiled.batch_dates, compiled.kwargs, budget)
+    date_events = []
+    context = multiprocessing.get_context(START_METHOD)
+    with context.Pool(min(processes, len(chunks)), _init_worker, (options,)) as pool:
+        for item_events, chunk_date_events in pool.imap(_validate_chunk, chunks):
+            yield from item_events
+            date_events.extend(chunk_date_events)
+    # With batch_dates the dates are compared once every item was walked.
+    yield from date_events
+
+
+class _EventList(list):
+    """Mismatches and failures of a worker, kept as events in the order they happen."""
+
+    def __init__(self, budget=None):
+        super().__init__()
+        self.budget = budget
+        self.records = 0
+        self.stopped = False
+
+    def reset(self):
+        self.clear()
+        self.records = 0
+        self.stopped = False
+
+    def append(self, record):
+        super().append(("record", record))
+        self.records += 1
+        if self.budget is not None and self.records >= self.budget:
+            self.stopped = True
+            raise MismatchBudgetReached(self.budget)
+
+    def fail(self, error):
+        super().append(("fail", error))
+
+
+def _init_worker(options):
+    global _worker
+    from Zoomba.APILibrary import APILibrary
+    ignored_keys, sort_lists, batch_dates, kwargs, budget = options
+    compiled = CompiledExpectedResponse([], ignored_keys, True, "id", sort_lists, batch_dates, **kwargs)
+    _worker = (APILibrary(), compiled, budget)
+
+
+def _validate_chunk(chunk):
+    library, compiled, budget = _worker
+    start, actual_items, expected_items = chunk
+    events = _EventList(budget)
+    walk = compiled.walk(library, events, on_fail=events.fail)
+    ignored_keys = compiled.ignored_keys
+    states = ignored_keys.root_states()
+    for index, (actual_item, expected_item) in enumerate(zip(actual_items, expected_items), start):
+        if events.stopped:
+            break
+        node = compile_node(expected_item, ignored_keys, compiled.sort_lists, states)
+        library._validate_item(actual_item, node, walk, flush=False, path=[index])
+    item_events = list(events)
+    if events.stopped:
+        return item_events, []
+    events.reset()
+    walk.flush()
+    return item_events, list(events)
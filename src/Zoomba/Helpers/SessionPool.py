@@ -0,0 +1,141 @@
+"""
+This module is for the SessionPool class, which keeps requests sessions alive between Zoomba API calls so repeated
+requests against the same host reuse their keep-alive connections instead of opening new ones.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import monotonic
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from RequestsLibrary.compat import RetryAdapter
+
+# Retries of a pooled session, the defaults of RequestsLibrary's Create Session.
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.1
+
+
+class SessionPool:
+    """Session Pool
+
+    This class is a helper for the Zoomba API Library. It keeps requests sessions keyed by
+    (endpoint, headers, cookies, verify, timeout), sizes their urllib3 connection pools and closes sessions that
+    have been idle for too long. The sessions are set up like RequestsLibrary's Create Session sets them up, but they
+    belong to the pool and are not registered with RequestsLibrary. A session is checked out while requests are sent
+    on it and is never closed by the pool then, neither when idle nor to stay within max_sessions.
+    Zoomba.APILibrary method Example:
+            pool = SessionPool(pool_maxsize=20, idle_timeout=300)
+            with pool.session(endpoint, headers, cookies, timeout) as session:
+                response = session.get(merge_url(endpoint, fullstring), cookies=cookies, timeout=timeout)
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, idle_timeout=300, max_sessions=50):
+        """
+        Constructor.
+
+        :Args:
+         - pool_connections - Number of host connection pools urllib3 keeps per session.
+         - pool_maxsize - Maximum number of connections kept alive per host.
+         - idle_timeout - Seconds a session may sit unused before it is closed. None or 0 disables eviction.
+         - max_sessions - Maximum number of sessions kept open, the least recently used one is closed first.
+        """
+        self.pool_connections = int(pool_connections)
+        self.pool_maxsize = int(pool_maxsize)
+        self.idle_timeout = float(idle_timeout) if idle_timeout else None
+        self.max_sessions = int(max_sessions)
+        # [session, last used, number of checkouts] by session key.
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @contextmanager
+    def session(self, endpoint, headers=None, cookies=None, timeout=None, verify=None):
+        """
+        Checks out the session to send requests with, creating it when no live session matches. The session is
+        checked in again when the with block ends.
+
+        :Args:
+         - endpoint - Base url of the session.
+         - headers - Dictionary of default headers.
+         - cookies - Cookies the requests on the session are sent with.
+         - timeout - Timeout the requests on the session are sent with.
+         - verify - SSL verification setting the request is made with.
+        """
+        now = monotonic()
+        self._evict_idle(now)
+        key = (endpoint, _freeze(headers), _freeze(cookies), _freeze(verify), _freeze(timeout))
+        entry = self._sessions.get(key)
+        if entry is None:
+            entry = self._sessions[key] = [self._new_session(endpoint, headers), now, 0]
+        else:
+            entry[1] = now
+            self._sessions.move_to_end(key)
+        entry[2] += 1
+        try:
+            self._evict_least_recently_used()
+            yield entry[0]
+        finally:
+            entry[1] = monotonic()
+            entry[2] -= 1
+
+    def close_all(self):
+        """
+        Closes every pooled session and empties the pool.
+        """
+        for session, _, _ in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def _evict_idle(self, now):
+        if not self.idle_timeout:
+            return
+        expired = [key for key, (_, last_used, checkouts) in self._sessions.items()
+                   if not checkouts and now - last_used > self.idle_timeout]
+        for key in expired:
+            self._sessions.pop(key)[0].close()
+
+    def _evict_least_recently_used(self):
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        idle = [key for key, (_, _, checkouts) in self._sessions.items() if not checkouts]
+        for key in idle[:excess]:
+            self._sessions.pop(key)[0].close()
+
+    def _new_session(self, endpoint, headers):
+        session = requests.Session()
+        session.headers.update(headers or {})
+        session.verify = False
+        session.url = endpoint
+        retries = RetryAdapter(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                               allowed_methods=RetryAdapter.get_default_allowed_methods())
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                              max_retries=retries))
+        return session
+
+
+def merge_url(endpoint, uri):
+    """Join the endpoint and fullstring the same way RequestsLibrary joins a session url and request url."""
+    base = endpoint or ''
+    if endpoint and uri and not endpoint.endswith('/'):
+        base = endpoint + '/'
+    if endpoint and uri and uri.startswith('/'):
+        uri = uri[1:]
+    return urljoin(base, uri)
+
+
+def _freeze(value):
+    """Returns a hashable representation of session parameters such as header and cookie dictionaries."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
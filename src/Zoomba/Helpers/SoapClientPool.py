@@ -0,0 +1,115 @@
+"""
+This module is for the SoapClientPool class, which calls a SOAP method concurrently on clones of a suds client for
+the Zoomba SOAP Library.
+"""
+
+import copy
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from suds import WebFault
+from suds.client import ServiceSelector
+from suds.options import Options
+from suds.properties import Unskin
+
+
+class SoapClientPool:
+    """Soap Client Pool
+
+    This class is a helper for the Zoomba SOAP Library. A suds client sends one call at a time, its options and last
+    messages are shared by every call made with it. The pool keeps clones of a client, each call takes a clone that
+    no other call is using and returns it once done. The clones share the parsed WSDL of the client, so the locations
+    set on it, and have their own copy of its options, such as headers, plugins and credentials, as they were when
+    the pool was created.
+    Zoomba.SOAPLibrary method Example:
+            pool = SoapClientPool(suds_library._client(), size=10)
+            results = pool.call_all("action", soap_objects)
+    """
+
+    def __init__(self, client, size=10):
+        """
+        Constructor.
+
+        :Args:
+         - client - The suds client the clones are made from.
+         - size - Number of clones, the most calls in flight at the same time.
+        """
+        self.size = max(1, int(size))
+        self._idle = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(clone_client(client))
+
+    def call_all(self, action, soap_objects):
+        """
+        Calls a SOAP method once for each argument object, at most size calls at a time.
+
+        :Args:
+         - action - Name of the SOAP method.
+         - soap_objects - List of the arguments of each call, a dictionary of keyword arguments or a list of
+           positional ones.
+
+        :Returns:
+         - (list) A (received, duration, error) tuple per call, in the order of soap_objects. received is the
+           response, or the fault the server replied with, and error the exception raised by any other failure.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda soap_object: self.call(action, soap_object), soap_objects))
+
+    def call(self, action, soap_object):
+        """
+        Calls a SOAP method on a clone that is not in use, waiting for one when they all are.
+
+        :Args:
+         - action - Name of the SOAP method.
+         - soap_object - Dictionary of keyword arguments or list of positional arguments of the method.
+
+        :Returns:
+         - (tuple) The response or fault, the time the call took in seconds and the exception of a failed call.
+        """
+        client = self._idle.get()
+        start = perf_counter()
+        try:
+            method = getattr(client.service, action)
+            if isinstance(soap_object, dict):
+                received = method(**soap_object)
+            else:
+                received = method(*soap_object)
+            return received, perf_counter() - start, None
+        except WebFault as e:
+            return e.fault, perf_counter() - start, None
+        except Exception as e:  # lgtm [py/catch-base-exception]
+            return None, perf_counter() - start, e
+        finally:
+            self._idle.put(client)
+
+
+def clone_client(client):
+    """
+    Clone Client. Copy of a suds client sharing its parsed WSDL, what Client.clone does without the deep copy of the
+    options, which does not terminate as the options of the transport are linked to the ones of the client. The
+    options are copied one by one instead, with a copy of the transport that has options of its own and shares the
+    cookies of the client.
+
+    :Args:
+     - client - The suds client.
+
+    :Returns:
+     - (suds.client.Client) The clone.
+    """
+    transport = copy.copy(client.options.transport)
+    transport.options = type(transport.options)()
+    Unskin(transport.options).update(_copied(Unskin(client.options.transport.options).defined))
+    clone = copy.copy(client)
+    clone.options = Options()
+    options = _copied(Unskin(client.options).defined)
+    options['transport'] = transport
+    Unskin(clone.options).update(options)
+    clone.service = ServiceSelector(clone, client.wsdl.services)
+    clone.messages = dict(tx=None, rx=None)
+    return clone
+
+
+def _copied(options):
+    """Copy of option values, with copies of the lists and dictionaries such as plugins, headers and proxy."""
+    return {name: copy.copy(value) if isinstance(value, (list, dict)) else value for name, value in options.items()}
@@ -0,0 +1,142 @@
+"""
+This module sends a SOAP request with suds and reads the reply as it is received, so the Zoomba SOAP Library can go
+through very large responses without building the whole suds object tree.
+"""
+
+import urllib.error
+import urllib.request
+from xml.etree.ElementTree import iterparse
+
+from suds.transport import Request
+
+_XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+
+
+def open_soap_reply(client, action, soap_object):
+    """
+    Open Soap Reply. Builds the request of a SOAP method with the suds client and sends it through the transport of
+    the client, so its credentials, cookies, proxy and timeout apply, leaving the reply unread.
+
+    :Args:
+     - client - The suds client.
+     - action - Name of the SOAP method.
+     - soap_object - Dictionary of the arguments of the method.
+
+    :Returns:
+     - (file-like) The open HTTP reply.
+
+    :Raises:
+     - WebFault - The server replied with a SOAP fault.
+    """
+    nosend = client.options.nosend
+    client.set_options(nosend=True)
+    try:
+        context = getattr(client.service, action)(**soap_object)
+    finally:
+        client.set_options(nosend=nosend)
+    request = Request(context.client.location(), context.envelope)
+    request.headers = context.client.headers()
+    transport = client.options.transport
+    if hasattr(transport, "addcredentials"):
+        transport.addcredentials(request)
+    u2request = urllib.request.Request(request.url, request.message, request.headers)
+    transport.addcookies(u2request)
+    transport.proxy = transport.options.proxy
+    try:
+        reply = transport.u2open(u2request)
+    except urllib.error.HTTPError as error:
+        # suds raises the fault of the reply, as it does for calls it sends itself.
+        context.process_reply(error.read(), error.code, str(error))
+        raise
+    transport.getcookies(reply, u2request)
+    return reply
+
+
+def stream_soap_elements(client, action, element, soap_object):
+    """
+    Stream Soap Elements. Sends a SOAP request right away and returns an iterator over the elements of its reply with
+    the given name, parsed as the reply is received. The reply is closed once the iterator is exhausted or closed.
+
+    :Args:
+     - client - The suds client.
+     - action - Name of the SOAP method.
+     - element - Name of the repeated element, see iter_soap_elements.
+     - soap_object - Dictionary of the arguments of the method.
+
+    :Raises:
+     - WebFault - The server replied with a SOAP fault.
+    """
+    reply = open_soap_reply(client, action, soap_object)
+    return _close_when_done(reply, iter_soap_elements(reply, element))
+
+
+def _close_when_done(reply, elements):
+    with reply:
+        yield from elements
+
+
+def iter_soap_elements(source, element):
+    """
+    Iter Soap Elements. Yields the elements of a SOAP reply with a given name as they are parsed, each one converted
+    to a dictionary the way _build_dict_from_response converts suds objects: a value for each child element, a list
+    for children repeated under the same name, a ``_name`` key for each attribute and strings for text, with 'None'
+    for empty and nil elements. Elements are dropped from the parsed tree once yielded, so memory does not grow with
+    the number of elements. As the schema is not used, a child that could repeat but occurs once is a single value.
+
+    :Args:
+     - source - File-like object the reply is read from.
+     - element - Name of the repeated element, either ``{namespace}name`` or a name matched in any namespace.
+    """
+    parents = []
+    matched = 0
+    for event, node in iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(node)
+            if _matches(node.tag, element):
+                matched += 1
+            continue
+        parents.pop()
+        if not _matches(node.tag, element):
+            continue
+        matched -= 1
+        if matched:
+            # Kept inside the element of the same name it is nested in.
+            continue
+        yield _element_value(node)
+        if parents:
+            parents[-1].remove(node)
+
+
+def _matches(tag, element):
+    if element.startswith("{"):
+        return tag == element
+    return tag == element or tag.endswith("}" + element)
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _element_value(node):
+    """Convert an element and its children to a dictionary, or to its text when it has neither children nor
+    attributes. Text next to attributes is kept under ``value``, as suds does."""
+    text = str(node.text) if node.text and node.get(_XSI_NIL) != "true" else "None"
+    value = {"_" + _local_name(name): attribute for name, attribute in node.attrib.items() if name != _XSI_NIL}
+    children = list(node)
+    if not children:
+        if not value:
+            return text
+        value["value"] = text
+        return value
+    repeated = set()
+    for child in children:
+        name = _local_name(child.tag)
+        child_value = _element_value(child)
+        if name in repeated:
+            value[name].append(child_value)
+        elif name in value:
+            value[name] = [value[name], child_value]
+            repeated.add(name)
+        else:
+            value[name] = child_value
+    return value
@@ -0,0 +1,123 @@
+"""
+This module is for the ValidationProfile class, the time a validation of the Zoomba API Library spends on each path of
+the expected response.
+"""
+
+import json
+from time import perf_counter
+
+from robot.libraries.BuiltIn import BuiltIn
+
+zoomba = BuiltIn()
+
+BATCH_DATES_PATH = "(batch dates)"
+
+
+class ValidationProfile:
+    """Validation Profile
+
+    This class is a helper for the Zoomba API Library. It times a validation for each top level key of the expected
+    response, keys of the items of a list response are added up over the items. For every path it keeps the number
+    of calls, the seconds spent, the number of expected values below it and the number of date pairs compared. The
+    time not spent under any path, such as decoding the response, is reported as other seconds. The summary is
+    written to the Robot log, or appended to a JSON Lines file with one line per validation.
+    Zoomba.APILibrary method Example:
+            profile = ValidationProfile("Validate Response Contains Expected Response")
+            profile.diff_keys(compiled.root, actual_response_dict, walk)
+            profile.finish()
+            profile.write("log")
+    """
+
+    def __init__(self, keyword):
+        """
+        Constructor.
+
+        :Args:
+         - keyword - Name of the keyword being profiled.
+        """
+        self.keyword = keyword
+        self.paths = {}
+        self.seconds = None
+        self._start = perf_counter()
+
+    def record(self, path, seconds, values=0, dates=0):
+        """
+        Add the time of one call under a path.
+
+        :Args:
+         - path - The path, rendered like the keys of error messages.
+         - seconds - Time spent validating the path.
+         - values - Number of expected values below the path.
+         - dates - Number of date pairs compared below the path.
+        """
+        entry = self.paths.get(path)
+        if entry is None:
+            entry = self.paths[path] = {"path": path, "calls": 0, "seconds": 0.0, "values": 0, "dates": 0}
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["values"] += values
+        entry["dates"] += dates
+
+    def diff_keys(self, expected_node, actual, walk):
+        """Validate a dictionary one top level key at a time, recording each of them."""
+        for child in expected_node.children:
+            dates = walk.dates_compared
+            start = perf_counter()
+            try:
+                expected_node.diff_keys(actual, [], walk, (child,))
+            finally:
+                self.record(str(child[0]), perf_counter() - start, count_values(child[1]),
+                            walk.dates_compared - dates)
+
+    def finish(self):
+        """Stop the clock of the whole validation."""
+        self.seconds = perf_counter() - self._start
+
+    def summary(self):
+        """Return the profile as a dictionary, the slowest paths first."""
+        seconds = perf_counter() - self._start if self.seconds is None else self.seconds
+        paths = sorted(self.paths.values(), key=lambda entry: entry["seconds"], reverse=True)
+        return {
+            "keyword": self.keyword,
+            "seconds": seconds,
+            "other_seconds": max(seconds - sum(entry["seconds"] for entry in paths), 0.0),
+            "paths": paths
+        }
+
+    def render(self):
+        """Return the profile as a text table."""
+        summary = self.summary()
+        lines = [f"{summary['keyword']} took {summary['seconds']:.3f}s, "
+                 f"{summary['other_seconds']:.3f}s outside the paths below",
+                 f"{'seconds':>10} {'calls':>8} {'values':>10} {'dates':>8}  path"]
+        for entry in summary["paths"]:
+            lines.append(f"{entry['seconds']:>10.3f} {entry['calls']:>8} {entry['values']:>10} {entry['dates']:>8}  "
+                         f"{entry['path']}")
+        return "\n".join(lines)
+
+    def write(self, target):
+        """
+        Write the profile.
+
+        :Args:
+         - target - ``log`` for the Robot log, otherwise the path of the JSON Lines file the summary is appended to.
+        """
+        if str(target).lower() == "log":
+            zoomba.log(self.render(), "INFO")
+            return
+        with open(target, "a", encoding="utf-8") as profile_file:
+            profile_file.write(json.dumps(self.summary()) + "\n")
+
+
+def count_values(value):
+    """Count a value and every value nested in it."""
+    count = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
@@ -0,0 +1,252 @@
+"""
+This module is for the WsdlCache class, the parsed WSDLs the Zoomba SOAP Library reuses between its sessions.
+"""
+
+import copy
+import hashlib
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+from robot.utils import timestr_to_secs
+from suds.cache import Cache
+from suds.client import Client
+from suds.options import Options
+from suds.properties import Unskin
+from suds.transport import Request
+from suds.transport.https import HttpAuthenticated
+
+# Location keeping the parsed WSDLs in the running process only.
+MEMORY = "memory"
+# Seconds a process waits for another one parsing the same WSDL, a lock older than this is left behind by a crash.
+LOCK_TIMEOUT = 300
+LOCK_POLL_SECONDS = 0.1
+
+
+class WsdlCache:
+    """Wsdl Cache
+
+    This class is a helper for the Zoomba SOAP Library. Creating a suds client downloads and parses the WSDL and every
+    schema it imports, which is most of the time a session takes to open. The cache keeps the parsed WSDL, keyed by
+    its URL, the way it is parsed and a hash of the WSDL document, so a WSDL that changed on the server is parsed
+    again. Entries are parsed again once they are older than the time to live. The location is ``memory`` to keep
+    them in the running process, or a directory where they are also pickled, so other processes, such as the
+    workers of pabot, load them instead of parsing. One process at a time parses a WSDL into a directory, the others
+    wait and load its result. Every client gets its own copy of the services of the WSDL, so a location set on one
+    session does not change the others.
+    Zoomba.SOAPLibrary method Example:
+            cache = WsdlCache()
+            cache.configure("memory", "1 hour")
+            client = cache.client(host + endpoint + "?WSDL", "fixed", plugins=[_ObjectNamespacePlugin()])
+    """
+
+    def __init__(self):
+        """
+        Constructor, the cache starts disabled.
+        """
+        self.location = None
+        self.ttl = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.location is not None
+
+    def configure(self, location=None, ttl=3600):
+        """
+        Enable, move or disable the cache, the WSDLs kept in the running process are dropped.
+
+        :Args:
+         - location - ``memory``, a directory, or None to disable the cache.
+         - ttl - Time to live of an entry, in seconds or as a Robot Framework time string, 0 keeps entries forever.
+        """
+        location = location or None
+        if location is not None and str(location).lower() == MEMORY:
+            location = MEMORY
+        elif location is not None:
+            os.makedirs(location, exist_ok=True)
+        with self._lock:
+            self.location = location
+            self.ttl = timestr_to_secs(ttl)
+            self._entries = {}
+
+    def client(self, url, variant, **kwargs):
+        """
+        Create a suds client, parsing the WSDL only when the cache does not hold it.
+
+        :Args:
+         - url - URL of the WSDL.
+         - variant - Name of the way the WSDL is parsed, clients created with other plugins or options than the
+           ones cached under this name need another variant.
+         - kwargs - Options of the suds client.
+
+        :Returns:
+         - (suds.client.Client) The client.
+        """
+        if not self.enabled:
+            return Client(url, **kwargs)
+        key = self.key(url, variant, **kwargs)
+        with self._lock:
+            fresh = self._fresh(self._entries.get(key))
+        if self.location == MEMORY or fresh:
+            return Client(url, cache=_DefinitionsCache(self, key), cachingpolicy=1, **kwargs)
+        with _build_lock(self._path(key) + ".lock"):
+            return Client(url, cache=_DefinitionsCache(self, key), cachingpolicy=1, **kwargs)
+
+    @staticmethod
+    def key(url, variant, **kwargs):
+        """Key of a WSDL, the hash of its URL, variant and document. The document is downloaded the way the client
+        downloads it, with the transport, credentials, proxy and document store of its options, without parsing it
+        or the schemas it imports."""
+        options = Options()
+        options.transport = HttpAuthenticated()
+        Unskin(options).update({name: value for name, value in kwargs.items()
+                                if name not in ("cache", "cachingpolicy")})
+        try:
+            content = None
+            if options.documentStore is not None:
+                content = options.documentStore.open(url)
+            if content is None:
+                reply = options.transport.open(Request(url))
+                try:
+                    content = reply.read()
+                finally:
+                    reply.close()
+        finally:
+            # Unlinks the transport from these options, so the client can link it to its own.
+            options.transport = HttpAuthenticated()
+        digest = hashlib.sha256()
+        for part in (url.encode(), variant.encode(), content):
+            digest.update(part)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def load(self, key):
+        """Copy of the parsed WSDL of a key for a new client, None when it is not cached or has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if not self._fresh(entry) and self.location != MEMORY:
+            entry = self._read(key)
+        if not self._fresh(entry):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return _session_definitions(entry[1])
+
+    def store(self, key, definitions):
+        """Keep a WSDL parsed for a client, with services of its own so the locations set on that client stay
+        there."""
+        entry = (time.time(), _session_definitions(definitions))
+        with self._lock:
+            self._entries[key] = entry
+        if self.location != MEMORY:
+            path = self._path(key)
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as cache_file:
+                pickle.dump(entry[1], cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, path)
+
+    def discard(self, key):
+        """Drop the WSDL of a key from the running process."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                return os.path.getmtime(path), pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception:  # lgtm [py/catch-base-exception]
+            # A file left by another version of suds, or partly written by a process that died.
+            return None
+
+    def _fresh(self, entry):
+        return entry is not None and (not self.ttl or time.time() - entry[0] < self.ttl)
+
+    def _path(self, key):
+        return os.path.join(self.location, key + ".wsdl.pickle")
+
+
+class _DefinitionsCache(Cache):
+    """The suds cache of one client, reading and writing the entry of its key in the WsdlCache."""
+
+    def __init__(self, wsdl_cache, key):
+        self.wsdl_cache = wsdl_cache
+        self.key = key
+
+    def get(self, id):
+        return self.wsdl_cache.load(self.key)
+
+    def put(self, id, definitions):
+        self.wsdl_cache.store(self.key, definitions)
+        return definitions
+
+    def purge(self, id):
+        self.wsdl_cache.discard(self.key)
+
+    def clear(self):
+        self.purge(None)
+
+
+def _session_definitions(definitions):
+    """Shallow copy of parsed WSDL definitions sharing their schema, with copies of the services, ports and methods
+    whose locations suds and SudsLibrary change, and of the SOAP bindings reading the options of the definitions."""
+    session = copy.copy(definitions)
+    session.services = []
+    bindings = {}
+
+    def session_binding(binding):
+        if binding is not None and id(binding) not in bindings:
+            bindings[id(binding)] = copy.copy(binding)
+            bindings[id(binding)].wsdl = session
+        return binding and bindings[id(binding)]
+
+    for service in definitions.services:
+        service_copy = copy.copy(service)
+        service_copy.ports = []
+        for port in service.ports:
+            port_copy = copy.copy(port)
+            port_copy._Port__service = service_copy
+            port_copy.methods = {}
+            for name, method in port.methods.items():
+                method_copy = copy.copy(method)
+                method_copy.binding = copy.copy(method.binding)
+                method_copy.binding.input = session_binding(method.binding.input)
+                method_copy.binding.output = session_binding(method.binding.output)
+                port_copy.methods[name] = method_copy
+            service_copy.ports.append(port_copy)
+        session.services.append(service_copy)
+    return session
+
+
+@contextmanager
+def _build_lock(path):
+    """Lock file letting one process at a time parse a WSDL into the cache directory, others wait for it and load
+    the result. A lock older than LOCK_TIMEOUT is taken over, waiting longer than that parses without the lock."""
+    deadline = time.time() + LOCK_TIMEOUT
+    locked = False
+    while not locked and time.time() < deadline:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            locked = True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_TIMEOUT:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        if locked:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
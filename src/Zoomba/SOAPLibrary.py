@@ -1,10 +1,27 @@
-import json
+import datetime
+import re
+
 from robot.libraries.BuiltIn import BuiltIn
 from suds.plugin import DocumentPlugin
 from suds.client import Client
 from suds import WebFault
+from suds.sudsobject import Iter as SudsIter, Object as SudsObject
+from Zoomba import ZoombaError
+from Zoomba.Helpers.JsonBackend import get_json_backend
+from Zoomba.Helpers.SoapClientPool import SoapClientPool
+from Zoomba.Helpers.SoapStream import stream_soap_elements
+from Zoomba.Helpers.WsdlCache import WsdlCache
 
 zoomba = BuiltIn()
+# A type attribute whose value has no namespace prefix. As the plugin always did, any attribute name ending in type
+# matches, such as xsi:type, and a value left open at the end of the document is checked up to its last byte.
+_UNQUALIFIED_TYPE = re.compile(rb'type="(?=[^":]*(?:"|[^"]\Z))')
+# Values kept by _build_dict_from_response with preserve_types, suds gives numbers as int or float.
+_NATIVE_TYPES = (bool, int, float, datetime.date, datetime.time)
+# Whether each type met by _build_dict_from_response is a suds object.
+_SUDS_TYPES = {}
+# Parsed WSDLs shared by the sessions of the running process, disabled until a location is given.
+cached_wsdls = WsdlCache()
 
 
 class _ObjectNamespacePlugin(DocumentPlugin):
@@ -29,15 +46,7 @@ class _ObjectNamespacePlugin(DocumentPlugin):
         elif b'tns' not in context.document or b'targetNamespace' not in context.document:
             document_split = context.document.split(b'xmlns', 1)
             context.document = document_split[0]+b'xmlns:tns="'+self.defaultNamespace+b'" targetNamespace="' + self.defaultNamespace + b'" xmlns'+document_split[1]
-            number_of_types = context.document.count(b'type="')
-            start_location = context.document.find(b'type="')
-            for _ in range(number_of_types):
-                end_type = context.document.find(b'"', start_location+len(b'type="'))
-                if b':' not in context.document[start_location:end_type]:
-                    change_type = context.document[start_location:end_type]
-                    change_type = change_type.replace(b'"', b'"tns:')
-                    context.document = context.document[:start_location] + change_type + context.document[end_type:]
-                start_location = context.document.find(b'type="', start_location+1)
+            context.document = _UNQUALIFIED_TYPE.sub(b'type="tns:', context.document)
 
 
 class SOAPLibrary(object):
@@ -47,6 +56,22 @@ class SOAPLibrary(object):
 
     """
 
+    def __init__(self, json_backend=None, wsdl_cache=None, wsdl_cache_ttl=3600):
+        """SOAPLibrary can be imported with optional arguments.
+
+        - ``json_backend``:
+          JSON implementation used by `Convert Soap Response To Json`: ``json``, ``orjson``, ``ujson`` or ``auto``
+          for the fastest one installed. Defaults to the standard library ``json`` module.
+        - ``wsdl_cache``:
+          Where the SOAP sessions keep the WSDLs they parse, see `Set Wsdl Cache`: ``memory`` or a directory.
+          Defaults to no cache, every session parses its WSDL.
+        - ``wsdl_cache_ttl``:
+          Time a parsed WSDL is reused, in seconds or as a Robot Framework time string. Defaults to one hour.
+        """
+        self.json_backend = get_json_backend(json_backend)
+        if wsdl_cache is not None:
+            cached_wsdls.configure(wsdl_cache, wsdl_cache_ttl)
+
     @staticmethod
     def create_soap_session_and_fix_wsdl(host=None, endpoint=None, alias=None, **kwargs):
         """Create Soap Session. This Keyword utilizes the WSDL and directly accesses calls from sudsLibrary.\n
@@ -58,7 +83,10 @@ class SOAPLibrary(object):
                 set_location: http address\n
         """
         pluginInstance = _ObjectNamespacePlugin()
-        plugin_client = Client(host+endpoint + '?WSDL', plugins=[pluginInstance])
+        if cached_wsdls.enabled:
+            plugin_client = cached_wsdls.client(host+endpoint + '?WSDL', "fixed", plugins=[pluginInstance])
+        else:
+            plugin_client = Client(host+endpoint + '?WSDL', plugins=[pluginInstance])
         suds_library = BuiltIn().get_library_instance("SudsLibrary")
         suds_library._add_client(plugin_client, alias)
         if 'set_location' in kwargs:
@@ -74,7 +102,11 @@ class SOAPLibrary(object):
                 set_location: http address\n
         """
         suds_library = BuiltIn().get_library_instance("SudsLibrary")
-        if alias is not None:
+        if cached_wsdls.enabled and not suds_library._imports:
+            # Same client as Create Soap Client with its default options, imports added for the ImportDoctor
+            # change the parsed WSDL so those sessions are not cached.
+            suds_library._add_client(cached_wsdls.client(host+endpoint+'?WSDL', "plain"), alias)
+        elif alias is not None:
             suds_library.create_soap_client(host+endpoint+'?WSDL', alias)
         else:
             suds_library.create_soap_client(host+endpoint+'?WSDL')
@@ -96,6 +128,19 @@ class SOAPLibrary(object):
         else:
             self.create_soap_session(host, endpoint, alias, set_location=set_location)
 
+    @staticmethod
+    def set_wsdl_cache(location=None, ttl=3600):
+        """ Set Wsdl Cache. Reuses the WSDLs parsed by `Create Soap Session` and `Create Soap Session And Fix Wsdl`,
+            instead of downloading and parsing the WSDL and its schemas for every session. A WSDL is only reused
+            while its document is unchanged on the server and it is younger than ttl. Sessions using imports added
+            with Add Doctor Import are not cached.\n
+            location: (string) ``memory`` to keep the WSDLs in the running process, or a directory where they are
+            also saved, so later runs and other processes such as pabot workers load them. None disables the cache.\n
+            ttl: (string) Time a parsed WSDL is reused, in seconds or as a Robot Framework time string, 0 is
+            forever.\n
+        """
+        cached_wsdls.configure(location, ttl)
+
     @staticmethod
     def call_soap_method_with_list_object(action=None, soap_object=None):
         """ Call Soap Method. Calls soap method with list object \n
@@ -120,6 +165,55 @@ class SOAPLibrary(object):
             received = e.fault
         return received
 
+    @staticmethod
+    def call_soap_method_in_parallel(action=None, soap_objects=None, max_workers=10):
+        """ Call Soap Method In Parallel. Calls soap method once for each object of a list, concurrently on a pool of
+            clones of the current client, and returns the responses in the same order as the objects. The clones share
+            the parsed WSDL and the location of the client and start with a copy of its options, such as headers and
+            credentials.\n
+            action: (string) SOAP Action to be called.\n
+            soap_objects: (list) One Soap Object per call, in dict format as for `Call Soap Method With Object`, or in
+            list format ordered wrt schema as for `Call Soap Method With List Object`.\n
+            max_workers: (int) Maximum number of calls in flight at the same time, defaults to 10.\n
+            return: (list) The responses in input order, a SOAP fault is returned in place of its response. Any other
+            error fails the keyword once every call is done, listing the calls that failed.\n
+            Examples:
+            | ${objects}= | Create List | ${first} | ${second} |
+            | ${responses}= | Call Soap Method In Parallel | CreateItem | ${objects} | max_workers=20 |
+        """
+        soap_objects = list(soap_objects or [])
+        if not soap_objects:
+            return []
+        client = BuiltIn().get_library_instance("SudsLibrary")._client()
+        pool = SoapClientPool(client, min(int(max_workers), len(soap_objects)))
+        responses = []
+        failed_calls = []
+        for index, (received, duration, error) in enumerate(pool.call_all(action, soap_objects)):
+            if error is not None:
+                failed_calls.append(f"[{index}] {action}: {error!r}")
+                continue
+            zoomba.log(f"[{index}] {action} returned in {duration:.3f}s")
+            responses.append(received)
+        if failed_calls:
+            ZoombaError(error="Parallel SOAP Call(s) Failed", failed_calls="\n" + "\n".join(failed_calls)).fail()
+        return responses
+
+    @staticmethod
+    def call_soap_method_streaming(action=None, element=None, **soap_object):
+        """ Call Soap Method Streaming. Calls soap method and reads its response as it is received, for responses too
+            large to build as a whole. Returns an iterator over the elements of the response with the given name,
+            each one converted to a dictionary of strings like `Convert Soap Response To Json` converts the response.
+            Pass it to Validate Response Contains Expected Response of the Zoomba API Library with streaming=True to
+            validate the elements while the response is still being received. Since the schema is not used, an
+            element that occurs once is a single value even where the schema allows a list.\n
+            action: (string) SOAP Action to be called.\n
+            element: (string) Name of the repeated element, such as Row, or {namespace}Row for one namespace.\n
+            soap_object: (dict) Soap Object in dict format, dict must contain all required parts of schema object.\n
+            return: (iterator) The elements as dictionaries, a SOAP fault fails the keyword.\n
+        """
+        client = BuiltIn().get_library_instance("SudsLibrary")._client()
+        return stream_soap_elements(client, action, element, soap_object)
+
     @staticmethod
     def create_wsdl_objects(wsdl_type=None, object_dict=None):
         """ Create Wsdl Objects. This Keyword utilizes the WSDL to create a WSDL object based on the information
@@ -134,48 +228,104 @@ class SOAPLibrary(object):
         _build_wsdl_objects(client, request_object, object_dict)
         return request_object
 
-    @staticmethod
-    def convert_soap_response_to_json(soap_response=None):
+    def convert_soap_response_to_json(self, soap_response=None, preserve_types=False):
         """ Convert Soap Response To Dictionary: This keyword builds a dictionary from the sudsLibrary response\n
             json_actual_response: (request response object) The response from an API.\n
+            preserve_types: (bool) Keep numbers, booleans and nulls as JSON values, and dates and times as ISO 8601
+            strings, instead of converting every value to a string.\n
             return: There is no actual returned output, other than error messages when comparisons fail.\n
         """
-        a = _build_dict_from_response(soap_response)
-        return json.dumps(a)
+        a = _build_dict_from_response(soap_response, preserve_types, iso_dates=True)
+        return self.json_backend.dumps(a)
 
 
-def _build_dict_from_response(soap_response=None):
+def _build_dict_from_response(soap_response=None, preserve_types=False, iso_dates=False):
     """
     Build Dict From Response: This keyword builds a dictionary from the sudsLibrary response.\n
+    The response is walked with a stack instead of recursion, so deeply nested responses do not reach the recursion
+    limit.\n
     :param soap_response: sudsLibrary response.\n
+    :param preserve_types: Keep numbers, booleans, None, dates and times as they are instead of converting every value
+    to a string.\n
+    :param iso_dates: With preserve_types, convert dates and times to ISO 8601 strings, for JSON.\n
     :return: python dictionary.\n
     """
     try:
-        response_dictionary = dict(soap_response)
+        response_items = _object_items(soap_response)
     except:  # lgtm [py/catch-base-exception]
         zoomba.log(message='Argument Passed Was Not Iterable', level='INFO')
         return soap_response
+    if not preserve_types:
+        convert = str
+    else:
+        convert = _iso_value if iso_dates else _native_value
+    suds_types = _SUDS_TYPES
     new_response = {}
-
-    for _ in range(len(response_dictionary)):
-        key, value = response_dictionary.popitem()
-        if isinstance(value, list):
-            temp_list = []
-            for item in value:
-                if str(type(item)) == "<type 'instance'>" or 'sudsobject' in str(type(item)):
-                    temp_item = _build_dict_from_response(item)
-                    temp_list.append(temp_item)
-                else:
-                    temp_list.append(str(item))
-            new_response[key] = temp_list
-        elif str(type(value)) == "<type 'instance'>" or 'sudsobject' in str(type(value)):
-            temp_dict = _build_dict_from_response(value)
-            new_response[key] = temp_dict
-        else:
-            new_response[key] = str(value)
+    stack = [(response_items, new_response)]
+    while stack:
+        items, target = stack.pop()
+        # Keys are added last to first, the order the converted responses always had.
+        for key, value in reversed(items):
+            if isinstance(value, list):
+                temp_list = []
+                for item in value:
+                    is_suds = suds_types.get(type(item))
+                    if is_suds or (is_suds is None and _is_suds_object(item)):
+                        temp_list.append(_push_object(item, stack))
+                    else:
+                        temp_list.append(convert(item))
+                target[key] = temp_list
+                continue
+            is_suds = suds_types.get(type(value))
+            if is_suds or (is_suds is None and _is_suds_object(value)):
+                target[key] = _push_object(value, stack)
+            else:
+                target[key] = convert(value)
     return new_response
 
 
+def _object_items(suds_object):
+    """The (key, value) pairs of a suds object, in the order of dict(suds_object). Other objects go through dict."""
+    if isinstance(suds_object, SudsObject):
+        # Iter orders the keys as the schema does, reading the values directly skips its call for each of them.
+        values = vars(suds_object)
+        return [(key, values[key]) for key in SudsIter(suds_object).keylist if key in values]
+    return list(dict(suds_object).items())
+
+
+def _push_object(suds_object, stack):
+    """Add a nested suds object to the stack of _build_dict_from_response, returning the dictionary it is built in."""
+    try:
+        items = _object_items(suds_object)
+    except:  # lgtm [py/catch-base-exception]
+        zoomba.log(message='Argument Passed Was Not Iterable', level='INFO')
+        return suds_object
+    target = {}
+    stack.append((items, target))
+    return target
+
+
+def _is_suds_object(value):
+    """Whether a value is a suds object, decided once for each type and kept in _SUDS_TYPES."""
+    value_type = type(value)
+    is_suds = _SUDS_TYPES.get(value_type)
+    if is_suds is None:
+        is_suds = _SUDS_TYPES[value_type] = issubclass(value_type, SudsObject) or 'sudsobject' in str(value_type)
+    return is_suds
+
+
+def _native_value(value):
+    if value is None or isinstance(value, _NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def _iso_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return _native_value(value)
+
+
 def _build_wsdl_objects(client=None, request_object=None, object_dict=None):
     """ Build Wsdl Objects. This Keyword utilizes the WSDL to build a wsdl object in a recursive manner.\n
         client: (SudsLibrary._client() instance) The current client session.\n
@@ -2,36 +2,139 @@ from robot.libraries.BuiltIn import BuiltIn
 
 zoomba = BuiltIn()
 
+# Longest rendering of an expected/actual value in an error message, longer ones are cut with a note of their length.
+MAX_VALUE_LENGTH = 10000
+# Number of mismatch records a ZoombaErrorList keeps in full by default, the rest are only counted. None keeps them all.
+MAX_RECORDS = None
+
 
 class ZoombaError:
-    def __init__(self, error=None, key=None, expected=None, actual=None, **kwargs):
-        self.error = error
-        self.key = key
-        self.expected = expected
-        self.actual = actual
-        self.important = 'key'
-        self.__dict__.update(kwargs)
+    """Zoomba Error
+
+    A single failure or mismatch record. The common fields are slots and any other keyword argument is kept in
+    ``extras``, in the order given, which stays None for plain mismatches. Values are kept as they are and only
+    rendered when the error is printed, long expected/actual values are truncated to MAX_VALUE_LENGTH characters. A
+    ZoombaError given as a value, such as the full list breakdown, is rendered on the following lines.
+    """
+    __slots__ = ('error', 'key', 'expected', 'actual', 'important', 'extras')
+
+    def __init__(self, error=None, key=None, expected=None, actual=None, important='key', **kwargs):
+        object.__setattr__(self, 'error', error)
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'expected', expected)
+        object.__setattr__(self, 'actual', actual)
+        object.__setattr__(self, 'important', important)
+        object.__setattr__(self, 'extras', kwargs or None)
+
+    def __getattr__(self, name):
+        if name == 'extras' or not self.extras or name not in self.extras:
+            raise AttributeError(name)
+        return self.extras[name]
+
+    def __setattr__(self, name, value):
+        if name in ZoombaError.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            if self.extras is None:
+                object.__setattr__(self, 'extras', {})
+            self.extras[name] = value
+
+    def fields(self):
+        """Return the fields and extras of the error as a dictionary, in rendering order."""
+        fields = {'error': self.error, 'key': self.key, 'expected': self.expected, 'actual': self.actual,
+                  'important': self.important}
+        if self.extras:
+            fields.update(self.extras)
+        return fields
 
     def __repr__(self):
+        expected, actual = self.expected, self.actual
+        if bool(expected) ^ bool(actual):
+            expected, actual = str(expected), str(actual)
         repr_obj = ""
-        if bool(self.expected) ^ bool(self.actual):
-            self.expected = str(self.expected)
-            self.actual = str(self.actual)
-        for attribute, value in self.__dict__.items():
-            if value is None:
-                continue
-            if attribute == "important":
+        for attribute, value in self.fields().items():
+            if attribute == "expected":
+                value = expected
+            elif attribute == "actual":
+                value = actual
+            if value is None or attribute == "important":
                 continue
             repr_obj += "\n" if repr_obj else ""
             repr_obj += "------------------\n" if attribute == self.important else ""
+            rendered = _render_value(value, attribute in ('expected', 'actual') or not isinstance(value, str))
             attribute = attribute.replace('_', ' ')
-            repr_obj += f"{attribute.title() if attribute[0].islower() else attribute}: {value}"
+            repr_obj += f"{attribute.title() if attribute[0].islower() else attribute}: {rendered}"
         return repr_obj
 
     def __eq__(self, other):
+        if isinstance(other, ZoombaError):
+            return self.fields() == other.fields()
         if hasattr(other, "__dict__"):
-            return self.__dict__ == other.__dict__
+            return self.fields() == other.__dict__
         return self.__repr__() == other
 
+    __hash__ = None
+
     def fail(self):
         zoomba.fail(self.__repr__())
+
+
+class MismatchBudgetReached(Exception):
+    """Raised by a ZoombaErrorList when it records the last mismatch its budget allows."""
+
+
+class ZoombaErrorList(list):
+    """Zoomba Error List
+
+    List of mismatch records that keeps the first ``limit`` records and only counts the ones after it in ``dropped``,
+    so validating a response with a very large number of mismatches does not keep every one of them in memory. The
+    limit defaults to MAX_RECORDS. With a ``budget`` the list raises MismatchBudgetReached once that many mismatches
+    were recorded and sets ``stopped``, so a validation can stop walking the response. Every way of adding records
+    applies the limit and budget, except append_summary.
+    """
+
+    def __init__(self, limit=None, budget=None):
+        super().__init__()
+        self.limit = MAX_RECORDS if limit is None else limit
+        self.budget = budget
+        self.dropped = 0
+        self.stopped = False
+        self._summaries = 0
+
+    def append(self, record):
+        self._add(len(self), record)
+
+    def insert(self, index, record):
+        self._add(index, record)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __iadd__(self, records):
+        self.extend(records)
+        return self
+
+    def append_summary(self, record):
+        """Add a record describing the mismatches, such as the full list breakdown, which is always kept and is not a
+        mismatch of its own."""
+        self._summaries += 1
+        super().append(record)
+
+    def _add(self, index, record):
+        if self.limit is None or len(self) - self._summaries < self.limit:
+            super().insert(index, record)
+        else:
+            self.dropped += 1
+        if self.budget is not None and len(self) - self._summaries + self.dropped >= self.budget:
+            self.stopped = True
+            raise MismatchBudgetReached(self.budget)
+
+
+def _render_value(value, truncate):
+    if isinstance(value, ZoombaError):
+        return f"\n{value!r}"
+    rendered = str(value)
+    if truncate and len(rendered) > MAX_VALUE_LENGTH:
+        return f"{rendered[:MAX_VALUE_LENGTH]}... ({len(rendered)} characters, truncated)"
+    return rendered
@@ -1,9 +1,19 @@
+import json
 import os
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 sys.path.insert(0, os.path.abspath( os.path.join(os.path.dirname(__file__), '../../src/')))
-from Zoomba.APILibrary import APILibrary
+from Zoomba.APILibrary import APILibrary, _async_engines, _convert_resp_to_dict, _session_pools, requests_lib
+from Zoomba.Helpers.SessionPool import SessionPool
+from robot.utils.dotdict import DotDict
 from unittest.mock import patch, PropertyMock
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Python 3.11 seems to treat the patch statement here differently
 if sys.version_info[:3] > (3, 11):
@@ -330,3 +340,328 @@ class TestExternal(TestCase):
         create_session.assert_called_with('putapi', 'Endpoint', {'a': 'Text'}, cookies=None, timeout=None)
         put_on_session.assert_called_with('putapi', 'fullstring', None, timeout=None, expected_status='any',
                                           allow_redirects=False)
+
+
+def _close_shared_session_pools():
+    for pool in _session_pools.values():
+        pool.close_all()
+    _session_pools.clear()
+
+
+class TestSessionPool(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def tearDown(self):
+        _close_shared_session_pools()
+
+    def _sessions(self, library):
+        return [entry[0] for entry in library.session_pool._sessions.values()]
+
+    def test_get_reuses_session(self):
+        library = APILibrary(reuse_sessions=True)
+        assert library.call_get_request({"a": "Text"}, self.endpoint, "/first").json()["path"] == "/first"
+        session = self._sessions(library)[0]
+        resp = library.call_get_request({"a": "Text"}, self.endpoint, "other")
+        assert resp.json()["path"] == "/other"
+        assert resp.request.headers["a"] == "Text"
+        assert self._sessions(library) == [session]
+
+    def test_session_shared_between_methods(self):
+        library = APILibrary(reuse_sessions=True)
+        library.call_get_request({"Content-Type": "application/json"}, self.endpoint, "/get")
+        resp = library.call_post_request({"Content-Type": "application/json"}, self.endpoint, "/post",
+                                         data={"key": "value"})
+        assert json.loads(resp.json()["body"]) == {"key": "value"}
+        assert len(library.session_pool) == 1
+
+    def test_different_headers_new_session(self):
+        library = APILibrary(reuse_sessions=True)
+        library.call_get_request({"a": "Text"}, self.endpoint, "/get")
+        library.call_get_request({"a": "Other"}, self.endpoint, "/get")
+        assert len(library.session_pool) == 2
+
+    def test_pool_size_applied(self):
+        library = APILibrary(reuse_sessions=True, pool_maxsize=25)
+        library.call_get_request({"a": "Text"}, self.endpoint, "/get")
+        session = self._sessions(library)[0]
+        assert session.get_adapter('https://')._pool_maxsize == 25
+        assert session.get_adapter('https://').max_retries.total == 3
+
+    @patch('Zoomba.Helpers.SessionPool.monotonic')
+    def test_idle_session_evicted(self, monotonic):
+        library = APILibrary(reuse_sessions=True, session_idle_timeout=10)
+        monotonic.return_value = 0
+        library.call_get_request({"a": "Text"}, self.endpoint, "/get")
+        first_session = self._sessions(library)[0]
+        monotonic.return_value = 11
+        library.call_get_request({"a": "Text"}, self.endpoint, "/get")
+        assert self._sessions(library) != [first_session]
+        assert len(library.session_pool) == 1
+
+    def test_close_pooled_sessions(self):
+        library = APILibrary(reuse_sessions=True)
+        library.call_get_request({"a": "Text"}, self.endpoint, "/get")
+        library.close_pooled_sessions()
+        assert len(library.session_pool) == 0
+
+    def test_pool_shared_between_instances(self):
+        assert APILibrary(reuse_sessions=True).session_pool is APILibrary(reuse_sessions=True).session_pool
+        assert APILibrary(reuse_sessions=True).session_pool is not APILibrary(reuse_sessions=True,
+                                                                            pool_maxsize=20).session_pool
+
+    def test_sessions_not_registered_with_requests_library(self):
+        registered = len(requests_lib._cache)
+        cookies, timeout = requests_lib.cookies, requests_lib.timeout
+        library = APILibrary(reuse_sessions=True)
+        resp = library.call_get_request(None, self.endpoint, "/get", cookies={"c": "1"}, timeout="5")
+        assert resp.request.headers["Cookie"] == "c=1"
+        assert len(requests_lib._cache) == registered
+        assert (requests_lib.cookies, requests_lib.timeout) == (cookies, timeout)
+
+    def test_checked_out_session_not_evicted(self):
+        pool = SessionPool(max_sessions=1)
+        with pool.session("http://host-a") as first:
+            with pool.session("http://host-b") as second:
+                assert len(pool) == 2
+            assert [entry[0] for entry in pool._sessions.values()] == [first, second]
+        with pool.session("http://host-c") as third:
+            assert [entry[0] for entry in pool._sessions.values()] == [third]
+
+    @patch('Zoomba.Helpers.SessionPool.monotonic')
+    def test_checked_out_session_not_evicted_when_idle(self, monotonic):
+        pool = SessionPool(idle_timeout=10)
+        monotonic.return_value = 0
+        with pool.session("http://host-a") as first:
+            monotonic.return_value = 11
+            with pool.session("http://host-b"):
+                assert first in [entry[0] for entry in pool._sessions.values()]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_parallel_batch_sessions_not_evicted(self, log):
+        library = APILibrary(reuse_sessions=True)
+        library.session_pool.max_sessions = 1
+        specs = [{"endpoint": self.endpoint, "fullstring": f"/{index}", "headers": {"a": str(index)}}
+                 for index in range(3)]
+        responses = library.call_requests_in_parallel(specs)
+        assert [response.json()["path"] for response in responses] == ["/0", "/1", "/2"]
+        assert len(library.session_pool) == 3
+        library.call_get_request(None, self.endpoint, "/get")
+        assert len(library.session_pool) == 1
+
+    def test_close_pooled_sessions_without_pool(self):
+        library = APILibrary()
+        library.close_pooled_sessions()
+        assert library.session_pool is None
+
+
+class TestLazyResponse(TestCase):
+    class Response:
+        def __init__(self):
+            self.evaluated = []
+            self.headers = {"Content-Type": "application/json"}
+
+        @property
+        def apparent_encoding(self):
+            self.evaluated.append("apparent_encoding")
+            return "utf-8"
+
+        @property
+        def content(self):
+            self.evaluated.append("content")
+            return b"body"
+
+        def json(self):
+            return {"a": 1}
+
+    def test_attributes_evaluated_on_access(self):
+        response = self.Response()
+        r = _convert_resp_to_dict(response)
+        assert response.evaluated == []
+        assert r.content == b"body"
+        assert response.evaluated == ["content"]
+
+    def test_attributes_cached(self):
+        response = self.Response()
+        r = _convert_resp_to_dict(response)
+        assert r.apparent_encoding == "utf-8"
+        assert r["apparent_encoding"] == "utf-8"
+        assert response.evaluated == ["apparent_encoding"]
+
+    def test_dict_access(self):
+        r = _convert_resp_to_dict(self.Response())
+        assert "content" in r
+        assert "_private" not in r
+        assert set(r.keys()) == {"apparent_encoding", "content", "evaluated", "headers", "json"}
+        assert r.json() == {"a": 1}
+        self.assertRaises(KeyError, r.__getitem__, "missing")
+        self.assertRaises(AttributeError, getattr, r, "missing")
+
+    def test_nested_dicts_converted(self):
+        r = _convert_resp_to_dict(self.Response())
+        assert r.headers["Content-Type"] == "application/json"
+        assert isinstance(r.headers, DotDict)
+
+    def test_set_and_delete(self):
+        r = _convert_resp_to_dict(self.Response())
+        r.extra = "value"
+        assert r["extra"] == "value"
+        del r.extra
+        assert "extra" not in r
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    def _respond(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.dumps({"method": self.command, "path": self.path,
+                           "body": self.rfile.read(length).decode()}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class TestParallelRequests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def tearDown(self):
+        _close_shared_session_pools()
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_responses_in_input_order(self, log):
+        library = APILibrary()
+        specs = [{"endpoint": self.endpoint, "fullstring": f"/item/{index}"} for index in range(20)]
+        responses = library.call_requests_in_parallel(specs, max_workers=5)
+        assert [response.json()["path"] for response in responses] == [f"/item/{index}" for index in range(20)]
+        assert all(response.duration >= 0 for response in responses)
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_methods_data_and_kwargs(self, log):
+        library = APILibrary()
+        specs = [{"method": "POST", "endpoint": self.endpoint, "fullstring": "/post", "data": "payload"},
+                 {"method": "put", "endpoint": self.endpoint, "fullstring": "/put", "params": {"a": "1"}}]
+        post, put = library.call_requests_in_parallel(specs)
+        assert post.json() == {"method": "POST", "path": "/post", "body": "payload"}
+        assert put.json()["method"] == "PUT"
+        assert put.json()["path"] == "/put?a=1"
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_temporary_sessions_not_registered(self, log):
+        registered = len(requests_lib._cache)
+        specs = [{"endpoint": self.endpoint, "fullstring": "/a"}, {"endpoint": self.endpoint, "fullstring": "/b",
+                                                                   "headers": {"a": "b"}}]
+        APILibrary().call_requests_in_parallel(specs)
+        APILibrary(reuse_sessions=True).call_requests_in_parallel(specs)
+        assert len(requests_lib._cache) == registered
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_uses_pooled_sessions(self, log):
+        library = APILibrary(reuse_sessions=True)
+        specs = [{"endpoint": self.endpoint, "fullstring": "/a"}, {"endpoint": self.endpoint, "fullstring": "/b"}]
+        library.call_requests_in_parallel(specs)
+        library.call_requests_in_parallel(specs)
+        assert len(library.session_pool) == 1
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_failed_request_reported(self, log, fail):
+        library = APILibrary()
+        specs = [{"endpoint": self.endpoint, "fullstring": "/ok"},
+                 {"endpoint": "http://127.0.0.1:1", "fullstring": "/refused"}]
+        responses = library.call_requests_in_parallel(specs)
+        assert len(responses) == 1
+        message = fail.call_args[0][0]
+        assert message.startswith("Error: Parallel Request(s) Failed\nFailed Requests: \n[1] GET "
+                                  "http://127.0.0.1:1/refused: ConnectionError(")
+
+
+@skipUnless(httpx, "httpx is not installed")
+class TestHttpxEngine(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.library = APILibrary(http_engine="httpx")
+
+    def tearDown(self):
+        for engine in _async_engines.values():
+            engine.close()
+        _async_engines.clear()
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, APILibrary, http_engine="curl")
+
+    def test_engine_shared_between_instances(self):
+        second = APILibrary(http_engine="httpx")
+        assert second.async_engine is self.library.async_engine
+        assert APILibrary(http_engine="httpx", pool_maxsize=20).async_engine is not self.library.async_engine
+        self.library.call_get_request(None, self.endpoint, "/first")
+        loop = self.library.async_engine._loop
+        assert second.call_get_request(None, self.endpoint, "/second").status_code == 200
+        assert second.async_engine._loop is loop
+
+    def test_get_request(self):
+        resp = self.library.call_get_request({"a": "Text"}, self.endpoint, "/get?b=1")
+        assert resp.status_code == 200
+        assert resp.json() == {"method": "GET", "path": "/get?b=1", "body": ""}
+        assert resp.headers["Content-Type"] == "application/json"
+        assert resp.request.headers["a"] == "Text"
+
+    def test_post_json_request(self):
+        resp = self.library.call_post_request({"Content-Type": "application/json"}, self.endpoint, "/post",
+                                              data={"key": "value"})
+        assert json.loads(resp.json()["body"]) == {"key": "value"}
+
+    def test_put_request(self):
+        resp = self.library.call_put_request(None, self.endpoint, "/put", data="payload")
+        assert resp.json() == {"method": "PUT", "path": "/put", "body": "payload"}
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_parallel_requests(self, log):
+        specs = [{"endpoint": self.endpoint, "fullstring": f"/item/{index}"} for index in range(50)]
+        specs.append({"method": "post", "endpoint": self.endpoint, "fullstring": "/post", "data": "payload"})
+        responses = self.library.call_requests_in_parallel(specs, max_workers=10)
+        assert [response.json()["path"] for response in responses[:-1]] == [f"/item/{index}" for index in range(50)]
+        assert responses[-1].json()["body"] == "payload"
+        assert all(response.duration >= 0 for response in responses)
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_parallel_failed_request_reported(self, log, fail):
+        specs = [{"endpoint": self.endpoint, "fullstring": "/ok"},
+                 {"endpoint": "http://127.0.0.1:1", "fullstring": "/refused"}]
+        responses = self.library.call_requests_in_parallel(specs)
+        assert len(responses) == 1
+        assert fail.call_args[0][0].startswith("Error: Parallel Request(s) Failed\nFailed Requests: \n[1] GET "
+                                               "http://127.0.0.1:1/refused: ConnectError(")
@@ -3,9 +3,11 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
 import datetime
 import unittest
+from unittest.mock import patch
 import warnings
 from Zoomba.APILibrary import APILibrary
 from Zoomba.APILibrary import _date_format
+from Zoomba.Helpers.DateParser import dates_outside_margin, is_date_string, naive_iso_string, parse_date
 from Zoomba import ZoombaError
 
 
@@ -101,3 +103,108 @@ class TestDates(unittest.TestCase):
             warnings.simplefilter("error")
             date = datetime.datetime(2018, 5, 5, 5, 5, 5, 123456)
             assert date == _date_format("2018-05-05T05:05:05.123456789", "key", [], "string")
+
+    def test__date_format_falls_back_to_pandas(self):
+        date = datetime.datetime(2018, 5, 1)
+        assert date == _date_format("2018-05", "key", [], "string")
+
+    def test_parse_date_datetime_drops_timezone(self):
+        date = datetime.datetime(2018, 5, 5, 5, 5, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=-8)))
+        assert parse_date(date) == datetime.datetime(2018, 5, 5, 5, 5, 5)
+
+    def test_parse_date_not_a_date(self):
+        self.assertRaises(ValueError, parse_date, "not a date")
+
+    def test_is_date_string_matches_dateutil(self):
+        is_date_string.cache_clear()
+        for value in ["2018-05-05T05:05:05", "2018-05-05T05:05:05.05Z", "2018-05-05T05:05:05Z-08:00", "May",
+                      "March 5, 2020", "10 AM", "1.5"]:
+            assert is_date_string(value), value
+        for value in ["a", "hello world", "abc123", "2018-13-45", "today"]:
+            assert not is_date_string(value), value
+
+    @patch('Zoomba.Helpers.DateParser.dateutil_parse')
+    def test_is_date_string_skips_dateutil_for_plain_strings(self, dateutil_parse):
+        is_date_string.cache_clear()
+        assert not is_date_string("plain text")
+        assert is_date_string("2018-05-05T05:05:05Z")
+        dateutil_parse.assert_not_called()
+
+    @patch('Zoomba.Helpers.DateParser.dateutil_parse')
+    def test_is_date_string_cached(self, dateutil_parse):
+        is_date_string.cache_clear()
+        is_date_string("abc123")
+        is_date_string("abc123")
+        dateutil_parse.assert_called_once_with("abc123")
+
+    def test_naive_iso_string(self):
+        assert naive_iso_string("2018-08-08T05:05:05Z") == "2018-08-08T05:05:05"
+        assert naive_iso_string("2018-08-08 05:05:05.123+02:00") == "2018-08-08 05:05:05.123"
+        assert naive_iso_string(datetime.datetime(2018, 8, 8, 5, 5, tzinfo=datetime.timezone.utc)) == \
+            "2018-08-08T05:05:00"
+        assert naive_iso_string("August 8 2018") == "2018-08-08T00:00:00"
+        with self.assertRaises(ValueError):
+            naive_iso_string("not a date")
+
+    def test_dates_outside_margin(self):
+        expected = ["2018-08-08T05:05:05", "2018-08-08T05:05:05", "2018-08-08"]
+        actual = ["2018-08-08T05:15:05", "2018-08-08T05:15:06", "2018-08-07T23:49:59"]
+        assert dates_outside_margin(expected, actual, datetime.timedelta(minutes=10)) == [1, 2]
+        with self.assertRaises(ValueError):
+            dates_outside_margin(["2018-02-30"], ["2018-02-28"], datetime.timedelta(minutes=10))
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_batch_dates(self, fail):
+        library = APILibrary()
+        expected = {"a": [{"t": "2018-08-08T05:05:05Z", "u": "2018-08-08T05:05:05", "v": "2018-08-08T05:05:05",
+                           "w": 1}]}
+        actual = '{"a": [{"t": "2018-08-08T05:30:05Z", "u": "2018-08-08T05:06:05", "v": "garbage", "w": 2}]}'
+        library.validate_response_contains_expected_response(actual, expected, batch_dates=True)
+        batched = fail.call_args[0][0]
+        library.validate_response_contains_expected_response(actual, expected)
+        records = fail.call_args[0][0]
+        assert _records(batched) == _records(records)
+        # The dates are compared after the rest of the item.
+        assert batched.index("Key: a[0].w") < batched.index("Key: a[0].t") < batched.index("Key: a[0].v")
+        assert "Key: a[0].u" not in batched
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_batch_dates_margin(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"t": "2018-08-08T06:05:05"}',
+                                                             {"t": "2018-08-08T05:05:05"}, batch_dates=True,
+                                                             margin_type="hours", margin_amt="1")
+        fail.assert_not_called()
+        library.validate_response_contains_expected_response('{"t": "2018-08-08T06:05:05"}',
+                                                             {"t": "2018-08-08T05:05:05"}, batch_dates=True,
+                                                             margin_type="seconds", margin_amt=30)
+        assert "Note: Dates Not Close Enough" in fail.call_args[0][0]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_batch_dates_full_list(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response(
+            '[{"t": "2018-08-08T05:05:05"}, {"t": "2018-08-09T05:05:05"}]',
+            [{"t": "2018-08-08T05:05:05"}, {"t": "2018-08-08T05:05:05"}], full_list_validation=True,
+            batch_dates=True)
+        message = fail.call_args[0][0]
+        assert "Key: t\nExpected: 2018-08-08 05:05:05\nActual: 2018-08-09 05:05:05\nNote: Dates Not Close Enough" \
+            in message
+        assert message.index("Dates Not Close Enough") < message.index("Full List Breakdown")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_batch_dates_list_compared_once(self, fail):
+        library = APILibrary()
+        with patch('Zoomba.Helpers.CompiledExpectedResponse.dates_outside_margin',
+                   wraps=dates_outside_margin) as compare:
+            library.validate_response_contains_expected_response(
+                '[{"id": 1, "t": "2018-08-08T05:06:05"}, {"id": 2, "t": "2018-08-09T05:05:05"}]',
+                [{"id": 2, "t": "2018-08-08T05:05:05"}, {"id": 1, "t": "2018-08-08T05:05:05"}], batch_dates=True)
+        compare.assert_called_once()
+        assert fail.call_count == 1
+        assert "Key: t\nExpected: 2018-08-08 05:05:05\nActual: 2018-08-09 05:05:05" in fail.call_args[0][0]
+
+
+def _records(message):
+    message = message.replace("Note: Please see differing value(s)", "")
+    return sorted(record.strip() for record in message.split("------------------"))
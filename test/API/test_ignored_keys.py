@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
+from Zoomba.Helpers.IgnoredKeys import ANY_INDEX, ANY_KEY, IgnoredKeys, parse_path
+
+
+class TestIgnoredKeys(unittest.TestCase):
+
+    def test_parse_path(self):
+        assert parse_path("items[*].audit.*") == ["items", ANY_INDEX, "audit", ANY_KEY]
+        assert parse_path("a[0][1].b") == ["a", 0, 1, "b"]
+        assert parse_path("$.id") == ["id"]
+        assert parse_path("$[2]") == [2]
+
+    def test_parse_path_invalid(self):
+        for pattern in ("$", "a..b", ".a", "a[x]", "a[0]b", "a[1"):
+            with self.assertRaises(ValueError):
+                parse_path(pattern)
+
+    def test_plain_keys_have_no_trie(self):
+        ignored = IgnoredKeys("updated")
+        assert ignored.keys == frozenset(["updated"])
+        assert ignored.root_states() == ()
+
+    def test_step(self):
+        ignored = IgnoredKeys(["items[*].audit", "items[1].name"])
+        items = ignored.step(ignored.root_states(), "items")
+        assert ignored.step(items, 0) != ()
+        assert ignored.step(ignored.step(items, 0), "audit") is None
+        assert ignored.step(ignored.step(items, 0), "name") == ()
+        assert ignored.step(ignored.step(items, 1), "name") is None
+        assert ignored.step(ignored.root_states(), "other") == ()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import unittest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/'))
+
+# Robot Framework and RequestsLibrary are imported before timing so the budget only covers Zoomba's own imports.
+IMPORT_SCRIPT = """
+import sys
+import time
+sys.path.insert(0, {src!r})
+import robot.libraries.BuiltIn
+import RequestsLibrary
+start = time.perf_counter()
+import Zoomba.APILibrary
+print(time.perf_counter() - start)
+print('pandas' in sys.modules)
+print('dateutil.parser' in sys.modules)
+"""
+
+# Zoomba's own imports take a few hundredths of a second, the default budget leaves room for slow CI machines and
+# ZOOMBA_IMPORT_BUDGET_SECONDS sets a tighter or looser one.
+IMPORT_BUDGET_SECONDS = float(os.environ.get('ZOOMBA_IMPORT_BUDGET_SECONDS', 1.0))
+
+
+class TestImportTime(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT.format(src=SRC)], capture_output=True,
+                                text=True, check=True).stdout.split()
+        cls.import_time = float(output[0])
+        cls.pandas_imported = output[1] == 'True'
+        cls.dateutil_imported = output[2] == 'True'
+
+    def test_api_library_import_within_budget(self):
+        assert self.import_time < IMPORT_BUDGET_SECONDS, f"import took {self.import_time:.3f}s"
+
+    def test_api_library_import_does_not_load_pandas(self):
+        assert not self.pandas_imported
+
+    def test_api_library_import_does_not_load_dateutil(self):
+        assert not self.dateutil_imported
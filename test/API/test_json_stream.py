@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
+from Zoomba.Helpers.JsonBackend import get_json_backend
+from Zoomba.Helpers.JsonStream import iter_json_array, stream_json, JsonStreamError
+
+
+class TestJsonStream(unittest.TestCase):
+    data = [{"id": i, "values": [1.5, "x" * (i % 7), None, True], "number": 12345678901234} for i in range(200)]
+
+    def test_iter_json_array_string(self):
+        assert list(iter_json_array(json.dumps(self.data))) == self.data
+
+    def test_iter_json_array_chunk_boundaries(self):
+        text = json.dumps(self.data)
+        for chunk_size in (1, 3, 64):
+            assert list(iter_json_array(io.StringIO(text), chunk_size)) == self.data
+            assert list(iter_json_array(io.BytesIO(text.encode()), chunk_size)) == self.data
+
+    def test_iter_json_array_multibyte_characters(self):
+        assert list(iter_json_array(io.BytesIO('[1, "é€", 333]'.encode()), 1)) == [1, "é€", 333]
+
+    def test_iter_json_array_empty(self):
+        assert list(iter_json_array(b' [ ] ')) == []
+
+    def test_iter_json_array_is_lazy(self):
+        items = iter_json_array('[{"a": 1}, not json')
+        assert next(items) == {"a": 1}
+        self.assertRaises(JsonStreamError, next, items)
+
+    def test_iter_json_array_not_array(self):
+        self.assertRaises(JsonStreamError, iter_json_array, '{"a": 1}')
+
+    def test_iter_json_array_missing_separator(self):
+        self.assertRaises(JsonStreamError, list, iter_json_array('[1 2]'))
+
+    def test_stream_json_object(self):
+        assert stream_json(io.BytesIO(b' {"a": 1} '), 2) == (False, {"a": 1})
+
+    def test_stream_json_object_decoded_with_loads(self):
+        decoded = []
+
+        def loads(text):
+            decoded.append(text)
+            return {"decoded": text}
+        assert stream_json(io.BytesIO(b' {"a": 1} '), 2, loads) == (False, {"decoded": '{"a": 1} '})
+        assert stream_json('[{"a": 1}]', loads=loads)[0]
+        assert decoded == ['{"a": 1} ']
+
+    def test_stream_json_object_invalid_with_loads(self):
+        self.assertRaises(JsonStreamError, stream_json, '{"a": ', loads=get_json_backend('json').loads)
@@ -1,14 +1,19 @@
+import io
+import json
 import os
+import re
 import sys
+import tempfile
 from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
 import unittest
 from Zoomba.APILibrary import APILibrary
 from unittest.mock import patch
-from Zoomba.APILibrary import _unmatched_list_check
+from Zoomba.Helpers.CompiledExpectedResponse import CompiledExpectedResponse, render_path, sort_key
 from dateutil import parser
 from Zoomba import ZoombaError
+from Zoomba.ZoombaError import ZoombaErrorList
 
 
 class TestInternal(unittest.TestCase):
@@ -151,14 +156,14 @@ class TestInternal(unittest.TestCase):
         unmatched = []
         library.key_by_key_validator({"a": [[1], [2, [3]]]}, {"a": [[1], [2, [7]]]},
                                      unmatched_keys_list=unmatched)
-        assert unmatched == [ZoombaError(key="a[1][0]", expected=7, actual=3)]
+        assert unmatched == [ZoombaError(key="a[1][1][0]", expected=7, actual=3)]
 
     def test_key_by_key_validator_list_dict_embedded_list_fail(self):
         library = APILibrary()
         unmatched = []
         library.key_by_key_validator({"a": [{"b": [{"c": [4, 5]}]}]}, {"a": [{"b": [{"c": [5, 5]}]}]},
                                      unmatched_keys_list=unmatched)
-        assert unmatched == [ZoombaError(key='a[0].b[0].c', expected=5, actual=4)]
+        assert unmatched == [ZoombaError(key='a[0].b[0].c[0]', expected=5, actual=4)]
 
     def test_key_by_key_validator_partial_list(self):
         library = APILibrary()
@@ -167,10 +172,32 @@ class TestInternal(unittest.TestCase):
                                       {"name": "Loc-2", "sys_id": "2"}]}},
             {"result": {"locations": [{"name": "Loc-1", "sys_id": "1"}]}})
 
-    def test__unmatched_list_check_parent_not_list_not_equal(self):
-        unmatched = [ZoombaError(key='c', expected=5, actual=4)]
-        _unmatched_list_check(unmatched, 0, "a", index=None, parent_key="b", is_list=False)
-        assert unmatched == [ZoombaError(key="a.c", expected=5, actual=4)]
+    def test_render_path(self):
+        assert render_path([]) == ""
+        assert render_path(["a", "c"]) == "a.c"
+        assert render_path(["a", 1, 1, 0]) == "a[1][1][0]"
+        assert render_path(["a", 0], "b") == "a[0].b"
+
+    def test_key_by_key_validator_nested_dict_fail(self):
+        library = APILibrary()
+        unmatched = []
+        library.key_by_key_validator({"a": {"b": {"c": 4}, "d": [{"e": 1}]}},
+                                     {"a": {"b": {"c": 5}, "d": [{"e": 2}]}}, unmatched_keys_list=unmatched)
+        assert unmatched == [ZoombaError(key="a.b.c", expected=5, actual=4),
+                             ZoombaError(key="a.d[0].e", expected=2, actual=1)]
+
+    def test_key_by_key_validator_does_not_sort_actual(self):
+        library = APILibrary()
+        actual = {"a": [{"b": 2}, {"b": 1}]}
+        library.key_by_key_validator(actual, {"a": [{"b": 1}, {"b": 2}]}, sort_lists=True)
+        assert actual == {"a": [{"b": 2}, {"b": 1}]}
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_key_by_key_validator_nested_key_not_in_actual_fail(self, fail):
+        library = APILibrary()
+        library.key_by_key_validator({"a": [{"c": 3}]}, {"a": [{"b": 3}]})
+        fail.assert_called_with("Error: Key not found in Actual\n------------------\nKey: a[0].b\nExpected: None\n"
+                                "Actual: {'c': 3}")
 
     @patch('robot.libraries.BuiltIn.BuiltIn.fail')
     def test_key_by_key_validator_simple_none_dict(self, fail):
@@ -200,7 +227,23 @@ class TestInternal(unittest.TestCase):
     def test_key_by_key_validator_list_do_not_match_with_sort(self, fail):
         library = APILibrary()
         library.key_by_key_validator({"a": ["1", "2"]}, {"a": ["1", "3"]}, sort_lists=True)
-        fail.assert_called_with("Error: Arrays do not match\nExpected: ['1', '3']\nActual: ['1', '2']")
+        fail.assert_called_with("Error: Arrays do not match\nExpected: ['1', '3']\nActual: ['1', '2']\nMissing: ['3']\n"
+                                "Extra: ['2']")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_key_by_key_validator_scalar_list_multiset(self, fail):
+        library = APILibrary()
+        library.key_by_key_validator({"a": [3, 1, None, 1, "x"]}, {"a": [1, None, 3, "x", 1]}, sort_lists=True)
+        fail.assert_not_called()
+        library.key_by_key_validator({"a": [3, 1, 1, 2.5]}, {"a": [1, 3, 3, None]}, sort_lists=True)
+        fail.assert_called_with("Error: Arrays do not match\nExpected: [None, 1, 3, 3]\nActual: [1, 1, 2.5, 3]\n"
+                                "Missing: [None, 3]\nExtra: [1, 2.5]")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_key_by_key_validator_scalar_list_multiset_only_missing(self, fail):
+        library = APILibrary()
+        library.key_by_key_validator({"a": ["b"]}, {"a": ["b", "c"]}, sort_lists=True)
+        fail.assert_called_with("Error: Arrays do not match\nExpected: ['b', 'c']\nActual: ['b']\nMissing: ['c']")
 
     def test_key_by_key_validator_list_sort(self):
         library = APILibrary()
@@ -210,6 +253,32 @@ class TestInternal(unittest.TestCase):
         library = APILibrary()
         library.key_by_key_validator({"value":[{"a": ["1", "2"]}]}, {"value":[{"a": ["2", "1"]}]}, sort_lists=True)
 
+    def test_key_by_key_validator_list_sort_mixed_types(self):
+        library = APILibrary()
+        unmatched = []
+        library.key_by_key_validator({"a": [3, None, {"b": 1}, 1.5, True]}, {"a": [True, {"b": 1}, 1.5, None, 3]},
+                                     sort_lists=True, unmatched_keys_list=unmatched)
+        assert unmatched == []
+
+    def test_key_by_key_validator_list_sort_dict_key_order(self):
+        library = APILibrary()
+        unmatched = []
+        library.key_by_key_validator({"a": [{"c": 2, "b": {"d": [2, 1]}}, {"b": None, "c": 1}]},
+                                     {"a": [{"b": None, "c": 1}, {"b": {"d": [1, 2]}, "c": 2}]},
+                                     sort_lists=True, unmatched_keys_list=unmatched)
+        assert unmatched == []
+
+    def test_key_by_key_validator_list_sort_does_not_change_expected(self):
+        library = APILibrary()
+        expected = {"a": [{"b": 2}, {"b": 1}]}
+        library.key_by_key_validator({"a": [{"b": 1}, {"b": 2}]}, expected, sort_lists=True)
+        assert expected == {"a": [{"b": 2}, {"b": 1}]}
+
+    def test_sort_key(self):
+        values = ["b", {"a": 1}, None, [2], 2, False, "a", [1, None]]
+        assert sorted(values, key=sort_key) == [None, False, 2, "a", "b", [1, None], [2], {"a": 1}]
+        assert sort_key({"a": 1, "b": 2}) == sort_key({"b": 2, "a": 1})
+
     def test_key_by_key_validator_simple_dict(self):
         library = APILibrary()
         library.key_by_key_validator({"a": {"b": 1}}, {"a": {"b": 1}})
@@ -349,6 +418,128 @@ class TestInternal(unittest.TestCase):
         fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\n'
                                 'Key: c\nExpected: 3\nActual: 2\nNote: Please see differing value(s)')
 
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_composite_identity_key(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a":1,"b":2,"c":1}, {"a":1,"b":1,"c":2}]',
+                                                             [{"a": 1, "b": 1, "c": 3}], identity_key=["a", "b"])
+        fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\n'
+                                'Key: c\nExpected: 3\nActual: 2\nNote: Please see differing value(s)')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_composite_identity_key_not_found(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a":1,"b":2,"c":1}]', [{"a": 1, "b": 1, "c": 1}],
+                                                             identity_key=["a", "b"])
+        fail.assert_called_with("Error: Item was not within the response:\n{'a': 1, 'b': 1, 'c': 1}")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_duplicate_identity_uses_first(self, fail, log):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a":1,"c":2}, {"a":1,"c":3}]', [{"a": 1, "c": 2}],
+                                                             identity_key="a")
+        fail.assert_not_called()
+        log.assert_called_with('Duplicate "a" values in the response, only the first item of each is validated: [1]',
+                               level='WARN')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_actual_missing_identity_key(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"c":2}, {"a":1,"c":3}]', [{"a": 1, "c": 3}],
+                                                             identity_key="a")
+        fail.assert_not_called()
+        library.validate_response_contains_expected_response('[{"c":2}, {"a":1,"c":3}]', [{"a": 2, "c": 3}],
+                                                             identity_key="a")
+        fail.assert_called_with('KeyError: "a" Key was not in the response')
+
+    def test_validate_response_contains_expected_response_streaming(self):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"id":1}, {"id":2}]', [{"id": 2}], streaming=True)
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_file(self, fail):
+        library = APILibrary()
+        response = io.BytesIO(b'[{"a":2,"c":2}, {"a":1,"c":2}]')
+        library.validate_response_contains_expected_response(response, [{"a": 1, "c": 3}], identity_key="a",
+                                                             streaming=True)
+        fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\n'
+                                'Key: c\nExpected: 3\nActual: 2\nNote: Please see differing value(s)')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_iterator(self, fail):
+        library = APILibrary()
+        response = iter([{"a": "2", "c": "2"}, {"a": "1", "c": "2"}])
+        library.validate_response_contains_expected_response(response, [{"a": "1", "c": "3"}], identity_key="a",
+                                                             streaming=True)
+        fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\n'
+                                'Key: c\nExpected: 3\nActual: 2\nNote: Please see differing value(s)')
+        assert next(response, None) is None
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_not_found(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a":2,"c":2}]', [{"a": 1, "c": 3}],
+                                                             identity_key="a", streaming=True)
+        fail.assert_called_with("Error: Item was not within the response:\n{'a': 1, 'c': 3}")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_missing_identity(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"c":2}]', [{"a": 1, "c": 3}],
+                                                             identity_key="a", streaming=True)
+        fail.assert_called_with('KeyError: "a" Key was not in the response')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_empty_list(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[]', [{"a": 1}], streaming=True)
+        fail.assert_called_with("The Actual Response is Empty.")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_dict(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a":{"b":1},"c":2}', {"a": {"b": 1}, "c": 3},
+                                                             streaming=True)
+        fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\nKey: c\n'
+                                'Expected: 3\nActual: 2\nNote: Please see differing value(s)')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_full_list(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a":{"b":1},"c":2}]', [{"a": {"b": 1}, "c": 3}],
+                                                             full_list_validation=True, streaming=True)
+        fail.assert_called_with("Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\nKey: c\n"
+                                "Expected: 3\nActual: 2\n------------------\nFull List Breakdown: \n"
+                                "Expected: [{'a': {'b': 1}, 'c': 3}]\nActual: Not kept when streaming\n"
+                                "Note: Please see differing value(s)")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_only_keys_listed_streaming(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response_only_keys_listed('[{"a":1}, not json', [{"a": 2}],
+                                                                              ["a"], streaming=True)
+        fail.assert_called_with("Error: The value for the key 'a' doesn't match the response:\nExpected: 2\n"
+                                "Actual: 1")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_correct_number_of_items_streaming(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_correct_number_of_items(io.StringIO('[{"a":1}, {"b":2}]'), 2,
+                                                                   streaming=True)
+        fail.assert_not_called()
+        library.validate_response_contains_correct_number_of_items(iter([{"a": 1}, {"b": 2}]), 2, streaming=True)
+        fail.assert_not_called()
+        library.validate_response_contains_correct_number_of_items('[{"a":1}, {"b":2}]', 1, streaming=True)
+        fail.assert_called_with("Error: API is returning 2 instead of the expected 1 result(s).")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_json_backend(self, fail):
+        library = APILibrary(json_backend="auto")
+        library.validate_response_contains_expected_response(b'{"a":{"b":1},"c":2}', {"a": {"b": 1}, "c": 3})
+        fail.assert_called_with('Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\nKey: c\n'
+                                'Expected: 3\nActual: 2\nNote: Please see differing value(s)')
+
     def test_validate_response_contains_expected_response_simple_date_compare(self):
         library = APILibrary()
         library.validate_response_contains_expected_response('{"a":{"date":"2005-03-23"}}', {"a": {"date": "2005-03-23"}})
@@ -378,3 +569,260 @@ class TestInternal(unittest.TestCase):
         library = APILibrary()
         expected = datetime(2005, 3, 23, 8, 20, 9, 383000)
         library.validate_response_contains_expected_response('{"a":{"date":"2005-03-23 08:20:10-07:00"}}', {"a": {"date":expected}})
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_generate_unmatched_keys_error_message_dropped(self, fail):
+        library = APILibrary()
+        unmatched = ZoombaErrorList(limit=1)
+        for key in ("a", "b", "c"):
+            unmatched.append(ZoombaError(key=key, expected=1, actual=2))
+        library.generate_unmatched_keys_error_message(unmatched)
+        fail.assert_called_with("Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\nKey: a\n"
+                                "Expected: 1\nActual: 2\nNot Shown: 2 more mismatch(es), only the first 1 are listed\n"
+                                "Note: Please see differing value(s)")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_max_listed_mismatches(self, fail):
+        library = APILibrary(max_listed_mismatches="2")
+        library.validate_response_contains_expected_response('{"a": 1, "b": 2, "c": 3, "d": 4}',
+                                                             {"a": 5, "b": 6, "c": 7, "d": 8})
+        message = fail.call_args[0][0]
+        assert "Key: b" in message
+        assert "Key: c" not in message
+        assert "Not Shown: 2 more mismatch(es), only the first 2 are listed" in message
+        assert "Stopped" not in message
+        library.validate_response_contains_expected_response('[{"a": 1}, {"a": 2}, {"a": 3}]',
+                                                             [{"a": 4}, {"a": 5}, {"a": 6}],
+                                                             full_list_validation=True)
+        message = fail.call_args[0][0]
+        assert "Not Shown: 1 more mismatch(es), only the first 2 are listed" in message
+        assert "Full List Breakdown" in message
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_fail_fast(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": 1, "b": 2, "c": 3}', {"a": 2, "b": 3, "c": 4},
+                                                             fail_fast=True)
+        fail.assert_called_with("Error: Key(s) Did Not Match\nUnmatched Keys List: \n------------------\nKey: a\n"
+                                "Expected: 2\nActual: 1\nStopped: Validation stopped after 1 mismatch(es), the rest "
+                                "of the response was not checked\nNote: Please see differing value(s)")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_max_mismatches(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": [1, 2, 3, 4]}', {"a": [5, 6, 7, 8]},
+                                                             max_mismatches="2")
+        message = fail.call_args[0][0]
+        assert "Key: a[1]" in message
+        assert "Key: a[2]" not in message
+        assert "Stopped: Validation stopped after 2 mismatch(es)" in message
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_full_list_fail_fast(self, fail):
+        library = APILibrary()
+        with patch.object(APILibrary, '_validate_item', wraps=APILibrary._validate_item) as validator:
+            library.validate_response_contains_expected_response('[{"a": 1}, {"a": 2}, {"a": 3}]',
+                                                                 [{"a": 4}, {"a": 5}, {"a": 6}],
+                                                                 full_list_validation=True, fail_fast=True)
+        assert validator.call_count == 1
+        message = fail.call_args[0][0]
+        assert "Key: a\nExpected: 4\nActual: 1" in message
+        assert "Full List Breakdown" in message
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_streaming_full_list_fail_fast(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('[{"a": 1}, {"a": 2}]', [{"a": 4}, {"a": 5}],
+                                                             full_list_validation=True, streaming=True,
+                                                             fail_fast=True)
+        message = fail.call_args[0][0]
+        assert "Expected: 4" in message
+        assert "Expected: 5\n" not in message
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_compile_expected_response_reused(self, fail):
+        library = APILibrary()
+        compiled = library.compile_expected_response({"a": 1, "b": [{"c": 2}], "updated": "x"},
+                                                     ignored_keys="updated")
+        library.validate_response_contains_expected_response('{"a": 1, "b": [{"c": 2}], "updated": "y"}', compiled)
+        fail.assert_not_called()
+        library.validate_response_contains_expected_response('{"a": 1, "b": [{"c": 3}], "updated": "y"}', compiled)
+        assert "Key: b[0].c\nExpected: 2\nActual: 3" in fail.call_args[0][0]
+        library.validate_response_contains_expected_response('{"a": 1, "b": [{"c": 2}], "updated": "z"}', compiled)
+        assert fail.call_count == 1
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_compile_expected_response_list_options(self, fail):
+        library = APILibrary()
+        compiled = library.compile_expected_response([{"key": 2, "a": [3, 1]}, {"key": 1, "a": [2]}],
+                                                     identity_key="key", sort_lists=True)
+        library.validate_response_contains_expected_response('[{"key": 1, "a": [2]}, {"key": 2, "a": [1, 3]}]',
+                                                             compiled)
+        fail.assert_not_called()
+        compiled = library.compile_expected_response([{"a": 1}, {"a": 2}], full_list_validation=True)
+        library.validate_response_contains_expected_response('[{"a": 1}, {"a": 3}]', compiled,
+                                                             full_list_validation=False)
+        assert "Key: a\nExpected: 2\nActual: 3" in fail.call_args[0][0]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_compiled_expected_response_options_not_applied_warned(self, log):
+        library = APILibrary()
+        compiled = library.compile_expected_response({"a": 1, "updated": "x"}, ignored_keys=["updated"],
+                                                     margin_type="minutes", margin_amt=5)
+        library.validate_response_contains_expected_response('{"a": 1, "updated": "y"}', compiled,
+                                                             ignored_keys=["updated"], margin_type="minutes",
+                                                             margin_amt=5)
+        log.assert_not_called()
+        library.validate_response_contains_expected_response('{"a": 1, "updated": "y"}', compiled, ignored_keys=["a"],
+                                                             sort_lists=True, margin_amt=10)
+        log.assert_called_once_with("The expected response is compiled, so its own validation options are used and "
+                                    "ignored_keys, sort_lists, margin_amt given here are ignored. Give them to Compile "
+                                    "Expected Response instead.", level='WARN')
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_key_by_key_validator_compiled(self, log):
+        library = APILibrary()
+        compiled = library.compile_expected_response({"a": 1, "b": 2})
+        unmatched = []
+        library.key_by_key_validator({"a": 1, "b": 3}, compiled, unmatched_keys_list=unmatched)
+        library.key_by_key_validator({"a": 2, "b": 2}, compiled, unmatched_keys_list=unmatched)
+        assert [error.key for error in unmatched] == ["b", "a"]
+        log.assert_not_called()
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_list_expected_not_a_list_actual(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": 1}', {"a": []})
+        fail.assert_called_with("Error: Arrays do not match\n------------------\nKey: a\nExpected: []\nActual: 1")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_nested_list_expected_not_a_list_actual(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": [1, 2]}', {"a": [[], 2]})
+        fail.assert_called_with("Error: Arrays do not match\n------------------\nKey: a[0]\nExpected: []\nActual: 1")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_dict_response_against_list_expected(self, fail):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": 1, "b": 2}', [{"a": 1}])
+        fail.assert_called_with('Error: Collections not the same length:\nActual Length: 2\nExpected Length: 1')
+        library.validate_response_contains_expected_response('{"a": 1}', [{"a": 1}])
+        fail.assert_called_with("Error: Arrays do not match\nExpected: [{'a': 1}]\nActual: {'a': 1}")
+
+    def test_compiled_expected_response_not_mutated(self):
+        expected = {"a": [{"b": 2}, {"b": 1}], "c": ["y", "x"]}
+        compiled = CompiledExpectedResponse(expected, sort_lists=True)
+        APILibrary().validate_response_contains_expected_response('{"a": [{"b": 1}, {"b": 2}], "c": ["x", "y"]}',
+                                                                  compiled)
+        assert expected == {"a": [{"b": 2}, {"b": 1}], "c": ["y", "x"]}
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_ignored_path(self, fail):
+        library = APILibrary()
+        expected = {"id": 1, "items": [{"id": 2, "audit": {"by": "a", "at": "x"}}, {"id": 3, "audit": {"by": "b"}}]}
+        library.validate_response_contains_expected_response(
+            '{"id": 1, "items": [{"id": 2, "audit": {"by": "c", "at": "y"}}, {"id": 3, "audit": {"by": "d"}}]}',
+            expected, ignored_keys=["items[*].audit.*"])
+        fail.assert_not_called()
+        library.validate_response_contains_expected_response(
+            '{"id": 5, "items": [{"id": 4, "audit": {"by": "a", "at": "x"}}, {"id": 3, "audit": {"by": "b"}}]}',
+            expected, ignored_keys=["$.id"])
+        message = fail.call_args[0][0]
+        assert "Key: items[0].id\nExpected: 2\nActual: 4" in message
+        assert "Key: id\n" not in message
+
+    def test_validate_response_contains_expected_response_ignored_list_item(self):
+        library = APILibrary()
+        library.validate_response_contains_expected_response('{"a": ["x", "changed", "z"]}', {"a": ["x", "y", "z"]},
+                                                             ignored_keys="a[1]")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_key_by_key_validator_ignored_path_subtree_not_walked(self, fail):
+        library = APILibrary()
+        blob = {"data": ["not compared"] * 10}
+        compiled = CompiledExpectedResponse({"a": 1, "blob": blob}, ignored_keys=["$.blob"])
+        assert [key for key, _, _ in compiled.root.children] == ["a"]
+        library.validate_response_contains_expected_response('{"a": 1, "blob": null}', compiled)
+        fail.assert_not_called()
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.log')
+    def test_validate_response_contains_expected_response_profile_log(self, log):
+        library = APILibrary(validation_profile="log")
+        library.validate_response_contains_expected_response(
+            '[{"id": 1, "a": {"b": [1, 2]}, "t": "2018-08-08T05:06:05"}, {"id": 2, "a": {"b": [3]}, "t": "x"}]',
+            [{"id": 1, "a": {"b": [1, 2]}, "t": "2018-08-08T05:05:05"}, {"id": 2, "a": {"b": [3]}, "t": "x"}])
+        table = log.call_args[0][0]
+        assert table.startswith("Validate Response Contains Expected Response took ")
+        assert "  path\n" in table
+        lines = {line.split()[-1]: line.split()[:-1] for line in table.splitlines()[2:]}
+        assert lines["a"][1:] == ["1", "4", "0"]
+        assert lines["t"][1:] == ["1", "1", "1"]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_validate_response_contains_expected_response_profile_file(self, fail):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, "profile.jsonl")
+            library = APILibrary()
+            library.set_validation_profile(target)
+            library.validate_response_contains_expected_response('{"a": 1, "b": [1, 2]}', {"a": 1, "b": [1, 3]},
+                                                                 batch_dates=True)
+            library.validate_response_contains_expected_response('{"a": 1}', {"a": 1})
+            library.set_validation_profile()
+            library.validate_response_contains_expected_response('{"a": 1}', {"a": 1})
+            with open(target, encoding="utf-8") as profile_file:
+                profiles = [json.loads(line) for line in profile_file]
+        assert len(profiles) == 2
+        assert fail.call_count == 1
+        assert profiles[0]["keyword"] == "Validate Response Contains Expected Response"
+        assert [entry["path"] for entry in profiles[0]["paths"]] in (["a", "b"], ["b", "a"])
+        assert {entry["path"]: entry["values"] for entry in profiles[0]["paths"]} == {"a": 1, "b": 3}
+        assert profiles[1]["paths"] == []
+        assert profiles[0]["other_seconds"] <= profiles[0]["seconds"]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_full_list_validation_processes_same_as_serial(self, fail):
+        expected = [{"id": index, "a": {"b": [index, 1]}, "t": "2020-01-01T00:00:00"} for index in range(1200)]
+        actual = [dict(item, a={"b": [item["id"], 2]}) if item["id"] % 250 == 0 else item for item in expected]
+        actual[7] = {"id": 7, "a": {"b": [7, 1]}}
+        actual[9] = dict(actual[9], t="2020-01-03T00:00:00")
+        body = json.dumps(actual)
+        messages = []
+        for processes in (None, 2):
+            fail.reset_mock()
+            APILibrary().validate_response_contains_expected_response(body, expected, full_list_validation=True,
+                                                                      processes=processes)
+            messages.append([call[0][0] for call in fail.call_args_list])
+        assert messages[0][0] == messages[1][0]
+        assert messages[1][0] == "Error: Collections not the same length:\nActual Length: 2\nExpected Length: 3"
+        assert "Key: [250].a.b[1]\nExpected: 1\nActual: 2" in messages[1][-1]
+        assert "Key: [9].t\nExpected: 2020-01-01 00:00:00" in messages[1][-1]
+        assert re.sub(r"Key: \[\d+\]\.", "Key: ", messages[1][-1]) == messages[0][-1]
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_full_list_validation_processes_max_mismatches(self, fail):
+        expected = [{"id": index, "a": index} for index in range(1000)]
+        actual = json.dumps([{"id": index, "a": -index} for index in range(1000)])
+        APILibrary().validate_response_contains_expected_response(actual, expected, full_list_validation=True,
+                                                                  processes=2, max_mismatches=3)
+        message = fail.call_args[0][0]
+        assert message.count(".a\n") == 3
+        assert "Key: [2].a\nExpected: 2\nActual: -2" in message
+        assert "Stopped: Validation stopped after 3 mismatch(es)" in message
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_full_list_validation_processes_failure_path(self, fail):
+        expected = [{"id": index, "t": index} for index in range(1000)]
+        actual = list(expected)
+        actual[600] = {"id": 600, "u": 600}
+        APILibrary().validate_response_contains_expected_response(json.dumps(actual), expected,
+                                                                  full_list_validation=True, processes=2)
+        fail.assert_called_with("Error: Key not found in Actual\n------------------\nKey: [600].t\nExpected: None\n"
+                                "Actual: {'id': 600, 'u': 600}")
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    def test_full_list_validation_processes_short_list_serial(self, fail):
+        with patch('Zoomba.APILibrary.validate_in_processes') as parallel:
+            APILibrary().validate_response_contains_expected_response('[{"a": 1}, {"a": 2}]', [{"a": 1}, {"a": 3}],
+                                                                      full_list_validation=True, processes=4)
+        parallel.assert_not_called()
+        assert "Key: a\nExpected: 3\nActual: 2" in fail.call_args[0][0]
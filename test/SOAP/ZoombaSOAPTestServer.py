@@ -0,0 +1,145 @@
+"""The test WSDL and a local SOAP server for the SOAP Library tests.
+
+The WSDL has an Echo operation, replying with the text it is sent after an optional delay in seconds, and a Report
+operation, replying with count Row elements. Echo replies with a fault to a text starting with "fault", Report to a
+negative count.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCHEMA_ELEMENTS = """<xs:element name="Echo"><xs:complexType><xs:sequence><xs:element name="text" type="xs:string"/>
+<xs:element name="delay" type="xs:float" minOccurs="0"/></xs:sequence></xs:complexType></xs:element>
+<xs:element name="EchoResponse"><xs:complexType><xs:sequence><xs:element name="text" type="xs:string"/>
+</xs:sequence></xs:complexType></xs:element>
+<xs:element name="Report"><xs:complexType><xs:sequence><xs:element name="count" type="xs:int"/></xs:sequence>
+</xs:complexType></xs:element>
+<xs:element name="ReportResponse"><xs:complexType><xs:sequence><xs:element name="Row" maxOccurs="unbounded">
+<xs:complexType><xs:sequence><xs:element name="id" type="xs:int"/><xs:element name="name" type="xs:string"/>
+</xs:sequence></xs:complexType></xs:element></xs:sequence></xs:complexType></xs:element>"""
+
+SCHEMA = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:zoomba" elementFormDefault="qualified">
+{elements}
+</xs:schema>""".format(elements=SCHEMA_ELEMENTS)
+
+INLINE_TYPES = '<xs:schema targetNamespace="urn:zoomba" elementFormDefault="qualified">' + SCHEMA_ELEMENTS + \
+               '</xs:schema>'
+
+IMPORTED_TYPES = '<xs:schema><xs:import namespace="urn:zoomba" schemaLocation="{schema_location}"/></xs:schema>'
+
+WSDL = """<?xml version="1.0"?>
+<wsdl:definitions xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+ xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="urn:zoomba" targetNamespace="urn:zoomba">
+<wsdl:types>{types}</wsdl:types>
+<wsdl:message name="EchoIn"><wsdl:part name="parameters" element="tns:Echo"/></wsdl:message>
+<wsdl:message name="EchoOut"><wsdl:part name="parameters" element="tns:EchoResponse"/></wsdl:message>
+<wsdl:message name="ReportIn"><wsdl:part name="parameters" element="tns:Report"/></wsdl:message>
+<wsdl:message name="ReportOut"><wsdl:part name="parameters" element="tns:ReportResponse"/></wsdl:message>
+<wsdl:portType name="ZoombaPort">
+<wsdl:operation name="Echo"><wsdl:input message="tns:EchoIn"/><wsdl:output message="tns:EchoOut"/></wsdl:operation>
+<wsdl:operation name="Report"><wsdl:input message="tns:ReportIn"/><wsdl:output message="tns:ReportOut"/>
+</wsdl:operation></wsdl:portType>
+<wsdl:binding name="ZoombaBinding" type="tns:ZoombaPort">
+<soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+<wsdl:operation name="Echo"><soap:operation soapAction="urn:Echo"/><wsdl:input><soap:body use="literal"/></wsdl:input>
+<wsdl:output><soap:body use="literal"/></wsdl:output></wsdl:operation>
+<wsdl:operation name="Report"><soap:operation soapAction="urn:Report"/><wsdl:input><soap:body use="literal"/>
+</wsdl:input><wsdl:output><soap:body use="literal"/></wsdl:output></wsdl:operation></wsdl:binding>
+<wsdl:service name="ZoombaService"><wsdl:port name="ZoombaPort" binding="tns:ZoombaBinding">
+<soap:address location="{location}"/></wsdl:port></wsdl:service>
+</wsdl:definitions>"""
+
+ENVELOPE = '<?xml version="1.0"?><s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" ' \
+           'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><s:Body>{body}</s:Body></s:Envelope>'
+
+FAULT = '<s:Fault><faultcode>s:Server</faultcode><faultstring>{text}</faultstring></s:Fault>'
+
+
+def wsdl(location, schema_location=None):
+    """The test WSDL for a service at location, with its schema inline or imported from schema_location."""
+    if schema_location is None:
+        types = INLINE_TYPES
+    else:
+        types = IMPORTED_TYPES.format(schema_location=schema_location)
+    return WSDL.format(types=types, location=location)
+
+
+def echo_reply(text):
+    return ENVELOPE.format(body=f'<EchoResponse xmlns="urn:zoomba"><text>{text}</text></EchoResponse>')
+
+
+def report_reply(count):
+    rows = "".join(f'<Row><id>{index}</id><name>row {index}</name></Row>' for index in range(count))
+    return ENVELOPE.format(body=f'<ReportResponse xmlns="urn:zoomba">{rows}</ReportResponse>')
+
+
+class SoapTestServer:
+    """Local SOAP server of the test WSDL on a free port, recording the requests it receives and the most Echo
+    requests it handled at the same time."""
+
+    def __init__(self):
+        self.server = _Server(("127.0.0.1", 0), _SoapHandler)
+        self.server.soap = self
+        self.url = f"http://127.0.0.1:{self.server.server_port}/zoomba"
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 64
+
+
+class _SoapHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self._reply(200, wsdl(self.server.soap.url))
+
+    def do_POST(self):
+        soap = self.server.soap
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        with soap.lock:
+            soap.requests.append((self.headers["SOAPAction"], body, self.headers))
+        if self.headers["SOAPAction"] == '"urn:Report"':
+            count = int(body.split("count>")[1].split("<")[0])
+            if count < 0:
+                self._reply(500, ENVELOPE.format(body=FAULT.format(text="Report failed")))
+            else:
+                self._reply(200, report_reply(count))
+            return
+        text = body.split("text>")[1].split("<")[0]
+        delay = float(body.split("delay>")[1].split("<")[0]) if "delay>" in body else 0
+        with soap.lock:
+            soap.in_flight += 1
+            soap.most_in_flight = max(soap.most_in_flight, soap.in_flight)
+        time.sleep(delay)
+        with soap.lock:
+            soap.in_flight -= 1
+        if text.startswith("fault"):
+            self._reply(500, ENVELOPE.format(body=FAULT.format(text=text)))
+        else:
+            self._reply(200, echo_reply(text))
+
+    def _reply(self, status, text):
+        content = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
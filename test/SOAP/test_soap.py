@@ -9,6 +9,8 @@ from unittest.mock import patch
 from unittest.mock import Mock
 from unittest.mock import PropertyMock
 from suds import WebFault
+from suds.sudsobject import Factory
+import datetime
 
 
 class TestObjectNamespace(unittest.TestCase):
@@ -48,6 +50,26 @@ class TestObjectNamespace(unittest.TestCase):
         assert item.document == b'<stuff xmlns:tns="string" targetNamespace="string" ' \
                                 b'xmlns="other"><something type="tns:one">'
 
+    def test_no_tns_or_namespace_replace_only_unqualified_types(self):
+        mock_plugin = Mock()
+        item = self.Simple()
+        item.document = b'<stuff xmlns="other"><a type="one"/><b type="xs:two"/><c xsi:type="three"/>' \
+                        b'<d type=""/><e name="type"/><f type="four"/>'
+        type(mock_plugin).defaultNamespace = b"string"
+        _ObjectNamespacePlugin.loaded(mock_plugin, item)
+        assert item.document == b'<stuff xmlns:tns="string" targetNamespace="string" xmlns="other">' \
+                                b'<a type="tns:one"/><b type="xs:two"/><c xsi:type="tns:three"/>' \
+                                b'<d type="tns:"/><e name="type"/><f type="tns:four"/>'
+
+    def test_no_tns_or_namespace_large_document(self):
+        mock_plugin = Mock()
+        item = self.Simple()
+        item.document = b'<stuff xmlns="other">' + b'<a type="one"/><b type="xs:two"/>' * 50000
+        type(mock_plugin).defaultNamespace = b"string"
+        _ObjectNamespacePlugin.loaded(mock_plugin, item)
+        assert item.document.count(b'type="tns:one"') == 50000
+        assert item.document.count(b'type="xs:two"') == 50000
+
 
 class TestSoapLibrary(unittest.TestCase):
 
@@ -58,6 +80,22 @@ class TestSoapLibrary(unittest.TestCase):
         response = sl.convert_soap_response_to_json({"a": "1"})
         assert response == '{"a": "1"}'
 
+    def test_convert_soap_preserve_types(self):
+        response = Factory.object("Response", {"id": 1, "ok": True, "none": None,
+                                               "day": datetime.date(2020, 1, 2)})
+        sl = SOAPLibrary()
+        assert sl.convert_soap_response_to_json(response, preserve_types=True) == \
+            '{"day": "2020-01-02", "none": null, "ok": true, "id": 1}'
+        assert sl.convert_soap_response_to_json(response) == \
+            '{"day": "2020-01-02", "none": "None", "ok": "True", "id": "1"}'
+
+    @patch('Zoomba.SOAPLibrary._build_dict_from_response')
+    def test_convert_soap_json_backend(self, build_dict):
+        build_dict.return_value = {"a": "1"}
+        sl = SOAPLibrary(json_backend="auto")
+        response = sl.convert_soap_response_to_json({"a": "1"})
+        assert sl.json_backend.loads(response) == {"a": "1"}
+
     @patch('Zoomba.SOAPLibrary.Client')
     @patch('Zoomba.SOAPLibrary.BuiltIn')
     @patch('Zoomba.SOAPLibrary._ObjectNamespacePlugin')
@@ -79,6 +117,51 @@ class TestSoapLibrary(unittest.TestCase):
         builtIn.return_value.get_library_instance.return_value.set_location.assert_called_with("place")
         builtIn.return_value.get_library_instance.return_value._add_client.assert_called_with("accepted", "alias")
 
+    @patch('Zoomba.SOAPLibrary.cached_wsdls')
+    @patch('Zoomba.SOAPLibrary.Client')
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    @patch('Zoomba.SOAPLibrary._ObjectNamespacePlugin')
+    def test_create_soap_session_and_fix_wsdl_cached(self, obj_nsp, builtIn, client, cache):
+        obj_nsp.return_value = "string"
+        cache.client.return_value = "cached"
+        SOAPLibrary.create_soap_session_and_fix_wsdl("host", "endpoint", "alias")
+        client.assert_not_called()
+        cache.client.assert_called_with('hostendpoint?WSDL', "fixed", plugins=['string'])
+        builtIn.return_value.get_library_instance.return_value._add_client.assert_called_with("cached", "alias")
+
+    @patch('Zoomba.SOAPLibrary.cached_wsdls')
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    def test_create_soap_session_cached(self, built, cache):
+        suds_library = built.return_value.get_library_instance.return_value
+        suds_library._imports = []
+        cache.client.return_value = "cached"
+        SOAPLibrary.create_soap_session("host", "endpoint", "alias", set_location="here")
+        cache.client.assert_called_with("hostendpoint?WSDL", "plain")
+        suds_library._add_client.assert_called_with("cached", "alias")
+        suds_library.create_soap_client.assert_not_called()
+        suds_library.set_location.assert_called_with("here")
+
+    @patch('Zoomba.SOAPLibrary.cached_wsdls')
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    def test_create_soap_session_cached_with_imports(self, built, cache):
+        suds_library = built.return_value.get_library_instance.return_value
+        suds_library._imports = ["import"]
+        SOAPLibrary.create_soap_session("host", "endpoint")
+        cache.client.assert_not_called()
+        suds_library.create_soap_client.assert_called_with("hostendpoint?WSDL")
+
+    @patch('Zoomba.SOAPLibrary.cached_wsdls')
+    def test_set_wsdl_cache(self, cache):
+        SOAPLibrary.set_wsdl_cache("memory", "10 minutes")
+        cache.configure.assert_called_with("memory", "10 minutes")
+
+    @patch('Zoomba.SOAPLibrary.cached_wsdls')
+    def test_wsdl_cache_import_argument(self, cache):
+        SOAPLibrary()
+        cache.configure.assert_not_called()
+        SOAPLibrary(wsdl_cache="memory", wsdl_cache_ttl=60)
+        cache.configure.assert_called_with("memory", 60)
+
     @patch('Zoomba.SOAPLibrary.BuiltIn')
     def test_create_soap_session_simple(self, built):
         SOAPLibrary.create_soap_session("host", "endpoint")
@@ -115,9 +198,31 @@ class TestSoapLibrary(unittest.TestCase):
     @patch('Zoomba.SOAPLibrary.BuiltIn')
     def test_call_soap_method_with_object_simple(self, built):
         err = WebFault(Mock(response=Mock(fault=None, document=None)), None)
-        type(err).fault = PropertyMock(return_value="fault")
         built.return_value.get_library_instance.return_value._client.return_value.service.action = Mock(side_effect=err)
-        assert SOAPLibrary.call_soap_method_with_object("action", item=2) == "fault"
+        with patch.object(WebFault, 'fault', PropertyMock(return_value="fault"), create=True):
+            assert SOAPLibrary.call_soap_method_with_object("action", item=2) == "fault"
+
+    @patch('Zoomba.SOAPLibrary.SoapClientPool')
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    def test_call_soap_method_in_parallel_simple(self, built, pool):
+        pool.return_value.call_all.return_value = [("first", 0.1, None), ("second", 0.2, None)]
+        responses = SOAPLibrary.call_soap_method_in_parallel("action", [{"item": 1}, {"item": 2}], max_workers=5)
+        assert responses == ["first", "second"]
+        pool.assert_called_with(built.return_value.get_library_instance.return_value._client.return_value, 2)
+        pool.return_value.call_all.assert_called_with("action", [{"item": 1}, {"item": 2}])
+
+    @patch('robot.libraries.BuiltIn.BuiltIn.fail')
+    @patch('Zoomba.SOAPLibrary.SoapClientPool')
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    def test_call_soap_method_in_parallel_failed_call(self, built, pool, fail):
+        pool.return_value.call_all.return_value = [("first", 0.1, None), (None, 0.2, ValueError("down"))]
+        assert SOAPLibrary.call_soap_method_in_parallel("action", [[1], [2]]) == ["first"]
+        fail.assert_called_with("Error: Parallel SOAP Call(s) Failed\nFailed Calls: \n[1] action: ValueError('down')")
+
+    @patch('Zoomba.SOAPLibrary.SoapClientPool')
+    def test_call_soap_method_in_parallel_empty(self, pool):
+        assert SOAPLibrary.call_soap_method_in_parallel("action", []) == []
+        pool.assert_not_called()
 
     @patch('Zoomba.SOAPLibrary.BuiltIn')
     @patch('Zoomba.SOAPLibrary._build_wsdl_objects')
@@ -193,3 +298,32 @@ class TestSoapPrivateMethods(unittest.TestCase):
     def test__build_dict_from_response_instance_list(self):
         suds = self.sudsobject()
         assert _build_dict_from_response({1: [suds]}) == {1: [suds]}
+
+    def test__build_dict_from_response_suds_objects(self):
+        child = Factory.object("Child", {"code": 7, "none": None})
+        response = Factory.object("Response", {"id": 1, "ok": True, "items": [child, "text"], "child": child})
+        converted = _build_dict_from_response(response)
+        assert converted == {"id": "1", "ok": "True", "items": [{"code": "7", "none": "None"}, "text"],
+                             "child": {"code": "7", "none": "None"}}
+        assert list(converted) == ["child", "items", "ok", "id"]
+
+    def test__build_dict_from_response_preserve_types(self):
+        when = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        response = Factory.object("Response", {"id": 1, "price": 2.5, "ok": False, "none": None, "when": when,
+                                               "name": "name", "items": [Factory.object("Item", {"count": 3})]})
+        assert _build_dict_from_response(response, preserve_types=True) == {
+            "id": 1, "price": 2.5, "ok": False, "none": None, "when": when, "name": "name", "items": [{"count": 3}]}
+        assert _build_dict_from_response(response, preserve_types=True, iso_dates=True)["when"] == \
+            "2020-01-02T03:04:05"
+
+    def test__build_dict_from_response_deep(self):
+        response = Factory.object("Node", {"value": 0})
+        for value in range(1, sys.getrecursionlimit() * 2):
+            response = Factory.object("Node", {"value": value, "next": response})
+        converted = _build_dict_from_response(response)
+        depth = 0
+        while "next" in converted:
+            converted = converted["next"]
+            depth += 1
+        assert depth == sys.getrecursionlimit() * 2 - 1
+        assert converted == {"value": "0"}
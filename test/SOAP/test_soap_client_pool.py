@@ -0,0 +1,59 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
+import unittest
+from suds.client import Client
+from Zoomba.Helpers.SoapClientPool import SoapClientPool, clone_client
+from ZoombaSOAPTestServer import SoapTestServer
+
+
+class TestSoapClientPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = SoapTestServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.client = Client(self.server.url + "?WSDL", cache=None)
+        self.server.reset()
+
+    def test_clone_client(self):
+        self.client.set_options(headers={"X-Zoomba": "1"}, timeout=5)
+        clone = clone_client(self.client)
+        assert clone.wsdl is self.client.wsdl
+        assert clone.options.transport is not self.client.options.transport
+        assert clone.options.transport.cookiejar is self.client.options.transport.cookiejar
+        assert clone.options.headers == {"X-Zoomba": "1"} and clone.options.timeout == 5
+        clone.set_options(headers={"X-Zoomba": "2"}, timeout=7)
+        assert self.client.options.headers == {"X-Zoomba": "1"} and self.client.options.timeout == 5
+        assert clone.service.Echo("hi") == "hi"
+        assert [request[2].get("X-Zoomba") for request in self.server.requests] == ["2"]
+
+    def test_clone_client_shares_location(self):
+        self.client.wsdl.services[0].setlocation("http://elsewhere/echo")
+        clone = clone_client(self.client)
+        clone.set_options(nosend=True)
+        assert clone.service.Echo("hi").client.location() == "http://elsewhere/echo"
+
+    def test_call_all_in_order(self):
+        pool = SoapClientPool(self.client, 5)
+        objects = [{"text": f"item {index}", "delay": 0.02} for index in range(20)]
+        results = pool.call_all("Echo", objects)
+        assert [received for received, _, _ in results] == [f"item {index}" for index in range(20)]
+        assert all(error is None and duration >= 0.02 for _, duration, error in results)
+        assert 1 < self.server.most_in_flight <= 5
+
+    def test_call_all_list_objects(self):
+        results = SoapClientPool(self.client, 2).call_all("Echo", [["a"], ["b", 0.01]])
+        assert [received for received, _, _ in results] == ["a", "b"]
+
+    def test_call_all_fault_and_error(self):
+        results = SoapClientPool(self.client, 2).call_all("Echo", [{"text": "fault one"}, {"unknown": 1},
+                                                                   {"text": "ok"}])
+        assert results[0][0].faultstring == "fault one" and results[0][2] is None
+        assert results[1][0] is None and isinstance(results[1][2], TypeError)
+        assert results[2][0] == "ok" and results[2][2] is None
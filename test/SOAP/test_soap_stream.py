@@ -0,0 +1,75 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
+import io
+import unittest
+from unittest.mock import patch
+from suds import WebFault
+from suds.client import Client
+from Zoomba.SOAPLibrary import SOAPLibrary
+from Zoomba.Helpers.SoapStream import iter_soap_elements, stream_soap_elements
+from ZoombaSOAPTestServer import ENVELOPE, SoapTestServer
+
+
+class TestSoapStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = SoapTestServer().start()
+        cls.client = Client(cls.server.url + "?WSDL", cache=None)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_stream_soap_elements(self):
+        rows = stream_soap_elements(self.client, "Report", "Row", {"count": 3})
+        assert self.server.requests[-1][0] == '"urn:Report"'
+        assert list(rows) == [{"id": "0", "name": "row 0"}, {"id": "1", "name": "row 1"},
+                              {"id": "2", "name": "row 2"}]
+        assert not self.client.options.nosend
+
+    def test_stream_soap_elements_empty(self):
+        assert list(stream_soap_elements(self.client, "Report", "Row", {"count": 0})) == []
+
+    def test_stream_soap_elements_fault(self):
+        with self.assertRaises(WebFault) as raised:
+            stream_soap_elements(self.client, "Report", "Row", {"count": -1})
+        assert "Report failed" in str(raised.exception)
+
+    @patch('Zoomba.SOAPLibrary.BuiltIn')
+    def test_call_soap_method_streaming(self, built):
+        built.return_value.get_library_instance.return_value._client.return_value = self.client
+        rows = SOAPLibrary.call_soap_method_streaming("Report", "{urn:zoomba}Row", count=2)
+        assert [row["id"] for row in rows] == ["0", "1"]
+
+
+class TestIterSoapElements(unittest.TestCase):
+
+    def test_values(self):
+        body = '<r:Rows xmlns:r="urn:r"><r:Row id="1"><r:name>one</r:name><r:tag>a</r:tag><r:tag>b</r:tag>' \
+               '<r:empty/><r:nil xsi:nil="true"/><r:price currency="EUR">2.5</r:price></r:Row></r:Rows>'
+        rows = iter_soap_elements(io.BytesIO(ENVELOPE.format(body=body).encode()), "Row")
+        assert list(rows) == [{"_id": "1", "name": "one", "tag": ["a", "b"], "empty": "None", "nil": "None",
+                               "price": {"_currency": "EUR", "value": "2.5"}}]
+
+    def test_namespace_and_nested_names(self):
+        body = '<r:Rows xmlns:r="urn:r" xmlns:o="urn:o"><r:Row><r:Row>inner</r:Row></r:Row><o:Row>other</o:Row>' \
+               '</r:Rows>'
+        document = ENVELOPE.format(body=body).encode()
+        assert list(iter_soap_elements(io.BytesIO(document), "Row")) == [{"Row": "inner"}, "other"]
+        assert list(iter_soap_elements(io.BytesIO(document), "{urn:o}Row")) == ["other"]
+
+    def test_yielded_elements_dropped(self):
+        body = '<Rows>' + '<Row><id>1</id></Row>' * 3 + '</Rows>'
+        parsed = []
+        with patch('Zoomba.Helpers.SoapStream.iterparse') as iterparse:
+            from xml.etree.ElementTree import iterparse as real_iterparse
+
+            def recording(source, events):
+                for event, node in real_iterparse(source, events):
+                    parsed.append(node)
+                    yield event, node
+            iterparse.side_effect = recording
+            assert len(list(iter_soap_elements(io.BytesIO(body.encode()), "Row"))) == 3
+        assert len(parsed[0]) == 0
@@ -0,0 +1,153 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/')))
+import pathlib
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+from suds.transport import Transport
+from Zoomba.Helpers.WsdlCache import WsdlCache
+from ZoombaSOAPTestServer import SCHEMA, echo_reply, wsdl
+
+REPLY = echo_reply("hello").encode()
+
+
+def _location(client):
+    return client.wsdl.services[0].ports[0].methods["Echo"].location
+
+
+class _FolderTransport(Transport):
+    """Serves the files of a folder for any http URL, recording the URLs it opens."""
+
+    def __init__(self, folder):
+        super().__init__()
+        self.folder = folder
+        self.opened = []
+
+    def open(self, request):
+        self.opened.append(request.url)
+        return BytesIO((self.folder / request.url.rsplit("/", 1)[-1]).read_bytes())
+
+
+class TestWsdlCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        folder = pathlib.Path(self.directory.name)
+        (folder / "echo.xsd").write_text(SCHEMA)
+        self.wsdl = folder / "echo.wsdl"
+        self.wsdl.write_text(wsdl("http://localhost/echo", "echo.xsd"))
+        self.url = self.wsdl.as_uri()
+        self.location = str(folder / "cache")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_disabled(self):
+        cache = WsdlCache()
+        assert not cache.enabled
+        with patch.object(WsdlCache, "store") as store:
+            cache.client(self.url, "plain")
+        store.assert_not_called()
+
+    def test_memory_parses_once(self):
+        cache = WsdlCache()
+        cache.configure("memory")
+        first = cache.client(self.url, "plain")
+        with patch.object(WsdlCache, "store") as store:
+            second = cache.client(self.url, "plain")
+        store.assert_not_called()
+        assert second.wsdl.schema is first.wsdl.schema
+        assert not os.path.exists(self.location)
+
+    def test_session_location_and_reply(self):
+        cache = WsdlCache()
+        cache.configure("memory")
+        first = cache.client(self.url, "plain")
+        first.wsdl.services[0].setlocation("http://elsewhere/echo")
+        second = cache.client(self.url, "plain")
+        assert _location(first) == "http://elsewhere/echo"
+        assert _location(second) == "http://localhost/echo"
+        second.set_options(nosend=True)
+        request = second.service.Echo("hi")
+        assert b"<text>hi</text>" in request.envelope
+        assert request.process_reply(REPLY) == "hello"
+
+    def test_variants_cached_apart(self):
+        cache = WsdlCache()
+        cache.configure("memory")
+        first = cache.client(self.url, "plain")
+        assert cache.client(self.url, "fixed").wsdl.schema is not first.wsdl.schema
+
+    def test_directory_shared_between_processes(self):
+        cache = WsdlCache()
+        cache.configure(self.location)
+        cache.client(self.url, "plain")
+        assert len(os.listdir(self.location)) == 1
+        other = WsdlCache()
+        other.configure(self.location)
+        with patch.object(WsdlCache, "store") as store:
+            client = other.client(self.url, "plain")
+        store.assert_not_called()
+        client.set_options(nosend=True)
+        assert client.service.Echo("hi").process_reply(REPLY) == "hello"
+
+    def test_changed_document_parsed_again(self):
+        cache = WsdlCache()
+        cache.configure(self.location)
+        cache.client(self.url, "plain")
+        self.wsdl.write_text(wsdl("http://localhost/echo2", "echo.xsd"))
+        client = cache.client(self.url, "plain")
+        assert _location(client) == "http://localhost/echo2"
+        assert len(os.listdir(self.location)) == 2
+
+    def test_expired_entry_parsed_again(self):
+        cache = WsdlCache()
+        cache.configure(self.location, "1 minute")
+        cache.client(self.url, "plain")
+        with patch.object(WsdlCache, "store") as store:
+            cache.client(self.url, "plain")
+            store.assert_not_called()
+            with patch("Zoomba.Helpers.WsdlCache.time.time", return_value=time.time() + 61):
+                cache.client(self.url, "plain")
+            store.assert_called_once()
+
+    def test_unreadable_file_parsed_again(self):
+        cache = WsdlCache()
+        cache.configure(self.location)
+        key = cache.key(self.url, "plain")
+        with open(os.path.join(self.location, key + ".wsdl.pickle"), "wb") as cache_file:
+            cache_file.write(b"not a pickle")
+        client = cache.client(self.url, "plain")
+        assert _location(client) == "http://localhost/echo"
+
+    def test_configure_none_disables(self):
+        cache = WsdlCache()
+        cache.configure("MEMORY", 10)
+        assert cache.location == "memory" and cache.ttl == 10
+        cache.configure(None)
+        assert not cache.enabled
+
+    def test_key_downloaded_with_client_transport(self):
+        transport = _FolderTransport(self.wsdl.parent)
+        cache = WsdlCache()
+        cache.configure("memory")
+        client = cache.client("http://wsdl.invalid/echo.wsdl", "plain", transport=transport)
+        assert _location(client) == "http://localhost/echo"
+        assert transport.opened.count("http://wsdl.invalid/echo.wsdl") == 2
+
+    def test_lock_not_held_while_parsing(self):
+        cache = WsdlCache()
+        cache.configure("memory")
+        held = []
+        original = WsdlCache.store
+
+        def store(wsdl_cache, key, definitions):
+            held.append(wsdl_cache._lock.locked())
+            original(wsdl_cache, key, definitions)
+
+        with patch.object(WsdlCache, "store", store):
+            cache.client(self.url, "plain")
+        assert held == [False]
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
+from Zoomba.Helpers.JsonBackend import get_json_backend
+
+
+class TestJsonBackend(unittest.TestCase):
+    def test_default_backend_is_stdlib(self):
+        assert get_json_backend().name == 'json'
+        assert get_json_backend(None).dumps({"a": "1"}) == '{"a": "1"}'
+
+    def test_auto_backend_prefers_installed_fast_backend(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        assert get_json_backend('auto').name == 'orjson'
+
+    @patch('Zoomba.Helpers.JsonBackend.importlib.import_module')
+    def test_auto_backend_falls_back_to_stdlib(self, import_module):
+        def import_only_stdlib(name):
+            if name != 'json':
+                raise ImportError(name)
+            return json
+        import_module.side_effect = import_only_stdlib
+        assert get_json_backend('auto').name == 'json'
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, get_json_backend, 'simplejson')
+
+    def test_backends_decode_the_same(self):
+        document = '[{"id": 1, "name": "caf\\u00e9", "values": [1.5, null, true], "nested": {"a": "b"}}]'
+        expected = get_json_backend('json').loads(document)
+        for name in ('orjson', 'ujson'):
+            try:
+                backend = get_json_backend(name)
+            except ImportError:
+                continue
+            assert backend.loads(document) == expected
+            assert backend.loads(document.encode()) == expected
+            assert backend.loads(backend.dumps(expected)) == expected
+
+    def test_fast_backend_falls_back_for_nan(self):
+        try:
+            backend = get_json_backend('orjson')
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        assert str(backend.loads('[NaN]')) == '[nan]'
+
+    def test_orjson_non_string_keys(self):
+        try:
+            backend = get_json_backend('orjson')
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        assert backend.dumps({1: "a"}) == '{"1":"a"}'
@@ -5,6 +5,8 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/')))
 from Zoomba import ZoombaError
+from Zoomba.ZoombaError import MAX_VALUE_LENGTH, MismatchBudgetReached, ZoombaErrorList
+from unittest.mock import patch
 
 
 class TestInternal(unittest.TestCase):
@@ -25,3 +27,67 @@ class TestInternal(unittest.TestCase):
         err = ZoombaError("string")
         assert err == "Error: string"
 
+
+    def test_zoomba_error_has_no_instance_dict(self):
+        err = ZoombaError("description", test="test")
+        assert not hasattr(err, "__dict__")
+        assert err.test == "test"
+        err.other = "other"
+        assert err.extras == {"test": "test", "other": "other"}
+        self.assertRaises(AttributeError, getattr, err, "missing")
+
+    def test_zoomba_error_repr_does_not_change_values(self):
+        err = ZoombaError(key="key", expected=None, actual=[1])
+        assert f"{err}" == "------------------\nKey: key\nExpected: None\nActual: [1]"
+        assert err.expected is None
+        assert err.actual == [1]
+
+    def test_zoomba_error_truncates_long_values(self):
+        err = ZoombaError(key="key", expected="a" * (MAX_VALUE_LENGTH + 5), actual="b")
+        assert f"{err}" == (f"------------------\nKey: key\nExpected: {'a' * MAX_VALUE_LENGTH}... "
+                            f"({MAX_VALUE_LENGTH + 5} characters, truncated)\nActual: b")
+
+    def test_zoomba_error_nested_error(self):
+        err = ZoombaError(breakdown=ZoombaError(expected=[1], actual=[2]), important="breakdown")
+        assert f"{err}" == "------------------\nBreakdown: \nExpected: [1]\nActual: [2]"
+
+    def test_zoomba_error_equality(self):
+        assert ZoombaError(key="a", expected=1, actual=2) == ZoombaError(key="a", expected=1, actual=2)
+        assert ZoombaError(key="a", expected=1, actual=2) != ZoombaError(key="a", expected=1, actual=3)
+        assert ZoombaError(key="a", test=1) != ZoombaError(key="a")
+
+    def test_zoomba_error_list_limit(self):
+        errors = ZoombaErrorList(limit=2)
+        for index in range(5):
+            errors.append(ZoombaError(key=str(index)))
+        assert [err.key for err in errors] == ["0", "1"]
+        assert errors.dropped == 3
+
+    def test_zoomba_error_list_limit_every_mutator(self):
+        errors = ZoombaErrorList(limit=2)
+        errors.extend([ZoombaError(key="0"), ZoombaError(key="1"), ZoombaError(key="2")])
+        errors.insert(0, ZoombaError(key="3"))
+        errors += [ZoombaError(key="4")]
+        assert [err.key for err in errors] == ["0", "1"]
+        assert errors.dropped == 3
+        errors.append_summary(ZoombaError(key="summary"))
+        assert [err.key for err in errors] == ["0", "1", "summary"]
+        assert errors.dropped == 3
+
+    def test_zoomba_error_list_budget_every_mutator(self):
+        errors = ZoombaErrorList(budget=2)
+        errors.append_summary(ZoombaError(key="summary"))
+        errors.insert(0, ZoombaError(key="0"))
+        with self.assertRaises(MismatchBudgetReached):
+            errors.extend([ZoombaError(key="1"), ZoombaError(key="2")])
+        assert errors.stopped
+        assert [err.key for err in errors] == ["0", "summary", "1"]
+
+    def test_zoomba_error_list_unlimited_by_default(self):
+        errors = ZoombaErrorList()
+        for index in range(1500):
+            errors.append(ZoombaError(key=str(index)))
+        assert len(errors) == 1500
+        assert errors.dropped == 0
+        with patch('Zoomba.ZoombaError.MAX_RECORDS', 10):
+            assert ZoombaErrorList().limit == 10